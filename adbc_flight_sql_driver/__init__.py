@@ -1,19 +1,88 @@
 import warnings
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type, cast
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, cast
 
+import itertools
 import re
+import uuid
+import weakref
+from collections import OrderedDict
+import adbc_driver_flightsql
 import adbc_driver_flightsql.dbapi as flight_sql
-from sqlalchemy import pool
+import adbc_driver_manager
+import pyarrow as pa
+from sqlalchemy import event, exc, pool
 from sqlalchemy import types as sqltypes
 from sqlalchemy import util
 from sqlalchemy.dialects.postgresql.base import PGInspector
 from sqlalchemy.dialects.postgresql.psycopg2 import PGDialect_psycopg2
 from sqlalchemy.engine.url import URL
 
-from .datatypes import register_extension_types
+try:
+    from sqlalchemy.engine.reflection import ObjectKind
+except ImportError:  # SQLAlchemy < 2.0
+    ObjectKind = None
+
+from . import auth, registry, tracing
+from .datatypes import (
+    ISCHEMA_NAMES,
+    ArrowArray,
+    ArrowBinary,
+    ArrowFloat,
+    ArrowNumeric,
+    register_extension_types,
+    to_pylist,
+)
+from .ingest import DEFAULT_INGEST_BATCH_SIZE, IngestMode, ingest
+from .parallel import ParallelFetch
+from .pool_warmer import DEFAULT_POOL_MAINTENANCE_INTERVAL, PoolWarmer
+from .query import CANCELLED, RUNNING, RunningQuery
+from .result_cache import (
+    DEFAULT_RESULT_CACHE_BYTES,
+    DEFAULT_RESULT_CACHE_TTL,
+    SCOPE_PATTERN,
+    ResultCache,
+    cache_key,
+    normalize_sql,
+)
+from .catalog_file import CatalogFile
+from .catalog import (
+    DEFAULT_REFLECTION_CACHE_SIZE,
+    DEFAULT_REFLECTION_CACHE_TTL,
+    Catalog,
+    CatalogCache,
+    Column,
+    SchemaEntry,
+    load_catalog,
+    load_catalog_adbc,
+    load_check_constraints,
+    load_foreign_keys,
+    load_key_constraints,
+    parse_check_constraint,
+    resolve_type,
+    with_arrow_types,
+)
+from .streaming import DEFAULT_MAX_BUFFER_BYTES, RecordBatchStream, close_results, limit_rows, record_batch_reader
+from .transaction import TransactionManager, is_write
 
 __version__ = "0.0.1"
 
+# Number of prepared statements kept per connection
+DEFAULT_STATEMENT_CACHE_SIZE = 32
+
+# Number of idle cursors kept per connection for reuse
+DEFAULT_CURSOR_POOL_SIZE = 4
+
+# Where reflection reads the catalog from: information_schema queries ("sql")
+# or the Flight SQL GetDbSchemas/GetTables RPCs ("adbc")
+REFLECTION_BACKENDS = ("sql", "adbc")
+
+# ADBC status codes of errors meaning the connection is gone (e.g. the gRPC
+# channel to a restarted server)
+DISCONNECT_STATUS_CODES = {adbc_driver_manager.AdbcStatusCode.IO}
+
+# statements that change the catalog
+DDL_PATTERN = re.compile(r"^\s*(create|drop|alter)\b", flags=re.IGNORECASE)
+
 if TYPE_CHECKING:
     from sqlalchemy.base import Connection
     from sqlalchemy.engine.interfaces import _IndexDict
@@ -46,18 +115,592 @@ class FlightSQLInspector(PGInspector):
             raise NotImplementedError() from e
 
 
+class CursorWrapper:
+    """
+    Wraps a Flight SQL DB-API cursor.  The wrapper owns the Arrow result
+    stream: rows are converted a whole record batch at a time, and the
+    Arrow-native fetch methods hand back the record batches without building
+    a Python object per row.
+
+    The underlying cursor is only taken (from the connection's statement
+    cache or idle cursors) when the wrapper is first used, and is handed back
+    on close.
+
+    execute_async() runs the query on a background thread instead: poll() its
+    state, cancel() it from any thread, and fetch as usual once it finished.
+
+    ``max_rows`` caps the rows of the results of the following executes on
+    the client side: once that many rows arrived the result stream is closed,
+    so the server stops sending the rest (e.g. to fetch "limit + 1" rows of a
+    query whose limit can't be pushed into its SQL).
+
+    Reads are served from the connection's result cache when it is enabled,
+    see ResultCache.
+    """
+    __c: Optional[flight_sql.Cursor]
+    __operation: Optional[str]
+    __connection: Optional["ConnectionWrapper"]
+    __reader: Optional[pa.RecordBatchReader]
+    __fetch: Optional[ParallelFetch]
+    __rowcount: int
+    __running: Optional[RunningQuery]
+    query_id: str
+    closed: bool
+    arraysize: int
+    max_rows: Optional[int]
+    stream_buffer_bytes: int
+    fetch_workers: int
+    preserve_order: bool
+
+    def __init__(
+            self,
+            c: Optional[flight_sql.Cursor] = None,
+            stream_buffer_bytes: int = DEFAULT_MAX_BUFFER_BYTES,
+            fetch_workers: int = 1,
+            preserve_order: bool = True,
+            connection: Optional["ConnectionWrapper"] = None,
+    ) -> None:
+        self.__c = c
+        self.__operation = None  # the SQL prepared on self.__c
+        self.__connection = connection
+        self.__reader = None
+        self.__fetch = None
+        self.__rows: Iterator[Tuple] = iter(())
+        self.__rowcount = -1
+        self.__running = None
+        self.query_id = uuid.uuid4().hex
+        self.closed = False
+        self.arraysize = 1
+        self.max_rows = None
+        self.stream_buffer_bytes = stream_buffer_bytes
+        self.fetch_workers = fetch_workers
+        self.preserve_order = preserve_order
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw(), name)
+
+    def _raw(self) -> flight_sql.Cursor:
+        if self.__c is None:
+            if self.__connection is None or self.closed:
+                raise flight_sql.ProgrammingError(
+                    "Cursor is closed",
+                    status_code=adbc_driver_manager.AdbcStatusCode.INVALID_STATE,
+                )
+            self.__c = self.__connection.raw_cursor()
+        return self.__c
+
+    def __enter__(self) -> "CursorWrapper":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __iter__(self) -> "CursorWrapper":
+        return self
+
+    def __next__(self) -> Tuple:
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    @property
+    def description(self) -> Optional[List[Tuple]]:
+        if self.__reader is None:
+            return None
+        return [
+            (
+                field.name,
+                field.type,
+                None,
+                None,
+                getattr(field.type, "precision", None),
+                getattr(field.type, "scale", None),
+                field.nullable,
+            )
+            for field in self.__reader.schema
+        ]
+
+    @property
+    def rowcount(self) -> int:
+        return self.__rowcount
+
+    def _reset(self) -> None:
+        if self.__fetch is not None:
+            self.__fetch.close()
+        self.__fetch = None
+        self.__reader = None
+        self.__rows = iter(())
+        self.__rowcount = -1
+
+    def _rows(self) -> Iterator[Tuple]:
+        assert self.__reader is not None
+        converting = tracing.timer("convert")
+        try:
+            for batch in self.__reader:
+                with converting:
+                    columns = [to_pylist(column) for column in batch.columns]
+                yield from zip(*columns)
+        finally:
+            converting.close()
+
+    def _results(self, method: str) -> pa.RecordBatchReader:
+        if self.__running is not None:
+            self.__running.result()
+        if self.__reader is None:
+            raise flight_sql.ProgrammingError(
+                f"Cannot {method}() before execute()",
+                status_code=adbc_driver_manager.AdbcStatusCode.INVALID_STATE,
+            )
+        return self.__reader
+
+    def _release(self) -> None:
+        # hand our prepared statement back to the connection's cache, or the
+        # cursor to its idle cursors
+        c, self.__c = self.__c, None
+        operation, self.__operation = self.__operation, None
+        if c is None:
+            return
+        if self.__connection is None:
+            c.close()
+            return
+        # don't leave the unread rest of a result streaming to an idle cursor
+        close_results(c)
+        if operation is not None:
+            self.__connection.checkin_statement(operation, c)
+        else:
+            self.__connection.release_cursor(c)
+
+    def _prepare(self, operation: Any) -> None:
+        """
+        Switch to the connection's cached cursor that already has
+        ``operation`` prepared, if there is one
+        """
+        if self.__c is not None and operation == self.__operation:
+            return
+        if self.__connection is None or not isinstance(operation, str):
+            self._raw()
+            self.__operation = None
+            return
+
+        cached = self.__connection.checkout_statement(operation)
+        if cached is not None or self.__operation is not None:
+            # keep the statement prepared on our cursor for its next user
+            self._release()
+        self.__c = cached if cached is not None else self._raw()
+        self.__operation = operation
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        executing = self._stop_running(wait=False)
+        if executing is None:
+            self._reset()
+            self._release()
+        # else the query's thread drops the result and hands the cursor back
+        # once the server finished the query
+        self.closed = True
+        if self.__connection is not None:
+            self.__connection.forget_cursor(self, executing)
+
+    def execute(self, operation: str, parameters: Optional[Any] = None) -> None:
+        self._stop_running()
+        self._execute_authenticated(operation, parameters)
+
+    def execute_async(self, operation: str, parameters: Optional[Any] = None) -> None:
+        """
+        Start executing ``operation`` on a background thread and return
+        immediately.  The fetch methods wait for it to finish.
+        """
+        self._stop_running()
+        self._reset()
+        self.__running = RunningQuery(
+            self.query_id,
+            execute=lambda: self._execute_authenticated(operation, parameters),
+            interrupt=self._interrupt,
+            discard=self._discard,
+        )
+
+    def poll(self) -> Optional[str]:
+        """The state of the query started with execute_async (running, finished, failed or cancelled)"""
+        return self.__running.state if self.__running is not None else None
+
+    def cancel(self) -> bool:
+        """
+        Cancel the query started with execute_async, see RunningQuery.cancel.
+
+        Only ADBC releases that can cancel an executing statement (which
+        adbc_driver_manager 0.3.0 can't) stop the query on the server; until
+        then a cancelled query keeps executing there, and only its result is
+        dropped.  close() doesn't wait for it, but executing another
+        statement on this cursor and closing the connection do.
+        """
+        return self.__running is not None and self.__running.cancel()
+
+    def _interrupt(self) -> None:
+        # newer adbc_driver_manager releases can cancel an executing statement
+        # (Flight SQL CancelFlightInfo)
+        cancel = getattr(self.__c, "adbc_cancel", None)
+        if cancel is not None:
+            cancel()
+
+    def _close_stream(self) -> None:
+        # stop reading the result once max_rows rows arrived
+        if self.__fetch is not None:
+            self.__fetch.close()
+        elif self.__c is not None:
+            close_results(self.__c)
+
+    def _discard(self) -> None:
+        # drop the unread result of a cancelled query
+        self._reset()
+        self._release()
+
+    def _stop_running(self, wait: bool = True) -> Optional[RunningQuery]:
+        """
+        Cancel the query started with execute_async, waiting until it stopped
+        executing - or, without ``wait``, returning it if it still executes
+        """
+        running, self.__running = self.__running, None
+        if running is None:
+            return None
+        if running.state == RUNNING:
+            running.cancel()
+        # a cancelled query may still be executing
+        if not wait and running.state == CANCELLED and not running.wait(0):
+            return running
+        running.wait()
+        return None
+
+    def _execute_authenticated(self, operation: str, parameters: Optional[Any] = None) -> None:
+        try:
+            self._execute(operation, parameters)
+        except flight_sql.Error as e:
+            # the bearer token was rejected - retry once on a freshly
+            # authenticated connection
+            if not auth.is_unauthenticated(e) or self.__connection is None:
+                raise
+            if not self.__connection.reauthenticate():
+                raise
+            # our cursor belongs to the old connection
+            if self.__c is not None:
+                self.__c.close()
+            self.__c = None
+            self.__operation = None
+            self._execute(operation, parameters)
+
+    def _cache_key(self, operation: Any, parameters: Optional[Any]) -> Optional[str]:
+        connection = self.__connection
+        if connection is None or not connection.result_cache.enabled or not isinstance(operation, str):
+            return None
+        # uncommitted writes aren't visible to other connections
+        if connection.in_transaction or is_write(operation):
+            return None
+        return cache_key(operation, parameters, connection.scope, self.max_rows)
+
+    def _execute(self, operation: str, parameters: Optional[Any] = None) -> None:
+        self._reset()
+        key = self._cache_key(operation, parameters)
+        if key is not None and self.__connection is not None:
+            result_cache = self.__connection.result_cache
+            generation = result_cache.generation
+            table = result_cache.get(key)
+            tracing.count("result_cache_misses" if table is None else "result_cache_hits")
+            if table is not None:
+                # no round trip to the server
+                self.__reader = table.to_reader()
+                self.__rows = self._rows()
+                self.__connection.executed(self)
+                return
+        if self.__connection is not None:
+            self.__connection.before_execute(operation)
+        self._prepare(operation)
+        c = self._raw()
+        if self.fetch_workers > 1:
+            with tracing.span("execute"):
+                partitions, schema = c.adbc_execute_partitions(operation, parameters)
+            tracing.count("endpoints", len(partitions))
+            if len(partitions) > 1:
+                self.__fetch = ParallelFetch(
+                    c.connection,
+                    partitions,
+                    max_workers=self.fetch_workers,
+                    preserve_order=self.preserve_order,
+                )
+                self.__reader = pa.RecordBatchReader.from_batches(schema, self.__fetch)
+            elif partitions:
+                c.adbc_read_partition(partitions[0])
+                self.__reader = record_batch_reader(c)
+            else:
+                self.__reader = pa.RecordBatchReader.from_batches(schema, [])
+        else:
+            with tracing.span("execute"):
+                c.execute(operation, parameters)
+            self.__reader = record_batch_reader(c)
+        self.__reader = tracing.trace_batches(self.__reader)
+        if self.max_rows is not None:
+            self.__reader = limit_rows(self.__reader, self.max_rows, self._close_stream)
+        if key is not None:
+            self.__reader = result_cache.record(key, self.__reader, generation)
+        self.__rowcount = c.rowcount
+        self.__rows = self._rows()
+        if self.__connection is not None:
+            self.__connection.executed(self)
+
+    def executemany(self, operation: str, seq_of_parameters: Any) -> None:
+        self._stop_running()
+        self._reset()
+        if self.__connection is not None:
+            self.__connection.before_execute(operation)
+        self._prepare(operation)
+        c = self._raw()
+        c.executemany(operation, seq_of_parameters)
+        self.__rowcount = c.rowcount
+        if self.__connection is not None:
+            self.__connection.executed(self)
+
+    def fetchone(self) -> Optional[Tuple]:
+        self._results("fetchone")
+        return next(self.__rows, None)
+
+    def fetchmany(self, size: Optional[int] = None) -> List[Tuple]:
+        self._results("fetchmany")
+        return list(itertools.islice(self.__rows, self.arraysize if size is None else size))
+
+    def fetchall(self) -> List[Tuple]:
+        self._results("fetchall")
+        return list(self.__rows)
+
+    def fetch_record_batches(self) -> pa.RecordBatchReader:
+        """Return a reader over the (remaining) record batches of the result"""
+        return self._results("fetch_record_batches")
+
+    def fetch_arrow_table(self) -> pa.Table:
+        """Read the (remaining) result into a single Arrow table"""
+        return self.fetch_record_batches().read_all()
+
+    def stream_record_batches(
+            self, max_buffer_bytes: Optional[int] = None
+    ) -> RecordBatchStream:
+        """
+        Stream the (remaining) result with a bounded read-ahead buffer, see
+        RecordBatchStream
+        """
+        return RecordBatchStream(
+            self.fetch_record_batches(),
+            max_buffer_bytes=max_buffer_bytes or self.stream_buffer_bytes,
+        )
+
+
 class ConnectionWrapper:
     __c: "Connection"
+    __reconnect: Optional[Callable[[], flight_sql.Connection]]
+    __retired: List[flight_sql.Connection]
+    __statements: "OrderedDict[str, flight_sql.Cursor]"
+    __on_ddl: Optional[Callable[[], None]]
+    __transaction: TransactionManager
+    __idle: List[flight_sql.Cursor]
+    __open: "weakref.WeakSet[CursorWrapper]"
+    __executing: List[RunningQuery]
+    __rowcount: int
+    __description: Optional[List[Tuple]]
     notices: List[str]
+    stream_buffer_bytes: int
+    queue_size: Optional[int]
+    fetch_workers: int
+    preserve_order: bool
+    statement_cache_size: int
+    cursor_pool_size: int
+    ingest_batch_size: int
+    result_cache: ResultCache
+    scope: Optional[str]
     autocommit = None  # duckdb doesn't support setting autocommit
     closed = False
 
-    def __init__(self, c: flight_sql.Connection) -> None:
+    def __init__(
+            self,
+            c: flight_sql.Connection,
+            stream_buffer_bytes: int = DEFAULT_MAX_BUFFER_BYTES,
+            queue_size: Optional[int] = None,
+            fetch_workers: int = 1,
+            preserve_order: bool = True,
+            reconnect: Optional[Callable[[], flight_sql.Connection]] = None,
+            statement_cache_size: int = DEFAULT_STATEMENT_CACHE_SIZE,
+            ingest_batch_size: int = DEFAULT_INGEST_BATCH_SIZE,
+            on_ddl: Optional[Callable[[], None]] = None,
+            read_only: bool = False,
+            cursor_pool_size: int = DEFAULT_CURSOR_POOL_SIZE,
+            result_cache: Optional[ResultCache] = None,
+    ) -> None:
         self.__c = c
+        self.__transaction = TransactionManager(c, read_only=read_only)
+        self.__reconnect = reconnect
+        self.__on_ddl = on_ddl
+        self.__retired = list()
+        self.__statements = OrderedDict()
+        self.__idle = list()
+        self.__open = weakref.WeakSet()
+        self.__executing = list()
+        self.__rowcount = -1
+        self.__description = None
+        self.statement_cache_size = statement_cache_size
+        self.cursor_pool_size = cursor_pool_size
+        self.ingest_batch_size = ingest_batch_size
+        self.result_cache = result_cache if result_cache is not None else ResultCache()
+        self.scope = None  # the last statement switching catalog or schema
         self.notices = list()
+        self.stream_buffer_bytes = stream_buffer_bytes
+        self.queue_size = queue_size
+        self.fetch_workers = fetch_workers
+        self.preserve_order = preserve_order
+
+    def raw_cursor(self) -> flight_sql.Cursor:
+        """An idle cursor with no statement prepared, or a new one"""
+        if self.__idle:
+            return self.__idle.pop()
+        cur = self.__c.cursor()
+        if self.queue_size is not None:
+            # the number of batches the driver reads ahead per endpoint
+            cur.adbc_statement.set_options(
+                **{adbc_driver_flightsql.StatementOptions.QUEUE_SIZE.value: str(self.queue_size)}
+            )
+        return cur
+
+    def release_cursor(self, cur: flight_sql.Cursor) -> None:
+        """Keep an idle cursor for reuse by any statement, up to cursor_pool_size"""
+        if self.closed or cur.connection is not self.__c or len(self.__idle) >= self.cursor_pool_size:
+            cur.close()
+        else:
+            self.__idle.append(cur)
+
+    def cursor(self) -> CursorWrapper:
+        cursor = CursorWrapper(stream_buffer_bytes=self.stream_buffer_bytes,
+                               fetch_workers=self.fetch_workers,
+                               preserve_order=self.preserve_order,
+                               connection=self
+                               )
+        self.__open.add(cursor)
+        return cursor
+
+    def forget_cursor(self, cursor: CursorWrapper, executing: Optional[RunningQuery] = None) -> None:
+        """Stop tracking a closed cursor, and the cancelled query it left ``executing``"""
+        self.__open.discard(cursor)
+        if executing is not None:
+            self.__executing = [running for running in self.__executing if not running.wait(0)]
+            self.__executing.append(executing)
+
+    def executed(self, cursor: CursorWrapper) -> None:
+        # copied, as closing the cursor resets them
+        self.__rowcount = cursor.rowcount
+        self.__description = cursor.description
+
+    def checkout_statement(self, operation: str) -> Optional[flight_sql.Cursor]:
+        """Take the idle cursor that has ``operation`` prepared out of the cache"""
+        return self.__statements.pop(operation, None)
+
+    def checkin_statement(self, operation: str, cur: flight_sql.Cursor) -> None:
+        """
+        Cache an idle cursor by the SQL it has prepared, closing (and so
+        releasing the server-side prepared statement of) the least recently
+        used one past statement_cache_size
+        """
+        if self.statement_cache_size <= 0:
+            self.release_cursor(cur)
+            return
+        if self.closed or cur.connection is not self.__c:
+            cur.close()
+            return
+        previous = self.__statements.pop(operation, None)
+        if previous is not None:
+            previous.close()
+        self.__statements[operation] = cur
+        while len(self.__statements) > self.statement_cache_size:
+            _, evicted = self.__statements.popitem(last=False)
+            evicted.close()
+
+    def _close_statements(self) -> None:
+        while self.__statements:
+            _, cur = self.__statements.popitem()
+            cur.close()
+        while self.__idle:
+            self.__idle.pop().close()
 
-    def cursor(self) -> flight_sql.Cursor:
-        return self.__c.cursor()
+    def ingest(
+            self,
+            table_name: str,
+            data: Any,
+            mode: IngestMode = "create",
+            schema: Optional[str] = None,
+            batch_size: Optional[int] = None,
+    ) -> int:
+        """
+        Bulk load an Arrow table, record batch reader or pandas DataFrame into
+        ``table_name``, see ingest.ingest
+        """
+        try:
+            return ingest(self.__c, table_name, data,
+                          mode=mode,
+                          schema=schema,
+                          batch_size=batch_size or self.ingest_batch_size
+                          )
+        finally:
+            self.result_cache.invalidate()
+            if self.__on_ddl is not None and mode != "append":
+                self.__on_ddl()
+
+    def ping(self) -> None:
+        """
+        Check that the server is reachable with a metadata-only call
+        (Flight SQL GetSqlInfo) rather than a query
+        """
+        try:
+            self.__c.adbc_get_info()
+        except flight_sql.NotSupportedError:
+            with self.cursor() as cur:
+                cur.execute("SELECT 1")
+                cur.fetchall()
+
+    def reauthenticate(self) -> bool:
+        """
+        Swap in a freshly authenticated connection, if the dialect gave us a
+        way to open one.  The old connection is closed along with this one,
+        since cursors may still be open on it.
+        """
+        if self.__reconnect is None:
+            return False
+        self._close_statements()
+        self.__retired.append(self.__c)
+        self.__c = self.__reconnect()
+        self.__transaction.attach(self.__c)
+        return True
+
+    @property
+    def read_only(self) -> bool:
+        return self.__transaction.read_only
+
+    @property
+    def in_transaction(self) -> bool:
+        """Whether a transaction is open on the server"""
+        return self.__transaction.in_transaction
+
+    def before_execute(self, statement: str) -> None:
+        self.__transaction.before_execute(statement)
+        if self.result_cache.enabled:
+            if SCOPE_PATTERN.match(statement):
+                # cached results are keyed by the catalog/schema they were read from
+                self.scope = normalize_sql(statement)
+            elif is_write(statement):
+                self.result_cache.invalidate()
+
+    def begin(self) -> None:
+        """Start a transaction - lazily, see TransactionManager"""
+        self.__transaction.begin()
+
+    def commit(self) -> None:
+        self.__transaction.commit()
+
+    def rollback(self) -> None:
+        self.__transaction.rollback()
 
     def fetchmany(self, size: Optional[int] = None) -> List:
         return self.__c.fetchmany(size)
@@ -78,11 +721,30 @@ class ConnectionWrapper:
         return self
 
     def close(self) -> None:
+        # cursors of results that were never consumed or closed would keep
+        # the ADBC connection from closing
+        for cursor in list(self.__open):
+            cursor.close()
+        self._close_statements()
+        self.closed = True
+        # ...and so would statements that are still executing
+        for running in self.__executing:
+            running.wait()
+        self.__executing.clear()
+        for retired in self.__retired:
+            retired.close()
+        self.__retired.clear()
         self.__c.close()
 
     @property
     def rowcount(self) -> int:
-        return self.cursor().rowcount
+        """The rowcount of the last statement executed on this connection"""
+        return self.__rowcount
+
+    @property
+    def description(self) -> Optional[List[Tuple]]:
+        """The description of the last result on this connection"""
+        return self.__description
 
     def executemany(
             self,
@@ -90,7 +752,8 @@ class ConnectionWrapper:
             parameters: Optional[List[Dict]] = None,
             context: Optional[Any] = None,
     ) -> None:
-        self.cursor().executemany(statement, parameters)
+        with self.cursor() as cur:
+            cur.executemany(statement, parameters)
 
     def execute(
             self,
@@ -100,13 +763,15 @@ class ConnectionWrapper:
     ) -> None:
         try:
             if statement.lower() == "commit":  # this is largely for ipython-sql
-                self.__c.commit()
+                self.commit()
             elif statement.lower() == "register":
-                assert parameters and len(parameters) == 2, parameters
-                view_name, df = parameters
-                self.__c.register(view_name, df)
+                # DuckDB's register() makes a view over a local DataFrame,
+                # which a remote server can't read
+                raise flight_sql.NotSupportedError(
+                    "register() is not supported over Flight SQL, load the data with ingest() instead"
+                )
             else:
-                with self.__c.cursor() as cur:
+                with self.cursor() as cur:
                     cur.execute(statement, parameters)
         except RuntimeError as e:
             if e.args[0].startswith("Not implemented Error"):
@@ -128,25 +793,72 @@ class Dialect(PGDialect_psycopg2):
     name = "adbc_flight_sql"
     driver = "adbc_flight_sql_driver"
     _has_events = False
-    supports_statement_cache = False
+    supports_statement_cache = True
     supports_comments = False
     supports_sane_rowcount = False
     supports_server_side_cursors = False
     inspector = PGInspector
-    # colspecs TODO: remap types to duckdb types
+    ischema_names = util.update_copy(PGDialect_psycopg2.ischema_names, ISCHEMA_NAMES)
+    # Arrow decimals arrive as Decimal
+    supports_native_decimal = True
     colspecs = util.update_copy(
         PGDialect_psycopg2.colspecs,
         {
             # the psycopg2 driver registers a _PGNumeric with custom logic for
-            # postgres type_codes (such as 701 for float) that duckdb doesn't have
-            sqltypes.Numeric: sqltypes.Numeric,
+            # postgres type_codes (such as 701 for float); the type_codes here
+            # are the Arrow types of the results, so these only convert values
+            # the Arrow to Python conversion didn't already give the right type
+            sqltypes.Numeric: ArrowNumeric,
+            sqltypes.Float: ArrowFloat,
+            sqltypes._Binary: ArrowBinary,
+            sqltypes.ARRAY: ArrowArray,
             sqltypes.Interval: sqltypes.Interval,
         },
     )
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         kwargs["use_native_hstore"] = False
+        # UUIDs are strings both ways (Arrow has no UUID type)
+        kwargs["use_native_uuid"] = False
         super().__init__(*args, **kwargs)
+        self._catalog_cache = CatalogCache()
+        self._result_cache = ResultCache()
+        self._catalog_name: Optional[str] = None
+        self._catalog_name_known = False
+        self.reflection_backend = "sql"
+        self.pool_prewarm = 0
+        self.pool_min_idle = 0
+        self.pool_maintenance_interval = DEFAULT_POOL_MAINTENANCE_INTERVAL
+
+    def create_connect_args(self, url: URL) -> Tuple[List[Any], Dict[str, Any]]:
+        cargs, cparams = super().create_connect_args(url)
+        # reflection is cached per engine (dialect), not per connection
+        self._catalog_cache.ttl = float(cparams.pop("reflectionCacheTtl", DEFAULT_REFLECTION_CACHE_TTL))
+        self._catalog_cache.size = int(cparams.pop("reflectionCacheSize", DEFAULT_REFLECTION_CACHE_SIZE))
+        # and persisted for the next worker process, keyed by server identity
+        reflection_cache_file = cparams.pop("reflectionCacheFile", None)
+        reflection_cache_version = cparams.pop("reflectionCacheVersion", "")
+        if reflection_cache_file:
+            self._catalog_cache.file = CatalogFile(
+                reflection_cache_file,
+                identity=(cparams.get("host"), cparams.get("port"), cparams.get("user"), cparams.get("dbname")),
+                version=reflection_cache_version,
+            )
+        reflection_backend = cparams.pop("reflectionBackend", "sql").lower()
+        if reflection_backend not in REFLECTION_BACKENDS:
+            raise ValueError(f"Invalid value for 'reflectionBackend': {reflection_backend}")
+        self.reflection_backend = reflection_backend
+        # connections opened in the background, see engine_created
+        self.pool_prewarm = int(cparams.pop("poolPrewarm", 0))
+        self.pool_min_idle = int(cparams.pop("poolMinIdle", 0))
+        self.pool_maintenance_interval = float(
+            cparams.pop("poolMaintenanceInterval", DEFAULT_POOL_MAINTENANCE_INTERVAL)
+        )
+        # results are cached per engine too
+        self._result_cache.ttl = float(cparams.pop("resultCacheTtl", DEFAULT_RESULT_CACHE_TTL))
+        self._result_cache.max_bytes = int(cparams.pop("resultCacheBytes", DEFAULT_RESULT_CACHE_BYTES))
+        self._result_cache.directory = cparams.pop("resultCacheDir", None)
+        return cargs, cparams
 
     def connect(self, *cargs: Any, **cparams: Any) -> "Connection":
         protocol: str = "grpc"
@@ -156,25 +868,125 @@ class Dialect(PGDialect_psycopg2):
 
         disable_certificate_verification: bool = cparams.get("disableCertificateVerification", "False").lower() == "true"
 
+        stream_buffer_bytes: int = int(cparams.get("streamBufferBytes", DEFAULT_MAX_BUFFER_BYTES))
+        queue_size: Optional[int] = int(cparams["queueSize"]) if "queueSize" in cparams else None
+
+        # fetch the endpoints of multi-endpoint results concurrently
+        fetch_workers: int = int(cparams.get("fetchWorkers", "1"))
+        preserve_order: bool = cparams.get("preserveOrder", "True").lower() == "true"
+
         uri = f"{protocol}://{cparams.get('host')}:{cparams.get('port')}"
         user = cparams.get('user')
         password = cparams.get('password')
 
-        conn = flight_sql.connect(uri=uri,
-                                  db_kwargs={"username": user,
-                                             "password": password,
-                                             "adbc.flight.sql.client_option.tls_skip_verify": str(disable_certificate_verification).lower()
-                                             }
-                                  )
+        # reuse one ADBC database (gRPC channel) per server/credentials, so new
+        # pooled connections skip the TLS handshake and authentication
+        share_database: bool = cparams.get("shareDatabase", "True").lower() == "true"
+
+        # authenticate with a cached bearer token instead of basic auth
+        reuse_token: bool = cparams.get("reuseToken", "True").lower() == "true" and user is not None
+        token_lifetime: Optional[float] = float(cparams["tokenLifetime"]) if "tokenLifetime" in cparams else None
+        token_refresh_margin: float = float(cparams.get("tokenRefreshMargin", auth.DEFAULT_REFRESH_MARGIN))
+        token: Optional[auth.BearerToken] = None
+
+        ingest_batch_size: int = int(cparams.get("ingestBatchSize", DEFAULT_INGEST_BATCH_SIZE))
 
-        # Add a notices attribute for the PostgreSQL / DuckDB dialect...
-        setattr(conn, "notices", ["n/a"])
+        # never open transactions (and ask the server to reject writes)
+        read_only: bool = cparams.get("readOnly", "False").lower() == "true"
 
-        return ConnectionWrapper(conn)
+        # prepared statements kept per connection, keyed by SQL text
+        statement_cache_size: int = int(cparams.get("statementCacheSize", DEFAULT_STATEMENT_CACHE_SIZE))
+
+        # idle cursors kept per connection for reuse
+        cursor_pool_size: int = int(cparams.get("cursorPoolSize", DEFAULT_CURSOR_POOL_SIZE))
+
+        def open_connection() -> flight_sql.Connection:
+            nonlocal token
+            db_kwargs = {"adbc.flight.sql.client_option.tls_skip_verify": str(disable_certificate_verification).lower()}
+            if reuse_token:
+                token = auth.get_token(uri, user, password or "",
+                                       disable_certificate_verification=disable_certificate_verification,
+                                       lifetime=token_lifetime,
+                                       refresh_margin=token_refresh_margin
+                                       )
+                db_kwargs[adbc_driver_flightsql.DatabaseOptions.AUTHORIZATION_HEADER.value] = token.header
+            else:
+                db_kwargs.update(username=user, password=password)
+
+            with tracing.span("connect"):
+                if share_database:
+                    conn = registry.connect(uri=uri,
+                                            db_kwargs=db_kwargs,
+                                            key=(uri, user, password, disable_certificate_verification),
+                                            owner=self
+                                            )
+                else:
+                    conn = flight_sql.connect(uri=uri, db_kwargs=db_kwargs)
+
+            # Add a notices attribute for the PostgreSQL / DuckDB dialect...
+            setattr(conn, "notices", ["n/a"])
+            return conn
+
+        def reconnect() -> flight_sql.Connection:
+            # the token was rejected (expired or revoked) - authenticate again
+            auth.invalidate_token(uri, user, password or "", token)
+            return open_connection()
+
+        try:
+            conn = open_connection()
+        except flight_sql.Error as e:
+            if not (reuse_token and auth.is_unauthenticated(e)):
+                raise
+            conn = reconnect()
+
+        return ConnectionWrapper(conn,
+                                 stream_buffer_bytes=stream_buffer_bytes,
+                                 queue_size=queue_size,
+                                 fetch_workers=fetch_workers,
+                                 preserve_order=preserve_order,
+                                 reconnect=reconnect if reuse_token else None,
+                                 statement_cache_size=statement_cache_size,
+                                 cursor_pool_size=cursor_pool_size,
+                                 ingest_batch_size=ingest_batch_size,
+                                 on_ddl=self.invalidate_reflection_cache,
+                                 read_only=read_only,
+                                 result_cache=self._result_cache
+                                 )
 
     def on_connect(self) -> None:
         pass
 
+    @classmethod
+    def engine_created(cls, engine: Any) -> None:
+        dialect = engine.dialect
+        # the shared database handles only this engine used
+        event.listen(engine, "engine_disposed", lambda _: registry.release(dialect))
+        if not dialect.is_async and (dialect.pool_prewarm > 0 or dialect.pool_min_idle > 0):
+            warmer = PoolWarmer(
+                engine,
+                prewarm=max(dialect.pool_prewarm, dialect.pool_min_idle),
+                min_idle=dialect.pool_min_idle,
+                interval=dialect.pool_maintenance_interval,
+            )
+            # rather than refill the pool after it was emptied
+            event.listen(engine, "engine_disposed", lambda _: warmer.stop())
+            engine._flight_sql_pool_warmer = warmer
+            warmer.start()
+
+    def do_ping(self, dbapi_connection: Any) -> bool:
+        try:
+            dbapi_connection.ping()
+        except flight_sql.Error as e:
+            if self.is_disconnect(e, dbapi_connection, None):
+                return False
+            raise
+        return True
+
+    def is_disconnect(self, e: Exception, connection: Any, cursor: Any) -> bool:
+        if getattr(e, "status_code", None) in DISCONNECT_STATUS_CODES:
+            return True
+        return super().is_disconnect(e, connection, cursor)
+
     @classmethod
     def get_pool_class(cls, url: URL) -> Type[pool.Pool]:
         return pool.QueuePool
@@ -189,23 +1001,155 @@ class Dialect(PGDialect_psycopg2):
     def get_default_isolation_level(self, connection: "Connection") -> None:
         raise NotImplementedError()
 
+    def do_execute(
+            self,
+            cursor: Any,
+            statement: str,
+            parameters: Any,
+            context: Optional[Any] = None,
+    ) -> None:
+        cursor.execute(statement, parameters)
+        self._after_execute(statement, context)
+
+    def do_execute_no_params(
+            self, cursor: Any, statement: str, context: Optional[Any] = None
+    ) -> None:
+        cursor.execute(statement)
+        self._after_execute(statement, context)
+
+    def _after_execute(self, statement: str, context: Optional[Any]) -> None:
+        if getattr(context, "isddl", False) or DDL_PATTERN.match(statement):
+            self.invalidate_reflection_cache()
+
+    def invalidate_reflection_cache(self, schema: Optional[str] = None) -> None:
+        """
+        Drop the cached catalog of ``schema`` (or of every schema), e.g. after
+        DDL issued outside of this engine
+        """
+        self._catalog_cache.invalidate(schema)
+
+    def invalidate_result_cache(self) -> None:
+        """Drop the cached query results, e.g. after the data was refreshed"""
+        self._result_cache.invalidate()
+
+    @property
+    def _reflects_catalog(self) -> bool:
+        return self._catalog_cache.enabled or self.reflection_backend == "adbc"
+
+    def _get_default_schema_name(self, connection: "Connection") -> str:
+        load = super()._get_default_schema_name
+        return self._catalog_cache.setting("default_schema_name", lambda: load(connection))
+
+    def _current_catalog(self, connection: "Connection") -> Optional[str]:
+        # GetObjects returns every catalog the server has (e.g. DuckDB's
+        # "system" and "temp"), information_schema just the current one
+        if not self._catalog_name_known:
+            self._catalog_name = self._catalog_cache.setting(
+                "catalog_name", lambda: self._load_catalog_name(connection)
+            )
+            self._catalog_name_known = True
+        return self._catalog_name
+
+    @staticmethod
+    def _load_catalog_name(connection: "Connection") -> Optional[str]:
+        try:
+            with connection.connection.cursor() as cur:
+                cur.execute("SELECT current_database()")
+                return cur.fetchone()[0]
+        except flight_sql.Error:
+            return None
+
+    def _load_catalog(self, connection: "Connection", schema: Optional[str]) -> Catalog:
+        if self.reflection_backend == "adbc":
+            try:
+                return load_catalog_adbc(connection.connection, schema, catalog=self._current_catalog(connection))
+            except flight_sql.NotSupportedError:
+                util.warn("The server doesn't support ADBC GetObjects - reflecting with information_schema queries")
+                self.reflection_backend = "sql"
+        with connection.connection.cursor() as cur:
+            return load_catalog(cur, schema)
+
+    def _schema_entry(
+            self, connection: "Connection", schema: Optional[str], info_cache: Optional[Dict] = None
+    ) -> Optional[SchemaEntry]:
+        schema = schema if schema is not None else "main"
+        if self._catalog_cache.enabled:
+            return self._catalog_cache.schema(schema, lambda s: self._load_catalog(connection, s))
+        key = ("adbc_flight_sql_driver", "catalog", schema)
+        if info_cache is not None and key in info_cache:
+            return info_cache[key]
+        entry = self._load_catalog(connection, schema).get(schema)
+        if info_cache is not None:
+            info_cache[key] = entry
+        return entry
+
+    def _per_schema(
+            self,
+            connection: "Connection",
+            kind: str,
+            schema: Optional[str],
+            info_cache: Optional[Dict],
+            load: Callable[[CursorWrapper], Any],
+    ) -> Any:
+        """
+        Reflect ``kind`` for a whole schema in one query, remembered in the
+        Inspector's info_cache so that reflecting each of its tables in turn
+        (e.g. MetaData.reflect) only runs it once
+        """
+        schema = schema if schema is not None else "main"
+        key = ("adbc_flight_sql_driver", kind, schema)
+        if info_cache is not None and key in info_cache:
+            return info_cache[key]
+        with connection.connection.cursor() as cur:
+            result = load(cur)
+        if info_cache is not None:
+            info_cache[key] = result
+        return result
+
+    def _table_names(self, entry: SchemaEntry, kind: Any) -> List[str]:
+        if ObjectKind is None or kind is None:
+            return list(entry.tables)
+        names = list(entry.tables) if ObjectKind.TABLE in kind else []
+        if kind & (ObjectKind.VIEW | ObjectKind.MATERIALIZED_VIEW):
+            names += entry.views
+        return names
+
+    def _table_schema(
+            self, connection: "Connection", table_name: str, schema: Optional[str]
+    ) -> Optional[pa.Schema]:
+        """The Arrow schema of a table (one GetTables call), if the server supports it"""
+        try:
+            return connection.connection.adbc_get_table_schema(
+                table_name, db_schema_filter=schema if schema is not None else "main"
+            )
+        except flight_sql.NotSupportedError:
+            return None
+        except flight_sql.Error as e:
+            if getattr(e, "status_code", None) == adbc_driver_manager.AdbcStatusCode.NOT_FOUND:
+                raise exc.NoSuchTableError(table_name) from e
+            raise
+
+    # transactions are opened lazily by the connection, and commit/rollback
+    # are no-ops unless one was - see TransactionManager
     def do_rollback(self, connection: "Connection") -> None:
-        with connection.cursor() as cur:
-            cur.execute("rollback")
+        connection.rollback()
 
     def do_begin(self, connection: "Connection") -> None:
-        with connection.cursor() as cur:
-            cur.execute("begin")
+        connection.begin()
 
     def do_commit(self, connection: "Connection") -> None:
-        with connection.cursor() as cur:
-            cur.execute("commit")
+        connection.commit()
 
     def get_schema_names(
             self,
             connection: Any,
             **kw: Any,
     ) -> Any:
+        if self._catalog_cache.enabled:
+            return self._catalog_cache.schema_names(lambda s: self._load_catalog(connection, s))
+        if self.reflection_backend == "adbc":
+            return sorted(self._load_catalog(connection, None))
+
         s = "SELECT schema_name FROM information_schema.schemata WHERE catalog_name=current_database() ORDER BY 1 ASC"
         with connection.connection.cursor() as cur:
             cur.execute(operation=s)
@@ -220,6 +1164,10 @@ class Dialect(PGDialect_psycopg2):
             include: Optional[Any] = None,
             **kw: Any,
     ) -> Any:
+        if self._reflects_catalog:
+            entry = self._schema_entry(connection, schema)
+            return sorted(entry.tables) if entry is not None else []
+
         s = "SELECT table_name FROM information_schema.tables WHERE table_type='BASE TABLE' AND table_schema=? ORDER BY 1 ASC"
         with connection.connection.cursor() as cur:
             cur.execute(operation=s, parameters=[schema if schema is not None else "main"])
@@ -234,6 +1182,10 @@ class Dialect(PGDialect_psycopg2):
             include: Optional[Any] = None,
             **kw: Any,
     ) -> Any:
+        if self._reflects_catalog:
+            entry = self._schema_entry(connection, schema)
+            return sorted(entry.views) if entry is not None else []
+
         s = "SELECT table_name FROM information_schema.tables WHERE table_type='VIEW' AND table_schema=? ORDER BY 1"
         with connection.connection.cursor() as cur:
             cur.execute(operation=s, parameters=[schema if schema is not None else "main"])
@@ -241,7 +1193,227 @@ class Dialect(PGDialect_psycopg2):
 
         return [row[0] for row in rs]
 
+    def _columns(
+            self,
+            connection: "Connection",
+            table_name: str,
+            schema: Optional[str],
+            columns: Optional[List[Column]],
+    ) -> Optional[List[Dict[str, Any]]]:
+        if self.reflection_backend == "adbc" and (columns is None or any(c.type_name is None for c in columns)):
+            # not in the catalog (created since it was loaded), or the server
+            # only describes the columns by their Arrow types
+            table_schema = self._table_schema(connection, table_name, schema)
+            if table_schema is not None:
+                if columns is None:
+                    columns = [
+                        Column(field.name, None, field.nullable, None, None, None, None)
+                        for field in table_schema
+                    ]
+                columns = with_arrow_types(columns, table_schema)
+
+        if columns is None:
+            return None
+        return [
+            {
+                "name": column.name,
+                "type": resolve_type(self.ischema_names, column),
+                "nullable": column.nullable,
+                "default": column.default,
+                "autoincrement": column.default is not None and "nextval(" in column.default,
+            }
+            for column in columns
+        ]
+
+    def get_columns(
+            self,
+            connection: Any,
+            table_name: str,
+            schema: Optional[str] = None,
+            **kw: Any,
+    ) -> List[Dict[str, Any]]:
+        entry = self._schema_entry(connection, schema, kw.get("info_cache"))
+        columns = self._columns(connection, table_name, schema,
+                                entry.columns.get(table_name) if entry is not None else None)
+        if columns is None:
+            return super().get_columns(connection, table_name, schema, **kw)
+        return columns
+
+    def get_multi_columns(
+            self,
+            connection: Any,
+            schema: Optional[str] = None,
+            filter_names: Optional[List[str]] = None,
+            kind: Optional[Any] = None,
+            **kw: Any,
+    ) -> Iterator[Tuple[Tuple[Optional[str], str], List[Dict[str, Any]]]]:
+        """
+        The columns of every table in ``schema`` (or just ``filter_names``),
+        from one catalog load - see SQLAlchemy 2.0's Inspector.get_multi_columns
+        """
+        entry = self._schema_entry(connection, schema, kw.get("info_cache"))
+        if entry is None:
+            return
+        for table_name in self._table_names(entry, kind):
+            if filter_names is not None and table_name not in filter_names:
+                continue
+            columns = self._columns(connection, table_name, schema, entry.columns[table_name])
+            yield (schema, table_name), columns or []
+
+    def _multi(
+            self,
+            connection: "Connection",
+            schema: Optional[str],
+            filter_names: Optional[List[str]],
+            kind: Optional[Any],
+            info_cache: Optional[Dict],
+            reflected: Dict[str, Any],
+            default: Callable[[], Any],
+    ) -> Iterator[Tuple[Tuple[Optional[str], str], Any]]:
+        entry = self._schema_entry(connection, schema, info_cache)
+        for table_name in self._table_names(entry, kind) if entry is not None else ():
+            if filter_names is not None and table_name not in filter_names:
+                continue
+            yield (schema, table_name), reflected.get(table_name) or default()
+
+    def _primary_keys(self, connection: "Connection", schema: Optional[str], **kw: Any) -> Dict[str, Dict[str, Any]]:
+        def load(cur: CursorWrapper) -> Dict[str, Dict[str, Any]]:
+            constraints = load_key_constraints(cur, schema if schema is not None else "main", "PRIMARY KEY")
+            return {
+                table_name: {"constrained_columns": columns, "name": name}
+                for table_name, by_name in constraints.items()
+                for name, columns in by_name.items()
+            }
+
+        return self._per_schema(connection, "pk", schema, kw.get("info_cache"), load)
+
+    def get_pk_constraint(
+            self,
+            connection: Any,
+            table_name: str,
+            schema: Optional[str] = None,
+            **kw: Any,
+    ) -> Dict[str, Any]:
+        return self._primary_keys(connection, schema, **kw).get(
+            table_name, {"constrained_columns": [], "name": None}
+        )
+
+    def get_multi_pk_constraint(
+            self,
+            connection: Any,
+            schema: Optional[str] = None,
+            filter_names: Optional[List[str]] = None,
+            kind: Optional[Any] = None,
+            **kw: Any,
+    ) -> Iterator[Tuple[Tuple[Optional[str], str], Dict[str, Any]]]:
+        """The primary keys of every table in ``schema`` (or just ``filter_names``), with one query"""
+        return self._multi(connection, schema, filter_names, kind, kw.get("info_cache"),
+                           self._primary_keys(connection, schema, **kw),
+                           lambda: {"constrained_columns": [], "name": None})
+
+    def _unique_constraints(
+            self, connection: "Connection", schema: Optional[str], **kw: Any
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        def load(cur: CursorWrapper) -> Dict[str, List[Dict[str, Any]]]:
+            constraints = load_key_constraints(cur, schema if schema is not None else "main", "UNIQUE")
+            return {
+                table_name: [{"name": name, "column_names": columns} for name, columns in by_name.items()]
+                for table_name, by_name in constraints.items()
+            }
+
+        return self._per_schema(connection, "unique", schema, kw.get("info_cache"), load)
+
+    def get_unique_constraints(
+            self,
+            connection: Any,
+            table_name: str,
+            schema: Optional[str] = None,
+            **kw: Any,
+    ) -> List[Dict[str, Any]]:
+        return self._unique_constraints(connection, schema, **kw).get(table_name, [])
+
+    def get_multi_unique_constraints(
+            self,
+            connection: Any,
+            schema: Optional[str] = None,
+            filter_names: Optional[List[str]] = None,
+            kind: Optional[Any] = None,
+            **kw: Any,
+    ) -> Iterator[Tuple[Tuple[Optional[str], str], List[Dict[str, Any]]]]:
+        """The UNIQUE constraints of every table in ``schema`` (or just ``filter_names``), with one query"""
+        return self._multi(connection, schema, filter_names, kind, kw.get("info_cache"),
+                           self._unique_constraints(connection, schema, **kw), list)
+
+    def _foreign_keys(
+            self, connection: "Connection", schema: Optional[str], **kw: Any
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        def load(cur: CursorWrapper) -> Dict[str, List[Dict[str, Any]]]:
+            foreign_keys = load_foreign_keys(cur, schema if schema is not None else "main")
+            if schema is None:
+                # like PGDialect, only name the referred schema when it isn't the default
+                for fk in itertools.chain.from_iterable(foreign_keys.values()):
+                    if fk["referred_schema"] == self.default_schema_name:
+                        fk["referred_schema"] = None
+            return foreign_keys
+
+        return self._per_schema(connection, "fk", schema, kw.get("info_cache"), load)
+
+    def get_foreign_keys(
+            self,
+            connection: Any,
+            table_name: str,
+            schema: Optional[str] = None,
+            **kw: Any,
+    ) -> List[Dict[str, Any]]:
+        return self._foreign_keys(connection, schema, **kw).get(table_name, [])
+
+    def get_multi_foreign_keys(
+            self,
+            connection: Any,
+            schema: Optional[str] = None,
+            filter_names: Optional[List[str]] = None,
+            kind: Optional[Any] = None,
+            **kw: Any,
+    ) -> Iterator[Tuple[Tuple[Optional[str], str], List[Dict[str, Any]]]]:
+        """The foreign keys of every table in ``schema`` (or just ``filter_names``), with one query"""
+        return self._multi(connection, schema, filter_names, kind, kw.get("info_cache"),
+                           self._foreign_keys(connection, schema, **kw), list)
+
+    def _check_constraints(
+            self, connection: "Connection", schema: Optional[str], **kw: Any
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        return self._per_schema(connection, "check", schema, kw.get("info_cache"),
+                                lambda cur: load_check_constraints(cur, schema if schema is not None else "main"))
+
+    def get_multi_check_constraints(
+            self,
+            connection: Any,
+            schema: Optional[str] = None,
+            filter_names: Optional[List[str]] = None,
+            kind: Optional[Any] = None,
+            **kw: Any,
+    ) -> Iterator[Tuple[Tuple[Optional[str], str], List[Dict[str, Any]]]]:
+        """The CHECK constraints of every table in ``schema`` (or just ``filter_names``), with one query"""
+        return self._multi(connection, schema, filter_names, kind, kw.get("info_cache"),
+                           self._check_constraints(connection, schema, **kw), list)
+
+    def get_table_comment(
+            self,
+            connection: Any,
+            table_name: str,
+            schema: Optional[str] = None,
+            **kw: Any,
+    ) -> Dict[str, Any]:
+        # supports_comments is False - don't query pg_description for each table
+        return {"text": None}
+
     def get_check_constraints(self, connection, table_name, schema=None, **kw):
+        try:
+            return self._check_constraints(connection, schema, **kw).get(table_name, [])
+        except flight_sql.Error:
+            # no information_schema.check_constraints - try pg_catalog
+            pass
+
         table_oid = self.get_table_oid(
             connection, table_name, schema, info_cache=kw.get("info_cache")
         )
@@ -261,31 +1433,7 @@ class Dialect(PGDialect_psycopg2):
             cur.execute(operation=CHECK_SQL, parameters=[table_oid])
             rs = cur.fetchall()
 
-        ret = []
-        for name, src in rs:
-            # samples:
-            # "CHECK (((a > 1) AND (a < 5)))"
-            # "CHECK (((a = 1) OR ((a > 2) AND (a < 5))))"
-            # "CHECK (((a > 1) AND (a < 5))) NOT VALID"
-            # "CHECK (some_boolean_function(a))"
-            # "CHECK (((a\n < 1)\n OR\n (a\n >= 5))\n)"
-
-            m = re.match(
-                r"^CHECK *\((.+)\)( NOT VALID)?$", src, flags=re.DOTALL
-            )
-            if not m:
-                util.warn("Could not parse CHECK constraint text: %r" % src)
-                sqltext = ""
-            else:
-                sqltext = re.compile(
-                    r"^[\s\n]*\((.+)\)[\s\n]*$", flags=re.DOTALL
-                ).sub(r"\1", m.group(1))
-            entry = {"name": name, "sqltext": sqltext}
-            if m and m.group(2):
-                entry["dialect_options"] = {"not_valid": True}
-
-            ret.append(entry)
-        return ret
+        return [parse_check_constraint(name, src) for name, src in rs]
 
     def get_indexes(
             self,
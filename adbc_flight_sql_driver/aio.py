@@ -0,0 +1,392 @@
+"""
+asyncio support: the ``adbc_flight_sql+async`` dialect for SQLAlchemy's
+``create_async_engine``, and async iteration of Arrow record batches.
+
+The ADBC driver only has a blocking API, so every call into it runs on a
+thread pool shared by the engine while the event loop awaits the result.
+A thread is only held for the duration of a single driver call (connect,
+execute, reading the next batch...), never while a connection sits idle,
+waits in the pool or waits for the application to consume its result.  The
+pool's threads are started on first use and stopped when the engine is
+disposed.
+"""
+import asyncio
+import functools
+import itertools
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+import pyarrow as pa
+from sqlalchemy import event, pool, util
+from sqlalchemy.dialects.postgresql.psycopg2 import PGExecutionContext_psycopg2
+from sqlalchemy.engine import AdaptedConnection
+from sqlalchemy.engine.url import URL
+from sqlalchemy.util.concurrency import await_fallback, await_only
+
+from . import ConnectionWrapper, CursorWrapper, Dialect
+from .datatypes import to_pylist
+from .ingest import IngestMode
+
+# Number of threads running blocking driver calls, per engine
+DEFAULT_ASYNC_WORKERS = 64
+
+
+async def _run_in_executor(executor: Optional[Executor], fn: Callable, *args: Any, **kwargs: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+
+class _LazyThreadPool(Executor):
+    """
+    A thread pool started on first use.  shutdown() lets its threads go once
+    they are idle, and the next call starts a new pool (e.g. for connections
+    of a disposed engine that were still checked out).
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any) -> Future:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="flight-sql-async")
+            return self._pool.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+def _next_batch(reader: pa.RecordBatchReader) -> Optional[pa.RecordBatch]:
+    # StopIteration can't be raised through a Future
+    try:
+        return reader.read_next_batch()
+    except StopIteration:
+        return None
+
+
+def _rows(table: pa.Table) -> Iterator[Tuple]:
+    for batch in table.to_batches():
+        yield from zip(*(to_pylist(column) for column in batch.columns))
+
+
+class AsyncConnectionWrapper:
+    """
+    asyncio interface of a ConnectionWrapper.  Calls are serialized per
+    connection and run on the engine's executor.
+    """
+
+    def __init__(self, connection: ConnectionWrapper, executor: Optional[Executor] = None) -> None:
+        self.connection = connection
+        self._executor = executor
+        self._lock = asyncio.Lock()
+
+    async def run(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking call on this connection (or one of its cursors) on the executor"""
+        async with self._lock:
+            return await _run_in_executor(self._executor, fn, *args, **kwargs)
+
+    async def stream_record_batches(
+            self, operation: str, parameters: Optional[Any] = None
+    ) -> "AsyncRecordBatchStream":
+        """Execute ``operation`` and iterate its result batch by batch, see AsyncRecordBatchStream"""
+        cursor = self.connection.cursor()
+        try:
+            await self.run(cursor.execute, operation, parameters)
+        except BaseException:
+            await self.run(cursor.close)
+            raise
+        return AsyncRecordBatchStream(self, cursor)
+
+    async def fetch_arrow_table(self, operation: str, parameters: Optional[Any] = None) -> pa.Table:
+        """Execute ``operation`` and read its whole result into an Arrow table"""
+        async with await self.stream_record_batches(operation, parameters) as stream:
+            return await stream.read_all()
+
+    async def ingest(
+            self,
+            table_name: str,
+            data: Any,
+            mode: IngestMode = "create",
+            schema: Optional[str] = None,
+            batch_size: Optional[int] = None,
+    ) -> int:
+        """See ConnectionWrapper.ingest"""
+        return await self.run(self.connection.ingest, table_name, data, mode=mode, schema=schema, batch_size=batch_size)
+
+    async def commit(self) -> None:
+        await self.run(self.connection.commit)
+
+    async def rollback(self) -> None:
+        await self.run(self.connection.rollback)
+
+    async def close(self) -> None:
+        await self.run(self.connection.close)
+
+
+class AsyncRecordBatchStream:
+    """
+    Async iterator over the record batches of a result.  Each batch is read
+    on the executor, so the event loop keeps running while the server
+    produces it; the cursor is released once the result is exhausted or the
+    stream is closed.
+    """
+
+    def __init__(self, connection: AsyncConnectionWrapper, cursor: CursorWrapper) -> None:
+        self._connection = connection
+        self._cursor = cursor
+        self._reader = cursor.fetch_record_batches()
+        self._closed = False
+
+    @property
+    def schema(self) -> pa.Schema:
+        return self._reader.schema
+
+    def __aiter__(self) -> "AsyncRecordBatchStream":
+        return self
+
+    async def __anext__(self) -> pa.RecordBatch:
+        if self._closed:
+            raise StopAsyncIteration
+        batch = await self._connection.run(_next_batch, self._reader)
+        if batch is None:
+            await self.aclose()
+            raise StopAsyncIteration
+        return batch
+
+    async def read_all(self) -> pa.Table:
+        return pa.Table.from_batches([batch async for batch in self], schema=self.schema)
+
+    async def aclose(self) -> None:
+        if not self._closed:
+            self._closed = True
+            await self._connection.run(self._cursor.close)
+
+    async def __aenter__(self) -> "AsyncRecordBatchStream":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+
+class AsyncAdapt_adbc_cursor:
+    """
+    DB-API cursor for SQLAlchemy on top of AsyncConnectionWrapper.  execute()
+    reads the whole result as Arrow on the executor and releases the driver
+    cursor, rows are converted as they are fetched; see AsyncAdapt_adbc_ss_cursor
+    for streaming.
+    """
+
+    server_side = False
+
+    def __init__(self, adapt_connection: "AsyncAdapt_adbc_connection") -> None:
+        self._adapt_connection = adapt_connection
+        self.connection = adapt_connection.driver_connection.connection
+        self.arraysize = 1
+        self.description: Optional[List[Tuple]] = None
+        self.rowcount = -1
+        self._table: Optional[pa.Table] = None
+        self._rows: Iterator[Tuple] = iter(())
+
+    def _run(self, fn: Callable, *args: Any) -> Any:
+        return self._adapt_connection.run(fn, *args)
+
+    def __enter__(self) -> "AsyncAdapt_adbc_cursor":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[Tuple]:
+        return self._rows
+
+    def setinputsizes(self, *inputsizes: Any) -> None:
+        pass
+
+    def close(self) -> None:
+        self._table = None
+        self._rows = iter(())
+
+    def execute(self, operation: str, parameters: Optional[Any] = None) -> None:
+        self._table = self._run(self._execute, operation, parameters)
+        self._rows = _rows(self._table) if self._table is not None else iter(())
+
+    def _execute(self, operation: str, parameters: Optional[Any]) -> Optional[pa.Table]:
+        # runs on the executor
+        with self.connection.cursor() as cursor:
+            cursor.execute(operation, parameters)
+            self.description = cursor.description
+            self.rowcount = cursor.rowcount
+            return cursor.fetch_arrow_table() if self.description is not None else None
+
+    def executemany(self, operation: str, seq_of_parameters: Any) -> None:
+        self.close()
+        self._run(self._executemany, operation, seq_of_parameters)
+
+    def _executemany(self, operation: str, seq_of_parameters: Any) -> None:
+        # runs on the executor
+        with self.connection.cursor() as cursor:
+            cursor.executemany(operation, seq_of_parameters)
+            self.description = None
+            self.rowcount = cursor.rowcount
+
+    def fetchone(self) -> Optional[Tuple]:
+        return next(self._rows, None)
+
+    def fetchmany(self, size: Optional[int] = None) -> List[Tuple]:
+        return list(itertools.islice(self._rows, self.arraysize if size is None else size))
+
+    def fetchall(self) -> List[Tuple]:
+        return list(self._rows)
+
+    def fetch_arrow_table(self) -> pa.Table:
+        if self._table is None:
+            raise self._adapt_connection.dbapi.Error("Cannot fetch_arrow_table() before execute()")
+        table = self._table
+        self.close()
+        return table
+
+
+class AsyncAdapt_adbc_ss_cursor(AsyncAdapt_adbc_cursor):
+    """Cursor for stream_results: rows are read from the server as they are fetched"""
+
+    server_side = True
+
+    def __init__(self, adapt_connection: "AsyncAdapt_adbc_connection") -> None:
+        super().__init__(adapt_connection)
+        self._cursor = self.connection.cursor()
+
+    def __iter__(self) -> Iterator[Tuple]:
+        while True:
+            rows = self.fetchmany(max(self.arraysize, 1000))
+            if not rows:
+                return
+            yield from rows
+
+    def close(self) -> None:
+        if not self._cursor.closed:
+            self._run(self._cursor.close)
+
+    def _execute(self, operation: str, parameters: Optional[Any]) -> None:
+        # runs on the executor
+        self._cursor.execute(operation, parameters)
+        self.description = self._cursor.description
+        self.rowcount = self._cursor.rowcount
+
+    def _executemany(self, operation: str, seq_of_parameters: Any) -> None:
+        # runs on the executor
+        self._cursor.executemany(operation, seq_of_parameters)
+        self.description = None
+        self.rowcount = self._cursor.rowcount
+
+    def fetchone(self) -> Optional[Tuple]:
+        return self._run(self._cursor.fetchone)
+
+    def fetchmany(self, size: Optional[int] = None) -> List[Tuple]:
+        return self._run(self._cursor.fetchmany, self.arraysize if size is None else size)
+
+    def fetchall(self) -> List[Tuple]:
+        return self._run(self._cursor.fetchall)
+
+    def fetch_arrow_table(self) -> pa.Table:
+        return self._run(self._cursor.fetch_arrow_table)
+
+
+class AsyncAdapt_adbc_connection(AdaptedConnection):
+    """DB-API connection for SQLAlchemy on top of AsyncConnectionWrapper"""
+
+    await_ = staticmethod(await_only)
+    __slots__ = ("dbapi",)
+
+    def __init__(self, dbapi: Any, connection: AsyncConnectionWrapper) -> None:
+        self.dbapi = dbapi
+        self._connection = connection
+
+    def run(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        return self.await_(self._connection.run(fn, *args, **kwargs))
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._connection.connection, name)
+        return functools.partial(self.run, attr) if callable(attr) else attr
+
+    def cursor(self, server_side: bool = False) -> AsyncAdapt_adbc_cursor:
+        if server_side:
+            return AsyncAdapt_adbc_ss_cursor(self)
+        return AsyncAdapt_adbc_cursor(self)
+
+    def begin(self) -> None:
+        # only records the request, see TransactionManager
+        self._connection.connection.begin()
+
+    # without an open transaction commit/rollback are bookkeeping only (e.g.
+    # the rollback on every return to the pool) - skip the executor round trip
+    def commit(self) -> None:
+        connection = self._connection.connection
+        self.run(connection.commit) if connection.in_transaction else connection.commit()
+
+    def rollback(self) -> None:
+        connection = self._connection.connection
+        self.run(connection.rollback) if connection.in_transaction else connection.rollback()
+
+    def close(self) -> None:
+        self.run(self._connection.connection.close)
+
+
+class AsyncAdaptFallback_adbc_connection(AsyncAdapt_adbc_connection):
+    __slots__ = ()
+
+    await_ = staticmethod(await_fallback)
+
+
+class FlightSQLExecutionContext_async(PGExecutionContext_psycopg2):
+    def create_server_side_cursor(self) -> AsyncAdapt_adbc_cursor:
+        return self._dbapi_connection.cursor(server_side=True)
+
+
+class AsyncDialect(Dialect):
+    driver = "async"
+    is_async = True
+    supports_statement_cache = True
+    supports_server_side_cursors = True
+    execution_ctx_cls = FlightSQLExecutionContext_async
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._executor: Optional[Executor] = None
+
+    def create_connect_args(self, url: URL) -> Tuple[List[Any], Dict[str, Any]]:
+        cargs, cparams = super().create_connect_args(url)
+        # one thread pool per engine, sized for the queries it runs concurrently
+        async_workers = int(cparams.pop("asyncWorkers", DEFAULT_ASYNC_WORKERS))
+        self._executor = _LazyThreadPool(async_workers)
+        return cargs, cparams
+
+    @classmethod
+    def engine_created(cls, engine: Any) -> None:
+        super().engine_created(engine)
+        executor = engine.dialect._executor
+        if executor is not None:
+            # after the pool closed its connections (on the executor)
+            event.listen(engine, "engine_disposed", lambda _: executor.shutdown(wait=False))
+
+    def connect(self, *cargs: Any, **cparams: Any) -> AsyncAdapt_adbc_connection:
+        async_fallback = util.asbool(cparams.pop("async_fallback", False))
+        await_ = await_fallback if async_fallback else await_only
+        # connecting may authenticate and do a TLS handshake - off the event loop too
+        connection = await_(_run_in_executor(self._executor, super().connect, *cargs, **cparams))
+        adapted = AsyncAdaptFallback_adbc_connection if async_fallback else AsyncAdapt_adbc_connection
+        return adapted(self.dbapi, AsyncConnectionWrapper(connection, self._executor))
+
+    @classmethod
+    def get_pool_class(cls, url: URL) -> Type[pool.Pool]:
+        if util.asbool(url.query.get("async_fallback", False)):
+            return pool.FallbackAsyncAdaptedQueuePool
+        return pool.AsyncAdaptedQueuePool
+
+    def get_driver_connection(self, connection: AsyncAdapt_adbc_connection) -> AsyncConnectionWrapper:
+        return connection.driver_connection
@@ -0,0 +1,144 @@
+"""
+Process-wide cache of Flight SQL bearer tokens, so that new connections (and
+connections re-created by pool recycles) skip the basic-auth handshake.
+"""
+import base64
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import adbc_driver_flightsql.dbapi as flight_sql
+import adbc_driver_manager
+from pyarrow import flight
+
+from . import tracing
+
+# Tokens are refreshed this many seconds before they expire
+DEFAULT_REFRESH_MARGIN = 60.0
+
+# pyarrow's Flight errors, and the DB-API errors ADBC raises for their status
+_ERRORS = (
+    (flight.FlightUnauthenticatedError, flight_sql.ProgrammingError, adbc_driver_manager.AdbcStatusCode.UNAUTHENTICATED),
+    (flight.FlightUnauthorizedError, flight_sql.ProgrammingError, adbc_driver_manager.AdbcStatusCode.UNAUTHORIZED),
+    (flight.FlightTimedOutError, flight_sql.OperationalError, adbc_driver_manager.AdbcStatusCode.TIMEOUT),
+    (flight.FlightCancelledError, flight_sql.OperationalError, adbc_driver_manager.AdbcStatusCode.CANCELLED),
+    (flight.FlightUnavailableError, flight_sql.OperationalError, adbc_driver_manager.AdbcStatusCode.IO),
+)
+
+
+class BearerToken(NamedTuple):
+    header: str
+    expires_at: Optional[float]
+
+    def expires_within(self, seconds: float) -> bool:
+        return self.expires_at is not None and self.expires_at - seconds <= time.time()
+
+
+_Key = Tuple[str, str, str]
+
+_lock = threading.Lock()
+_tokens: Dict[_Key, BearerToken] = {}
+# held while logging in, so that each key logs in once at a time without
+# holding up the others
+_logins: Dict[_Key, threading.Lock] = {}
+
+
+def _key(uri: str, user: str, password: str) -> _Key:
+    # the password is part of the key so a cached token is never handed to a
+    # caller that didn't authenticate with the same credentials
+    return uri, user, hashlib.sha256(password.encode()).hexdigest()
+
+
+def _jwt_expiry(header: str) -> Optional[float]:
+    token = header.split(" ", 1)[-1]
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+        return float(claims["exp"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _dbapi_error(uri: str, e: flight.FlightError) -> flight_sql.Error:
+    for flight_error, error, status_code in _ERRORS:
+        if isinstance(e, flight_error):
+            break
+    else:
+        error, status_code = flight_sql.OperationalError, adbc_driver_manager.AdbcStatusCode.UNKNOWN
+    return error(f"Couldn't log in to {uri}: {e}", status_code=status_code)
+
+
+def _authenticate(
+        uri: str,
+        user: str,
+        password: str,
+        disable_certificate_verification: bool,
+        lifetime: Optional[float],
+) -> BearerToken:
+    client = flight.FlightClient(uri, disable_server_verification=disable_certificate_verification)
+    try:
+        _, value = client.authenticate_basic_token(user, password)
+    except flight.FlightError as e:
+        raise _dbapi_error(uri, e) from e
+    finally:
+        client.close()
+
+    header = value.decode()
+    expires_at = _jwt_expiry(header)
+    if expires_at is None and lifetime is not None:
+        expires_at = time.time() + lifetime
+    return BearerToken(header, expires_at)
+
+
+def get_token(
+        uri: str,
+        user: str,
+        password: str,
+        disable_certificate_verification: bool = False,
+        lifetime: Optional[float] = None,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+) -> BearerToken:
+    """
+    Return the cached bearer token for (uri, user), authenticating when there
+    is none or it expires within ``refresh_margin`` seconds.  The expiry is
+    read from the token when it is a JWT, else ``lifetime`` (seconds) is
+    assumed; tokens with no known expiry are kept until invalidated.
+    """
+    key = _key(uri, user, password)
+    with _lock:
+        token = _tokens.get(key)
+        if token is not None and not token.expires_within(refresh_margin):
+            return token
+        login = _logins.setdefault(key, threading.Lock())
+    with login:
+        # another caller may have logged in meanwhile
+        with _lock:
+            token = _tokens.get(key)
+        if token is None or token.expires_within(refresh_margin):
+            with tracing.span("auth"):
+                token = _authenticate(uri, user, password, disable_certificate_verification, lifetime)
+            with _lock:
+                _tokens[key] = token
+        return token
+
+
+def invalidate_token(uri: str, user: str, password: str, token: Optional[BearerToken] = None) -> None:
+    """
+    Drop the cached token for (uri, user) - only if it is still ``token`` when
+    given, so that concurrent callers don't throw away a fresh token
+    """
+    key = _key(uri, user, password)
+    with _lock:
+        if token is None or _tokens.get(key) == token:
+            _tokens.pop(key, None)
+
+
+def is_unauthenticated(e: BaseException) -> bool:
+    return (
+        isinstance(e, flight_sql.Error)
+        and getattr(e, "status_code", None) == adbc_driver_manager.AdbcStatusCode.UNAUTHENTICATED
+    )
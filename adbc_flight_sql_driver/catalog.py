@@ -0,0 +1,542 @@
+"""
+Per-engine cache of the server's catalog (schemas, tables, views and their
+columns), loaded with a single information_schema query - or a single ADBC
+GetObjects call - instead of one query per reflection call.
+"""
+import base64
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Type
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from sqlalchemy import types as sqltypes
+from sqlalchemy import util
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from .catalog_file import CatalogFile, to_monotonic, to_wall_clock
+from .datatypes import arrow_to_sqltype
+
+# Seconds a loaded schema is served from the cache (0 disables the cache)
+DEFAULT_REFLECTION_CACHE_TTL = 300.0
+# Number of schemas kept in the cache
+DEFAULT_REFLECTION_CACHE_SIZE = 1000
+
+CATALOG_SQL = """
+    SELECT
+        s.schema_name,
+        t.table_name,
+        t.table_type,
+        c.column_name,
+        c.data_type,
+        c.is_nullable,
+        c.column_default,
+        c.character_maximum_length,
+        c.numeric_precision,
+        c.numeric_scale
+    FROM information_schema.schemata s
+    LEFT JOIN information_schema.tables t
+        ON t.table_catalog = s.catalog_name
+        AND t.table_schema = s.schema_name
+        AND t.table_type IN ('BASE TABLE', 'VIEW')
+    LEFT JOIN information_schema.columns c
+        ON c.table_catalog = t.table_catalog
+        AND c.table_schema = t.table_schema
+        AND c.table_name = t.table_name
+    WHERE s.catalog_name = current_database() {schema_filter}
+    ORDER BY s.schema_name, t.table_name, c.ordinal_position
+"""
+
+KEY_CONSTRAINTS_SQL = """
+    SELECT
+        tc.table_name,
+        tc.constraint_name,
+        kcu.column_name
+    FROM information_schema.table_constraints tc
+    JOIN information_schema.key_column_usage kcu
+        ON kcu.constraint_catalog = tc.constraint_catalog
+        AND kcu.constraint_schema = tc.constraint_schema
+        AND kcu.constraint_name = tc.constraint_name
+        AND kcu.table_name = tc.table_name
+    WHERE tc.constraint_type = ?
+        AND tc.table_catalog = current_database()
+        AND tc.table_schema = ?
+    ORDER BY tc.table_name, tc.constraint_name, kcu.ordinal_position
+"""
+
+FOREIGN_KEYS_SQL = """
+    SELECT
+        tc.table_name,
+        tc.constraint_name,
+        kcu.column_name,
+        -- the Go Flight SQL client can't read results with duplicate column names
+        ukcu.table_schema AS referred_schema,
+        ukcu.table_name AS referred_table,
+        ukcu.column_name AS referred_column
+    FROM information_schema.table_constraints tc
+    JOIN information_schema.key_column_usage kcu
+        ON kcu.constraint_catalog = tc.constraint_catalog
+        AND kcu.constraint_schema = tc.constraint_schema
+        AND kcu.constraint_name = tc.constraint_name
+        AND kcu.table_name = tc.table_name
+    JOIN information_schema.referential_constraints rc
+        ON rc.constraint_catalog = tc.constraint_catalog
+        AND rc.constraint_schema = tc.constraint_schema
+        AND rc.constraint_name = tc.constraint_name
+    JOIN information_schema.key_column_usage ukcu
+        ON ukcu.constraint_catalog = rc.unique_constraint_catalog
+        AND ukcu.constraint_schema = rc.unique_constraint_schema
+        AND ukcu.constraint_name = rc.unique_constraint_name
+        AND ukcu.ordinal_position = kcu.position_in_unique_constraint
+    WHERE tc.constraint_type = 'FOREIGN KEY'
+        AND tc.table_catalog = current_database()
+        AND tc.table_schema = ?
+    ORDER BY tc.table_name, tc.constraint_name, kcu.ordinal_position
+"""
+
+CHECK_CONSTRAINTS_SQL = """
+    SELECT DISTINCT
+        tc.table_name,
+        tc.constraint_name,
+        cc.check_clause
+    FROM information_schema.table_constraints tc
+    JOIN information_schema.check_constraints cc
+        ON cc.constraint_catalog = tc.constraint_catalog
+        AND cc.constraint_schema = tc.constraint_schema
+        AND cc.constraint_name = tc.constraint_name
+    WHERE tc.constraint_type = 'CHECK'
+        AND tc.table_catalog = current_database()
+        AND tc.table_schema = ?
+    ORDER BY tc.table_name, tc.constraint_name
+"""
+
+
+class Column(NamedTuple):
+    name: str
+    type_name: Optional[str]  # None when the server only reports Arrow types
+    nullable: bool
+    default: Optional[str]
+    length: Optional[int]
+    precision: Optional[int]
+    scale: Optional[int]
+    arrow_type: Optional[pa.DataType] = None
+
+
+class SchemaEntry(NamedTuple):
+    tables: List[str]
+    views: List[str]
+    columns: Dict[str, List[Column]]
+    loaded_at: float
+
+
+Catalog = Dict[str, SchemaEntry]
+
+
+def _encode_arrow_type(arrow_type: Optional[pa.DataType]) -> Optional[str]:
+    if arrow_type is None:
+        return None
+    # the IPC schema message keeps every parameter of the type
+    return base64.b64encode(pa.schema([pa.field("", arrow_type)]).serialize().to_pybytes()).decode()
+
+
+def _decode_arrow_type(encoded: Optional[str]) -> Optional[pa.DataType]:
+    if encoded is None:
+        return None
+    return pa.ipc.read_schema(pa.py_buffer(base64.b64decode(encoded))).field(0).type
+
+
+def encode_schema_entry(entry: SchemaEntry) -> Dict[str, Any]:
+    """``entry`` as JSON values, for CatalogFile"""
+    return {
+        "tables": entry.tables,
+        "views": entry.views,
+        "columns": {
+            table: [list(column._replace(arrow_type=_encode_arrow_type(column.arrow_type))) for column in columns]
+            for table, columns in entry.columns.items()
+        },
+        "loaded_at": entry.loaded_at,
+    }
+
+
+def decode_schema_entry(encoded: Dict[str, Any]) -> SchemaEntry:
+    columns = {}
+    for table, fields in encoded["columns"].items():
+        columns[table] = [Column(*field)._replace(arrow_type=_decode_arrow_type(field[-1])) for field in fields]
+    return SchemaEntry(list(encoded["tables"]), list(encoded["views"]), columns, float(encoded["loaded_at"]))
+
+
+def load_catalog(cursor: Any, schema: Optional[str] = None) -> Catalog:
+    """
+    Read the tables, views and columns of ``schema`` (or of every schema in
+    the current database) with one query, fetched as Arrow
+    """
+    if schema is None:
+        cursor.execute(CATALOG_SQL.format(schema_filter=""))
+    else:
+        cursor.execute(CATALOG_SQL.format(schema_filter="AND s.schema_name = ?"), [schema])
+    result = cursor.fetch_arrow_table()
+
+    loaded_at = time.monotonic()
+    catalog: Catalog = {}
+    current: Tuple[Optional[str], Optional[str]] = (None, None)
+    columns: List[Column] = []
+    for (schema_name, table_name, table_type, column_name, data_type, is_nullable, default,
+         length, precision, scale) in zip(*(column.to_pylist() for column in result.columns)):
+        entry = catalog.get(schema_name)
+        if entry is None:
+            entry = catalog[schema_name] = SchemaEntry([], [], {}, loaded_at)
+        if table_name is None:
+            continue
+        if current != (schema_name, table_name):
+            current = (schema_name, table_name)
+            (entry.views if table_type == "VIEW" else entry.tables).append(table_name)
+            columns = entry.columns[table_name] = []
+        if column_name is not None:
+            columns.append(
+                Column(column_name, data_type, is_nullable == "YES", default, length, precision, scale)
+            )
+    return catalog
+
+
+def load_catalog_adbc(
+        connection: Any, schema: Optional[str] = None, catalog: Optional[str] = None
+) -> Catalog:
+    """
+    Read the tables, views and columns of ``schema`` (or of every schema in
+    ``catalog``) with one ADBC GetObjects call (Flight SQL GetDbSchemas and
+    GetTables).  Raises NotSupportedError if the server doesn't implement it.
+    """
+    objects = connection.adbc_get_objects(
+        depth="all",
+        catalog_filter=catalog,
+        db_schema_filter=schema,
+    ).read_all()
+
+    # flatten the nested catalog -> schema -> table -> column lists with
+    # Arrow compute rather than converting the whole structure to Python
+    schema_lists = objects.column("catalog_db_schemas").combine_chunks()
+    schemas = pc.list_flatten(schema_lists)
+    table_lists = schemas.field("db_schema_tables")
+    tables = pc.list_flatten(table_lists)
+    column_lists = tables.field("table_columns")
+    columns = pc.list_flatten(column_lists)
+
+    schema_names = schemas.field("db_schema_name").to_pylist()
+    table_schemas = pc.list_parent_indices(table_lists).to_pylist()
+    table_names = tables.field("table_name").to_pylist()
+    table_types = tables.field("table_type").to_pylist()
+
+    loaded_at = time.monotonic()
+    result: Catalog = {}
+    for schema_name in schema_names:
+        if schema is None or schema_name == schema:  # the filter is a LIKE pattern
+            result.setdefault(schema_name, SchemaEntry([], [], {}, loaded_at))
+
+    table_columns: List[Optional[List[Column]]] = []
+    for schema_index, table_name, table_type in zip(table_schemas, table_names, table_types):
+        entry = result.get(schema_names[schema_index])
+        table_type = (table_type or "").upper()
+        if entry is None or table_type not in ("VIEW", "TABLE", "BASE TABLE"):
+            table_columns.append(None)
+            continue
+        (entry.views if table_type == "VIEW" else entry.tables).append(table_name)
+        table_columns.append(entry.columns.setdefault(table_name, []))
+
+    for table_index, name, ordinal, type_name, nullable, default, size, digits in sorted(
+        zip(
+            pc.list_parent_indices(column_lists).to_pylist(),
+            columns.field("column_name").to_pylist(),
+            columns.field("ordinal_position").fill_null(0).to_pylist(),
+            columns.field("xdbc_type_name").to_pylist(),
+            columns.field("xdbc_nullable").to_pylist(),
+            columns.field("xdbc_column_def").to_pylist(),
+            columns.field("xdbc_column_size").to_pylist(),
+            columns.field("xdbc_decimal_digits").to_pylist(),
+        ),
+        key=lambda c: (c[0], c[2]),
+    ):
+        target = table_columns[table_index]
+        if target is not None:
+            target.append(Column(name, type_name, nullable != 0, default, size, size, digits))
+    return result
+
+
+def load_key_constraints(
+        cursor: Any, schema: str, constraint_type: str
+) -> Dict[str, "OrderedDict[str, List[str]]"]:
+    """
+    The PRIMARY KEY or UNIQUE constraints of every table in ``schema``: their
+    columns, by constraint name, by table name
+    """
+    cursor.execute(KEY_CONSTRAINTS_SQL, [constraint_type, schema])
+    result = cursor.fetch_arrow_table()
+
+    constraints: Dict[str, "OrderedDict[str, List[str]]"] = {}
+    for table_name, name, column_name in zip(*(column.to_pylist() for column in result.columns)):
+        constraints.setdefault(table_name, OrderedDict()).setdefault(name, []).append(column_name)
+    return constraints
+
+
+def load_foreign_keys(cursor: Any, schema: str) -> Dict[str, List[Dict[str, Any]]]:
+    """The foreign keys of every table in ``schema``, by table name"""
+    cursor.execute(FOREIGN_KEYS_SQL, [schema])
+    result = cursor.fetch_arrow_table()
+
+    foreign_keys: Dict[str, "OrderedDict[str, Dict[str, Any]]"] = {}
+    for (table_name, name, column_name, referred_schema, referred_table,
+         referred_column) in zip(*(column.to_pylist() for column in result.columns)):
+        fk = foreign_keys.setdefault(table_name, OrderedDict()).setdefault(name, {
+            "name": name,
+            "constrained_columns": [],
+            "referred_schema": referred_schema,
+            "referred_table": referred_table,
+            "referred_columns": [],
+            "options": {},
+        })
+        fk["constrained_columns"].append(column_name)
+        fk["referred_columns"].append(referred_column)
+    return {table_name: list(fks.values()) for table_name, fks in foreign_keys.items()}
+
+
+_CHECK = re.compile(r"^CHECK *\((.+)\)( NOT VALID)?$", flags=re.DOTALL)
+_PARENTHESIZED = re.compile(r"^[\s\n]*\((.+)\)[\s\n]*$", flags=re.DOTALL)
+_NOT_NULL = re.compile(r"^\S+ IS NOT NULL$", flags=re.IGNORECASE)
+
+
+def parse_check_constraint(name: str, src: str) -> Dict[str, Any]:
+    """
+    The reflected form of a CHECK constraint, from its definition as given by
+    pg_get_constraintdef ("CHECK (...)") or information_schema (DuckDB's
+    "CHECK(...)", PostgreSQL's bare "(...)")
+    """
+    # samples:
+    # "CHECK (((a > 1) AND (a < 5)))"
+    # "CHECK (((a = 1) OR ((a > 2) AND (a < 5))))"
+    # "CHECK (((a > 1) AND (a < 5))) NOT VALID"
+    # "CHECK (some_boolean_function(a))"
+    # "CHECK (((a\n < 1)\n OR\n (a\n >= 5))\n)"
+    # "((a > 1) AND (a < 5))"
+
+    m = _CHECK.match(src)
+    if m:
+        sqltext = _PARENTHESIZED.sub(r"\1", m.group(1))
+    elif _PARENTHESIZED.match(src):
+        sqltext = _PARENTHESIZED.sub(r"\1", src)
+    else:
+        util.warn("Could not parse CHECK constraint text: %r" % src)
+        sqltext = ""
+    entry: Dict[str, Any] = {"name": name, "sqltext": sqltext}
+    if m and m.group(2):
+        entry["dialect_options"] = {"not_valid": True}
+    return entry
+
+
+def load_check_constraints(cursor: Any, schema: str) -> Dict[str, List[Dict[str, Any]]]:
+    """The CHECK constraints of every table in ``schema``, by table name"""
+    cursor.execute(CHECK_CONSTRAINTS_SQL, [schema])
+    result = cursor.fetch_arrow_table()
+
+    check_constraints: Dict[str, List[Dict[str, Any]]] = {}
+    for table_name, name, src in zip(*(column.to_pylist() for column in result.columns)):
+        if _NOT_NULL.match(src):
+            # NOT NULL columns are listed as CHECK constraints too
+            continue
+        check_constraints.setdefault(table_name, []).append(parse_check_constraint(name, src))
+    return check_constraints
+
+
+def with_arrow_types(columns: List[Column], schema: pa.Schema) -> List[Column]:
+    """Fill in the Arrow types of ``columns`` from the table's Arrow schema"""
+    types = {field.name: field.type for field in schema}
+    return [column._replace(arrow_type=types.get(column.name)) for column in columns]
+
+
+_TYPE_NAME = re.compile(r"^(.+?)\s*(?:\((.*)\))?$", flags=re.DOTALL)
+
+
+def resolve_type(
+        ischema_names: Dict[str, Type[sqltypes.TypeEngine]],
+        column: Column,
+) -> sqltypes.TypeEngine:
+    """The SQLAlchemy type of a cached column"""
+    if column.type_name is None:
+        if column.arrow_type is None:
+            util.warn("Did not get a type for column '%s'" % column.name)
+            return sqltypes.NULLTYPE
+        return arrow_to_sqltype(column.arrow_type)
+
+    type_name = column.type_name.strip()
+    if type_name.endswith("[]"):
+        return ARRAY(resolve_type(ischema_names, column._replace(type_name=type_name[:-2])))
+
+    m = _TYPE_NAME.match(type_name)
+    assert m is not None
+    name, args = m.group(1).lower(), m.group(2)
+    coltype = ischema_names.get(name)
+    if coltype is None:
+        util.warn("Did not recognize type '%s' of column '%s'" % (type_name, column.name))
+        return sqltypes.NULLTYPE
+
+    if args is not None:
+        # DuckDB spells out the type arguments, e.g. DECIMAL(18,3)
+        try:
+            return coltype(*(int(arg) for arg in args.split(",")))
+        except (TypeError, ValueError):
+            return coltype()
+    if issubclass(coltype, sqltypes.String) and column.length is not None:
+        return coltype(column.length)
+    if (
+        issubclass(coltype, sqltypes.Numeric)
+        and not issubclass(coltype, sqltypes.Float)
+        and column.precision is not None
+    ):
+        return coltype(column.precision, column.scale)
+    return coltype()
+
+
+class CatalogCache:
+    """
+    Thread-safe cache of catalog snapshots, by schema.
+
+    The first lookup loads the whole catalog in one pass; afterwards a schema
+    that expired (after ``ttl`` seconds) or was evicted (past ``size``
+    schemas, least recently used first) is reloaded on its own, until the
+    list of schemas itself expires.  Loads run outside the lock, so
+    concurrent misses may load the same schema twice - a load that overlaps
+    with invalidate() is not stored.
+
+    With a ``file`` the cache (and dialect settings, see setting()) is also
+    persisted: it is read on first use, so a new process starts out with
+    what earlier ones loaded (entries keep their age), and rewritten after
+    every load and invalidation.
+    """
+
+    def __init__(
+            self,
+            ttl: float = DEFAULT_REFLECTION_CACHE_TTL,
+            size: int = DEFAULT_REFLECTION_CACHE_SIZE,
+    ) -> None:
+        self.ttl = ttl
+        self.size = size
+        self._lock = threading.Lock()
+        self._schemas: "OrderedDict[str, SchemaEntry]" = OrderedDict()
+        self._names: Optional[Tuple[float, List[str]]] = None
+        self._generation = 0
+        self._settings: Dict[str, Any] = {}
+        self.file: Optional[CatalogFile] = None
+        self._file_loaded = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.size > 0
+
+    def _fresh(self, loaded_at: float) -> bool:
+        return time.monotonic() - loaded_at < self.ttl
+
+    def _load_file(self) -> None:
+        # called with the lock held
+        self._file_loaded = True
+        record = self.file.load() if self.file is not None else None
+        if record is None:
+            return
+        try:
+            settings = dict(record["settings"])
+            names = None
+            if record["names"] is not None:
+                loaded_at, schema_names = record["names"]
+                names = (to_monotonic(loaded_at), list(schema_names))
+            schemas = {name: decode_schema_entry(entry) for name, entry in record["schemas"].items()}
+        except (KeyError, TypeError, ValueError, AttributeError, pa.ArrowException):
+            # not a record of ours - as good as no record
+            return
+        self._settings.update(settings)
+        self._names = names
+        for name, entry in schemas.items():
+            self._schemas[name] = entry._replace(loaded_at=to_monotonic(entry.loaded_at))
+
+    def _save_file(self) -> None:
+        if self.file is None:
+            return
+        with self._lock:
+            record = {
+                "settings": dict(self._settings),
+                "names": (to_wall_clock(self._names[0]), self._names[1]) if self._names is not None else None,
+                "schemas": {
+                    name: encode_schema_entry(entry._replace(loaded_at=to_wall_clock(entry.loaded_at)))
+                    for name, entry in self._schemas.items()
+                },
+            }
+        try:
+            self.file.save(record)
+        except OSError as e:
+            util.warn(f"Couldn't save the reflection cache to {self.file.path}: {e}")
+
+    def _store(self, catalog: Catalog, generation: int, complete: bool) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            if complete:
+                self._names = (time.monotonic(), sorted(catalog))
+            for name, entry in catalog.items():
+                self._schemas[name] = entry
+                self._schemas.move_to_end(name)
+            while len(self._schemas) > self.size:
+                self._schemas.popitem(last=False)
+        self._save_file()
+
+    def schema_names(self, load: Callable[[Optional[str]], Catalog]) -> List[str]:
+        with self._lock:
+            if not self._file_loaded:
+                self._load_file()
+            if self._names is not None and self._fresh(self._names[0]):
+                return list(self._names[1])
+            generation = self._generation
+
+        catalog = load(None)
+        self._store(catalog, generation, complete=True)
+        return sorted(catalog)
+
+    def schema(self, name: str, load: Callable[[Optional[str]], Catalog]) -> Optional[SchemaEntry]:
+        """The cached entry for schema ``name``, or None if it doesn't exist"""
+        with self._lock:
+            if not self._file_loaded:
+                self._load_file()
+            entry = self._schemas.get(name)
+            if entry is not None and self._fresh(entry.loaded_at):
+                self._schemas.move_to_end(name)
+                return entry
+            generation = self._generation
+            complete = self._names is not None and self._fresh(self._names[0])
+
+        catalog = load(name if complete else None)
+        self._store(catalog, generation, complete=not complete)
+        return catalog.get(name)
+
+    def invalidate(self, schema: Optional[str] = None) -> None:
+        """Forget ``schema``, or the whole catalog"""
+        with self._lock:
+            self._generation += 1
+            if schema is None:
+                self._schemas.clear()
+                self._names = None
+            else:
+                self._schemas.pop(schema, None)
+        self._save_file()
+
+    def setting(self, name: str, load: Callable[[], Any]) -> Any:
+        """
+        A value of the server that doesn't change (e.g. its default schema),
+        kept in the file - loaded each time without one
+        """
+        if self.file is None:
+            return load()
+        with self._lock:
+            if not self._file_loaded:
+                self._load_file()
+            if name in self._settings:
+                return self._settings[name]
+        value = self._settings[name] = load()
+        self._save_file()
+        return value
@@ -0,0 +1,82 @@
+"""
+The reflection cache persisted to a local file, so that a new worker process
+starts out with the catalog (and the dialect settings) that other processes
+already loaded, instead of reflecting the server again.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import sqlalchemy
+
+# bumped whenever what is stored changes shape - older files are ignored
+FORMAT_VERSION = 2
+
+
+def to_wall_clock(monotonic: float) -> float:
+    return time.time() - (time.monotonic() - monotonic)
+
+
+def to_monotonic(wall_clock: float) -> float:
+    return time.monotonic() - (time.time() - wall_clock)
+
+
+class CatalogFile:
+    """
+    A JSON file holding a record per server, see CatalogCache - records are
+    plain JSON values, so the file is safe to share.
+
+    The record of this server is only used while ``version`` (e.g. the
+    warehouse's schema migration version) matches the one it was saved with.
+    The file is rewritten atomically, so processes sharing it never read a
+    partial file - concurrent saves for the same server keep the last one.
+    """
+
+    def __init__(self, path: str, identity: Tuple[Any, ...], version: str = "") -> None:
+        self.path = os.path.expanduser(path)
+        self.identity = identity
+        self.version = version
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[Any]:
+        return [FORMAT_VERSION, sqlalchemy.__version__]
+
+    def _read(self) -> Dict[Tuple[Any, ...], Dict[str, Any]]:
+        try:
+            with open(self.path, "rb") as f:
+                content = json.load(f)
+            if content["header"] != self._header():
+                # written by an incompatible version of the driver
+                return {}
+            return {tuple(identity): record for identity, record in content["records"] if isinstance(record, dict)}
+        except (OSError, ValueError, KeyError, TypeError):
+            # missing, unreadable or not a file of ours
+            return {}
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """The record of this server, None if there is none for its version"""
+        with self._lock:
+            record = self._read().get(self.identity)
+        if record is None or record.get("version") != self.version:
+            return None
+        return record
+
+    def save(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            records = self._read()
+            records[self.identity] = dict(record, version=self.version)
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            fd, partial = tempfile.mkstemp(prefix=".reflection-", dir=directory)
+            try:
+                with os.fdopen(fd, "w") as f:
+                    # JSON objects only have string keys
+                    json.dump({"header": self._header(), "records": [list(item) for item in records.items()]}, f)
+                os.replace(partial, self.path)
+            except BaseException:
+                os.unlink(partial)
+                raise
+
@@ -0,0 +1,109 @@
+"""
+Compression codecs for stored query results (e.g. Superset's results
+backend).  Data whose codec isn't known is detected from its magic bytes on
+read, so the codec can be changed without invalidating what is already stored.
+"""
+import io
+import zlib
+from typing import Any, Optional, Union
+
+import pyarrow as pa
+
+CODECS = ("zlib", "zstd", "lz4", "none")
+
+# frame magic numbers
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+LZ4_MAGIC = b"\x04\x22\x4d\x18"
+
+
+class _Sink(io.BytesIO):
+    # pyarrow closes the file it writes to - keep the value
+    value = b""
+
+    def close(self) -> None:
+        if not self.closed:
+            # BytesIO hands over its buffer without a copy
+            self.value = self.getvalue()
+        super().close()
+
+
+class Compressor:
+    """
+    Compresses data written to it chunk by chunk (anything supporting the
+    buffer protocol, e.g. a memoryview of an Arrow buffer, is written without
+    a copy); finish() returns the compressed bytes.  ``level`` applies to
+    zlib, zstd and lz4 use their default level.
+    """
+
+    def __init__(self, codec: str = "zlib", level: Optional[int] = None) -> None:
+        if codec not in CODECS:
+            raise ValueError(f"Invalid value for 'codec': {codec}")
+        self.codec = codec
+        self._sink = _Sink()
+        self._zlib: Any = None
+        self._stream: Any = None
+        if codec == "zlib":
+            self._zlib = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION if level is None else level)
+        elif codec != "none":
+            self._stream = pa.CompressedOutputStream(
+                pa.PythonFile(self._sink, mode="w"), codec
+            )
+
+    def write(self, data: Any) -> None:
+        if self._zlib is not None:
+            self._sink.write(self._zlib.compress(data))
+        elif self._stream is not None:
+            self._stream.write(data)
+        else:
+            self._sink.write(data)
+
+    def finish(self) -> bytes:
+        if self._zlib is not None:
+            self._sink.write(self._zlib.flush())
+        elif self._stream is not None:
+            self._stream.close()
+        self._sink.close()
+        return self._sink.value
+
+
+def compress(data: Union[bytes, str, Any], codec: str = "zlib", level: Optional[int] = None) -> bytes:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    compressor = Compressor(codec, level)
+    compressor.write(data)
+    return compressor.finish()
+
+
+def detect(blob: bytes) -> str:
+    """The codec ``blob`` was compressed with"""
+    if blob[:4] == ZSTD_MAGIC:
+        return "zstd"
+    if blob[:4] == LZ4_MAGIC:
+        return "lz4"
+    # zlib header: deflate, with a checksum over the first two bytes
+    if len(blob) >= 2 and blob[0] & 0x0F == 8 and (blob[0] << 8 | blob[1]) % 31 == 0:
+        return "zlib"
+    return "none"
+
+
+def decompress(blob: bytes, codec: Optional[str] = None) -> bytes:
+    """
+    ``blob`` decompressed with ``codec``, detected when not given.  Data that
+    doesn't decompress with the given codec raises.
+    """
+    detected = codec is None
+    if detected:
+        codec = detect(blob)
+    elif codec not in CODECS:
+        raise ValueError(f"Invalid value for 'codec': {codec}")
+    if codec == "zlib":
+        try:
+            return zlib.decompress(blob)
+        except zlib.error:
+            if not detected:
+                raise
+            # uncompressed data that happens to start like a zlib header
+            return blob
+    if codec == "none":
+        return blob
+    return pa.CompressedInputStream(pa.BufferReader(blob), codec).read()
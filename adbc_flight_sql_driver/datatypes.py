@@ -7,11 +7,39 @@ select * from duckdb_types where type_category = 'NUMERIC';
 ```
 """
 
-from typing import Any
+import decimal
+from typing import Any, Callable, Dict, List, Optional, Type
 
+import pyarrow as pa
+import pyarrow.compute as pc
+from sqlalchemy import types as sqltypes
+from sqlalchemy.dialects.postgresql import (
+    ARRAY,
+    BIGINT,
+    BOOLEAN,
+    BYTEA,
+    DATE,
+    DOUBLE_PRECISION,
+    INTEGER,
+    INTERVAL,
+    JSON,
+    NUMERIC,
+    REAL,
+    SMALLINT,
+    TIME,
+    TIMESTAMP,
+    VARCHAR,
+)
 from sqlalchemy.dialects.postgresql.base import PGTypeCompiler
+from sqlalchemy.dialects.postgresql.psycopg2 import PGDialect_psycopg2
 from sqlalchemy.ext.compiler import compiles
-from sqlalchemy.types import BigInteger, Integer, SmallInteger
+from sqlalchemy.types import NULLTYPE, BigInteger, Integer, SmallInteger
+from sqlalchemy.types import TypeEngine
+
+try:
+    from sqlalchemy.engine import processors
+except ImportError:  # SQLAlchemy < 2.0
+    from sqlalchemy import processors  # type: ignore
 
 # INTEGER	INT4, INT, SIGNED	-2147483648	2147483647
 # SMALLINT	INT2, SHORT	-32768	32767
@@ -83,6 +111,184 @@ types = [
 assert types
 
 
+# DuckDB type names (as reported by information_schema.columns.data_type)
+# that PostgreSQL doesn't have, for Dialect.ischema_names
+ISCHEMA_NAMES: Dict[str, Type[TypeEngine]] = {
+    "varchar": VARCHAR,
+    "decimal": NUMERIC,
+    "double": DOUBLE_PRECISION,
+    "float": REAL,
+    "blob": BYTEA,
+    "tinyint": TinyInteger,
+    "utinyint": UTinyInteger,
+    "usmallint": USmallInteger,
+    "uinteger": UInteger,
+    "ubigint": UBigInteger,
+    "hugeint": HugeInteger,
+    "timestamp_s": TIMESTAMP,
+    "timestamp_ms": TIMESTAMP,
+    "timestamp_ns": TIMESTAMP,
+    "json": JSON,
+}
+
+
+_ARROW_TYPES: Dict[pa.DataType, Type[TypeEngine]] = {
+    pa.bool_(): BOOLEAN,
+    pa.int8(): TinyInteger,
+    pa.int16(): SMALLINT,
+    pa.int32(): INTEGER,
+    pa.int64(): BIGINT,
+    pa.uint8(): UTinyInteger,
+    pa.uint16(): USmallInteger,
+    pa.uint32(): UInteger,
+    pa.uint64(): UBigInteger,
+    pa.float16(): REAL,
+    pa.float32(): REAL,
+    pa.float64(): DOUBLE_PRECISION,
+    pa.string(): VARCHAR,
+    pa.large_string(): VARCHAR,
+    pa.binary(): BYTEA,
+    pa.large_binary(): BYTEA,
+    pa.date32(): DATE,
+    pa.date64(): DATE,
+}
+
+
+def arrow_to_sqltype(t: pa.DataType) -> TypeEngine:
+    """The SQLAlchemy type for columns of Arrow type ``t``"""
+    if pa.types.is_dictionary(t):
+        return arrow_to_sqltype(t.value_type)
+    if pa.types.is_decimal(t):
+        return NUMERIC(t.precision, t.scale)
+    if pa.types.is_timestamp(t):
+        return TIMESTAMP(timezone=t.tz is not None)
+    if pa.types.is_time(t):
+        return TIME()
+    if pa.types.is_duration(t) or pa.types.is_interval(t):
+        return INTERVAL()
+    if pa.types.is_fixed_size_binary(t):
+        return BYTEA()
+    if pa.types.is_list(t) or pa.types.is_large_list(t) or pa.types.is_fixed_size_list(t):
+        return ARRAY(arrow_to_sqltype(t.value_type))
+    coltype = _ARROW_TYPES.get(t)
+    return coltype() if coltype is not None else NULLTYPE
+
+
+def _numpy_convertible(t: pa.DataType, has_nulls: bool) -> bool:
+    if pa.types.is_string(t) or pa.types.is_large_string(t) or pa.types.is_decimal(t):
+        # object arrays, with None for nulls
+        return True
+    if has_nulls:
+        # would be NaN or NaT
+        return False
+    if pa.types.is_timestamp(t):
+        # datetime64[ns] becomes ints, and tz-aware timestamps naive
+        return t.tz is None and t.unit != "ns"
+    return (
+        pa.types.is_integer(t)
+        or pa.types.is_float32(t)
+        or pa.types.is_float64(t)
+        or pa.types.is_boolean(t)
+        or pa.types.is_date32(t)
+    )
+
+
+def _in_datetime_range(array: pa.Array) -> bool:
+    # numpy gives ints for dates beyond the range of datetime (e.g. DuckDB's
+    # infinity), to_pylist() raises
+    bounds = pc.min_max(array)
+    try:
+        bounds["min"].as_py()
+        bounds["max"].as_py()
+    except (OverflowError, ValueError):
+        return False
+    return True
+
+
+def to_pylist(array: pa.Array) -> List[Any]:
+    """
+    The values of ``array`` as Python objects, like ``array.to_pylist()``
+    but through numpy for the types it converts to the same objects - much
+    faster than building an Arrow scalar per value
+    """
+    t = array.type
+    if _numpy_convertible(t, array.null_count > 0) and (
+            not (pa.types.is_timestamp(t) or pa.types.is_date32(t)) or _in_datetime_range(array)
+    ):
+        return array.to_numpy(zero_copy_only=False).tolist()
+    return array.to_pylist()
+
+
+# Result types whose values the Arrow to Python conversion (to_pylist) already
+# gives as SQLAlchemy wants them.  SQLAlchemy passes the type_code of the
+# column's cursor.description - its Arrow type - to result_processor(), and
+# these only add a per-value processor when that type needs converting.
+
+def _arrow_type(coltype: Any) -> Optional[pa.DataType]:
+    if not isinstance(coltype, pa.DataType):
+        return None
+    return coltype.value_type if pa.types.is_dictionary(coltype) else coltype
+
+
+def _number_processor(type_: sqltypes.Numeric, arrow_type: pa.DataType) -> Optional[Callable[[Any], Any]]:
+    if type_.asdecimal:
+        if pa.types.is_decimal(arrow_type):
+            return None
+        return processors.to_decimal_processor_factory(decimal.Decimal, type_._effective_decimal_return_scale)
+    if pa.types.is_floating(arrow_type) or pa.types.is_null(arrow_type):
+        return None
+    return processors.to_float
+
+
+class ArrowNumeric(sqltypes.Numeric):
+    def result_processor(self, dialect: Any, coltype: Any) -> Optional[Callable[[Any], Any]]:
+        arrow_type = _arrow_type(coltype)
+        if arrow_type is None:
+            return super().result_processor(dialect, coltype)
+        return _number_processor(self, arrow_type)
+
+
+class ArrowFloat(sqltypes.Float):
+    def result_processor(self, dialect: Any, coltype: Any) -> Optional[Callable[[Any], Any]]:
+        arrow_type = _arrow_type(coltype)
+        if arrow_type is None:
+            return super().result_processor(dialect, coltype)
+        return _number_processor(self, arrow_type)
+
+
+class ArrowBinary(sqltypes.LargeBinary):
+    def result_processor(self, dialect: Any, coltype: Any) -> Optional[Callable[[Any], Any]]:
+        arrow_type = _arrow_type(coltype)
+        if arrow_type is not None and (
+                pa.types.is_binary(arrow_type)
+                or pa.types.is_large_binary(arrow_type)
+                or pa.types.is_fixed_size_binary(arrow_type)
+        ):
+            return None
+        return super().result_processor(dialect, coltype)
+
+
+class ArrowArray(PGDialect_psycopg2.colspecs[sqltypes.ARRAY]):  # type: ignore
+    """Arrow lists arrive as Python lists: only their items may need processing"""
+
+    def result_processor(self, dialect: Any, coltype: Any) -> Optional[Callable[[Any], Any]]:
+        arrow_type = _arrow_type(coltype)
+        if arrow_type is None or not (
+                pa.types.is_list(arrow_type)
+                or pa.types.is_large_list(arrow_type)
+                or pa.types.is_fixed_size_list(arrow_type)
+        ):
+            return super().result_processor(dialect, coltype)
+        item_type = arrow_type.value_type
+        if (
+                not self.as_tuple
+                and not self._against_native_enum
+                and self.item_type.dialect_impl(dialect).result_processor(dialect, item_type) is None
+        ):
+            return None
+        return super().result_processor(dialect, item_type)
+
+
 def register_extension_types() -> None:
     for subclass in types:
         compiles(subclass, "duckdb")(compile_uint)
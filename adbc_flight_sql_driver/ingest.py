@@ -0,0 +1,171 @@
+"""
+Bulk loading of Arrow data (tables, record batch readers or pandas
+DataFrames) into a Flight SQL server.
+"""
+import sys
+import uuid
+from typing import Any, Iterator, Literal, Optional
+
+import adbc_driver_flightsql.dbapi as flight_sql
+import pyarrow as pa
+
+IngestMode = Literal["create", "append", "replace"]
+
+# Rows sent per batch (DoPut message)
+DEFAULT_INGEST_BATCH_SIZE = 65536
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _qualified_name(table_name: str, schema: Optional[str]) -> str:
+    if schema:
+        return f"{_quote(schema)}.{_quote(table_name)}"
+    return _quote(table_name)
+
+
+def _sql_type(t: pa.DataType) -> str:
+    if pa.types.is_dictionary(t):
+        return _sql_type(t.value_type)
+    if pa.types.is_boolean(t):
+        return "BOOLEAN"
+    if pa.types.is_int8(t) or pa.types.is_int16(t) or pa.types.is_uint8(t):
+        return "SMALLINT"
+    if pa.types.is_int32(t) or pa.types.is_uint16(t):
+        return "INTEGER"
+    if pa.types.is_int64(t) or pa.types.is_uint32(t):
+        return "BIGINT"
+    if pa.types.is_uint64(t):
+        return "NUMERIC(20, 0)"
+    if pa.types.is_float16(t) or pa.types.is_float32(t):
+        return "REAL"
+    if pa.types.is_float64(t):
+        return "DOUBLE PRECISION"
+    if pa.types.is_decimal(t):
+        return f"DECIMAL({t.precision}, {t.scale})"
+    if pa.types.is_string(t) or pa.types.is_large_string(t):
+        return "VARCHAR"
+    if pa.types.is_binary(t) or pa.types.is_large_binary(t) or pa.types.is_fixed_size_binary(t):
+        return "BYTEA"
+    if pa.types.is_date(t):
+        return "DATE"
+    if pa.types.is_time(t):
+        return "TIME"
+    if pa.types.is_timestamp(t):
+        return "TIMESTAMP WITH TIME ZONE" if t.tz else "TIMESTAMP"
+    if pa.types.is_duration(t):
+        return "INTERVAL"
+    raise NotImplementedError(f"Cannot ingest a column of type {t}")
+
+
+def _decoded(schema: pa.Schema) -> pa.Schema:
+    # dictionary-encoded columns (e.g. pandas categoricals) are sent decoded
+    return pa.schema(
+        [
+            field.with_type(field.type.value_type) if pa.types.is_dictionary(field.type) else field
+            for field in schema
+        ]
+    )
+
+
+def to_record_batch_reader(data: Any, batch_size: int = DEFAULT_INGEST_BATCH_SIZE) -> pa.RecordBatchReader:
+    """Turn ``data`` into a reader of record batches of at most batch_size rows"""
+    pandas = sys.modules.get("pandas")
+    if pandas is not None and isinstance(data, pandas.DataFrame):
+        data = pa.Table.from_pandas(data, preserve_index=False)
+    if isinstance(data, pa.RecordBatch):
+        data = pa.Table.from_batches([data])
+    if isinstance(data, pa.Table):
+        data = data.to_reader(max_chunksize=batch_size)
+    if not isinstance(data, pa.RecordBatchReader):
+        raise TypeError(f"Cannot ingest data of type {type(data).__name__}")
+
+    source = data
+    schema = _decoded(source.schema)
+
+    def batches() -> Iterator[pa.RecordBatch]:
+        for batch in source:
+            table = pa.Table.from_batches([batch])
+            if table.schema != schema:
+                table = table.cast(schema)
+            yield from table.to_batches(max_chunksize=batch_size)
+
+    return pa.RecordBatchReader.from_batches(schema, batches())
+
+
+def _load(
+        connection: flight_sql.Connection,
+        table_name: str,
+        reader: pa.RecordBatchReader,
+        append: bool,
+        schema: Optional[str],
+) -> int:
+    qualified_name = _qualified_name(table_name, schema)
+    with connection.cursor() as cur:
+        if schema is None:
+            try:
+                return cur.adbc_ingest(table_name, reader, mode="append" if append else "create")
+            except flight_sql.NotSupportedError:
+                pass
+
+        if not append:
+            columns = ", ".join(f"{_quote(field.name)} {_sql_type(field.type)}" for field in reader.schema)
+            cur.execute(f"CREATE TABLE {qualified_name} ({columns})")
+
+    insert = "INSERT INTO {} ({}) VALUES ({})".format(
+        qualified_name,
+        ", ".join(_quote(name) for name in reader.schema.names),
+        ", ".join("?" for _ in reader.schema.names),
+    )
+    rows = 0
+    with connection.cursor() as cur:
+        for batch in reader:
+            cur.executemany(insert, batch)
+            rows = -1 if rows < 0 or cur.rowcount < 0 else rows + cur.rowcount
+    return rows
+
+
+def ingest(
+        connection: flight_sql.Connection,
+        table_name: str,
+        data: Any,
+        mode: IngestMode = "create",
+        schema: Optional[str] = None,
+        batch_size: int = DEFAULT_INGEST_BATCH_SIZE,
+) -> int:
+    """
+    Load ``data`` (an Arrow table, record batch(es) or a pandas DataFrame) into
+    ``table_name``, streaming it in batches of ``batch_size`` rows.
+
+    ``mode`` is "create" (the table must not exist), "append" (it must) or
+    "replace".  Replacing loads into a staging table first, which is renamed
+    to ``table_name`` once the load succeeded - a failed load leaves the old
+    table as it was.  Uses ADBC bulk ingest when the server supports it,
+    otherwise falls back to a prepared INSERT with each batch bound as its
+    parameters (one DoPut per batch).
+
+    Returns the number of rows loaded, or -1 if the server doesn't say.
+    """
+    if mode not in ("create", "append", "replace"):
+        raise ValueError(f"Invalid value for 'mode': {mode}")
+
+    reader = to_record_batch_reader(data, batch_size)
+    if mode != "replace":
+        return _load(connection, table_name, reader, mode == "append", schema)
+
+    staging_name = f"{table_name}_replacing_{uuid.uuid4().hex[:12]}"
+    staging = _qualified_name(staging_name, schema)
+    try:
+        rows = _load(connection, staging_name, reader, False, schema)
+        with connection.cursor() as cur:
+            cur.execute(f"DROP TABLE IF EXISTS {_qualified_name(table_name, schema)}")
+            cur.execute(f"ALTER TABLE {staging} RENAME TO {_quote(table_name)}")
+    except BaseException:
+        try:
+            with connection.cursor() as cur:
+                cur.execute(f"DROP TABLE IF EXISTS {staging}")
+        except flight_sql.Error:
+            pass
+        raise
+    return rows
@@ -0,0 +1,140 @@
+"""
+Encoding the rows of an Arrow table as a JSON array of objects a column at a
+time (e.g. for Superset's SQL Lab results), without a Python object per value.
+"""
+import json
+from typing import Any, Callable, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# larger integers lose precision in JavaScript, so they are sent as strings
+JS_MAX_INTEGER = 2 ** 53 - 1
+# significant digits any float64 keeps, so JavaScript parses decimals of this
+# precision back to the same value
+DOUBLE_DIGITS = 15
+# characters JSON strings need escaped that the vectorized escaping doesn't handle
+JSON_CONTROL_CHARACTERS = "[\\x00-\\x08\\x0b\\x0c\\x0e-\\x1f]"
+JSON_ESCAPES = (
+    ("\\", "\\\\"),
+    ('"', '\\"'),
+    ("\n", "\\n"),
+    ("\r", "\\r"),
+    ("\t", "\\t"),
+)
+
+
+def _quoted(values: pa.ChunkedArray) -> pa.ChunkedArray:
+    return pc.binary_join_element_wise('"', values, '"', "")
+
+
+def _json_string(values: pa.ChunkedArray) -> pa.ChunkedArray:
+    encoded = values
+    for char, escaped in JSON_ESCAPES:
+        encoded = pc.replace_substring(encoded, char, escaped)
+    encoded = _quoted(encoded)
+    controls = pc.fill_null(pc.match_substring_regex(values, JSON_CONTROL_CHARACTERS), False)
+    if pc.any(controls).as_py():
+        # rare - let json escape the strings that have them
+        escaped = [
+            json.dumps(value) if control else None
+            for value, control in zip(values.to_pylist(), controls.to_pylist())
+        ]
+        encoded = pc.if_else(controls, pa.array(escaped, type=pa.string()), encoded)
+    return encoded
+
+
+def _big_integers(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    # compared in the column's own type: uint64 values past int64 can't be
+    # compared with a Python int, and abs() of the smallest int64 overflows
+    type_ = column.type
+    big = pc.greater(column, pa.scalar(JS_MAX_INTEGER, type_))
+    if pa.types.is_signed_integer(type_):
+        big = pc.or_(big, pc.less(column, pa.scalar(-JS_MAX_INTEGER, type_)))
+    return big
+
+
+def json_values(column: pa.ChunkedArray, default: Optional[Callable[[Any], Any]] = None) -> pa.ChunkedArray:
+    """
+    Each value of ``column`` as JSON text (null for nulls), as json.dumps with
+    ``default`` would encode it - with NaN and infinities as null, integers
+    JavaScript can't represent as strings, and decimals keeping their exact
+    digits instead of going through float
+    """
+    type_ = column.type
+    if pa.types.is_dictionary(type_):
+        return json_values(column.cast(type_.value_type), default)
+    if pa.types.is_null(type_):
+        return pa.chunked_array([pa.nulls(len(column), pa.string())])
+    if pa.types.is_boolean(type_):
+        return pc.if_else(column, "true", "false")
+    if pa.types.is_integer(type_):
+        encoded = column.cast(pa.string())
+        if type_.bit_width == 64:
+            encoded = pc.if_else(_big_integers(column), _quoted(encoded), encoded)
+        return encoded
+    if pa.types.is_decimal(type_):
+        precision = type_.precision
+        if type_.scale < 0:
+            # as integers - "1.E+3" isn't JSON
+            precision -= type_.scale
+            column = column.cast(pa.decimal256(precision, 0))
+        encoded = column.cast(pa.string())
+        if precision > DOUBLE_DIGITS:
+            # the exact digits: decimals a double can't hold are sent as
+            # strings, like the big integers
+            encoded = _quoted(encoded)
+        return encoded
+    if pa.types.is_floating(type_):
+        column = column.cast(pa.float64())
+        return pc.if_else(pc.is_finite(column), column.cast(pa.string()), None)
+    if pa.types.is_string(type_) or pa.types.is_large_string(type_):
+        return _json_string(column)
+    if pa.types.is_timestamp(type_) and type_.tz is None:
+        # much faster than strftime
+        column = column.cast(pa.timestamp("us"), safe=False)
+        encoded = pc.binary_join_element_wise(
+            column.cast(pa.date32()).cast(pa.string()),
+            column.cast(pa.time64("us")).cast(pa.string()),
+            "T",
+        )
+        # datetime.isoformat() leaves out zero microseconds
+        encoded = pc.if_else(
+            pc.ends_with(encoded, ".000000"),
+            pc.utf8_slice_codeunits(encoded, 0, -7),
+            encoded,
+        )
+        return _quoted(encoded)
+    if pa.types.is_date(type_):
+        return _quoted(column.cast(pa.date32()).cast(pa.string()))
+    return pa.array(
+        [None if value is None else json.dumps(value, default=default) for value in column.to_pylist()],
+        type=pa.string(),
+    )
+
+
+def arrow_to_json(table: pa.Table, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """
+    The rows of ``table`` as a JSON array of objects, see json_values;
+    ``default`` encodes the values of types without a vectorized encoding
+    """
+    if table.num_rows == 0:
+        return "[]"
+    if table.num_columns == 0:
+        return "[" + ",".join(["{}"] * table.num_rows) + "]"
+
+    # large strings, the encoded result may well outgrow 2GB
+    def text(value: str) -> pa.Scalar:
+        return pa.scalar(value, pa.large_string())
+
+    parts: List[Any] = []
+    for i, (name, column) in enumerate(zip(table.column_names, table.columns)):
+        parts.append(text(("{" if i == 0 else ",") + json.dumps(name) + ":"))
+        parts.append(pc.fill_null(json_values(column, default), "null").cast(pa.large_string()))
+    parts.append(text("}"))
+    rows = pc.binary_join_element_wise(*parts, text(""))
+    if isinstance(rows, pa.ChunkedArray):
+        rows = rows.combine_chunks()
+    rows = pa.LargeListArray.from_arrays(pa.array([0, len(rows)], pa.int64()), rows)
+    joined = pc.binary_join(rows, text(","))
+    return "[" + joined[0].as_py() + "]"
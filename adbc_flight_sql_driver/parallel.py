@@ -0,0 +1,110 @@
+"""
+Parallel fetch of the endpoints (partitions) of a Flight SQL FlightInfo.
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, List, Union
+
+import adbc_driver_flightsql.dbapi as flight_sql
+import pyarrow as pa
+
+from .streaming import record_batch_reader
+
+# Number of batches buffered per partition before its reader waits
+DEFAULT_PARTITION_QUEUE_SIZE = 4
+
+_END = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+class ParallelFetch:
+    """
+    Reads every partition of a result concurrently (one DoGet per endpoint)
+    on a bounded thread pool and yields the record batches.
+
+    With ``preserve_order`` the batches come back partition by partition, in
+    the order the server listed the endpoints; otherwise they are yielded as
+    soon as any partition produces them.  Each partition is read on its own
+    connection cloned from ``connection`` (sharing its ADBC database), since
+    ADBC connections must not be used from several threads at once.
+    """
+
+    def __init__(
+        self,
+        connection: flight_sql.Connection,
+        partitions: List[bytes],
+        max_workers: int,
+        preserve_order: bool = True,
+        queue_size: int = DEFAULT_PARTITION_QUEUE_SIZE,
+    ) -> None:
+        self._connection = connection
+        self._preserve_order = preserve_order
+        self._stopped = threading.Event()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(partitions))),
+            thread_name_prefix="flight-sql-fetch",
+        )
+
+        if preserve_order:
+            self._queues = [queue.Queue(maxsize=queue_size) for _ in partitions]
+        else:
+            shared: queue.Queue = queue.Queue(maxsize=queue_size * len(partitions))
+            self._queues = [shared] * len(partitions)
+
+        for partition, out in zip(partitions, self._queues):
+            self._executor.submit(self._read_partition, partition, out)
+
+    def _put(self, out: queue.Queue, item: Any) -> bool:
+        while not self._stopped.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _read_partition(self, partition: bytes, out: queue.Queue) -> None:
+        if self._stopped.is_set():
+            return
+        try:
+            with self._connection.adbc_clone() as conn, conn.cursor() as cur:
+                cur.adbc_read_partition(partition)
+                for batch in record_batch_reader(cur):
+                    # closed while this batch was read
+                    if self._stopped.is_set() or not self._put(out, batch):
+                        return
+        except BaseException as e:
+            self._put(out, _Failure(e))
+        finally:
+            self._put(out, _END)
+
+    def __iter__(self) -> Iterator[pa.RecordBatch]:
+        try:
+            if self._preserve_order:
+                for out in self._queues:
+                    yield from self._drain(out, 1)
+            elif self._queues:
+                yield from self._drain(self._queues[0], len(self._queues))
+        finally:
+            self.close()
+
+    @staticmethod
+    def _drain(out: queue.Queue, partitions: int) -> Iterator[pa.RecordBatch]:
+        while partitions:
+            item: Union[pa.RecordBatch, _Failure, object] = out.get()
+            if item is _END:
+                partitions -= 1
+            elif isinstance(item, _Failure):
+                raise item.error
+            else:
+                yield item
+
+    def close(self) -> None:
+        self._stopped.set()
+        # partitions not started yet are never read
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,86 @@
+"""
+Opening an engine's pooled connections in the background, so that the first
+requests after a start (or a deploy) don't pay for connection setup - TLS
+handshake, authentication - one after another.
+"""
+import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Tuple
+
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks that the pool still has its minimum of idle connections
+DEFAULT_POOL_MAINTENANCE_INTERVAL = 30.0
+
+
+class PoolWarmer:
+    """
+    Opens ``prewarm`` connections of ``engine``'s pool concurrently as soon
+    as it starts, then every ``interval`` seconds tops the idle connections
+    up to ``min_idle`` - never past the pool's size.  The connections are
+    added to the pool directly, so checkouts never wait for the warmer.  It
+    stops with stop() (e.g. on the engine's dispose()), or once the engine is
+    garbage collected.
+    """
+
+    def __init__(
+            self,
+            engine: Any,
+            prewarm: int = 0,
+            min_idle: int = 0,
+            interval: float = DEFAULT_POOL_MAINTENANCE_INTERVAL,
+    ) -> None:
+        self._engine = weakref.ref(engine)
+        self.prewarm = prewarm
+        self.min_idle = min_idle
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="flight-sql-pool-warmer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _missing(self, wanted: int) -> Tuple[Optional[QueuePool], int]:
+        """The engine's pool, and how many more idle connections it needs to have ``wanted``"""
+        engine = self._engine()
+        # looked up each time - dispose() gives the engine a new pool
+        pool = engine.pool if engine is not None else None
+        if not isinstance(pool, QueuePool) or self._stopped.is_set():
+            return None, 0
+        idle = pool.checkedin()
+        return pool, max(0, min(wanted - idle, pool.size() - idle - pool.checkedout()))
+
+    def _add(self, pool: QueuePool) -> None:
+        # what a checkout that finds no idle connection, followed by its
+        # checkin, does - without taking any of the idle connections
+        if self._stopped.is_set() or not pool._inc_overflow():
+            return
+        try:
+            record = pool._create_connection()
+        except Exception as e:
+            pool._dec_overflow()
+            logger.warning("Couldn't open a pooled connection in the background: %s", e)
+            return
+        pool._do_return_conn(record)
+
+    def _open(self, pool: Optional[QueuePool], count: int) -> None:
+        if pool is None or count <= 0:
+            return
+        with ThreadPoolExecutor(max_workers=count, thread_name_prefix="flight-sql-pool-warmer") as executor:
+            for _ in range(count):
+                executor.submit(self._add, pool)
+
+    def _run(self) -> None:
+        self._open(*self._missing(self.prewarm))
+        while self.min_idle > 0 and not self._stopped.wait(self.interval):
+            if self._engine() is None:
+                return
+            self._open(*self._missing(self.min_idle))
@@ -0,0 +1,114 @@
+"""
+Queries executing in the background, so that the caller can poll them
+(e.g. Superset's handle_cursor) and cancel them from another thread.
+"""
+import threading
+import time
+import weakref
+from typing import Callable, Optional
+
+import adbc_driver_flightsql.dbapi as flight_sql
+import adbc_driver_manager
+
+# RunningQuery.state
+RUNNING = "running"
+FINISHED = "finished"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# the queries of this process by query ID, see cancel_query()
+_queries: "weakref.WeakValueDictionary[str, RunningQuery]" = weakref.WeakValueDictionary()
+
+
+def cancelled_error() -> flight_sql.OperationalError:
+    return flight_sql.OperationalError(
+        "Query was cancelled",
+        status_code=adbc_driver_manager.AdbcStatusCode.CANCELLED,
+    )
+
+
+class RunningQuery:
+    """
+    Runs ``execute`` on a background thread.
+
+    cancel() ends the query as early as the driver allows: ``interrupt`` is
+    called while it executes (e.g. the driver's own cancel, where it has
+    one), and ``discard`` drops its result as soon as execute returns, so the
+    result stream is never read and the server stops producing it.  Exactly
+    one of the background thread and cancel() calls ``discard``.
+    """
+
+    def __init__(
+            self,
+            query_id: str,
+            execute: Callable[[], None],
+            interrupt: Callable[[], None],
+            discard: Callable[[], None],
+    ) -> None:
+        self.query_id = query_id
+        self.state = RUNNING
+        self.error: Optional[BaseException] = None
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self._execute = execute
+        self._interrupt = interrupt
+        self._discard = discard
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        _queries[query_id] = self
+        self._thread = threading.Thread(target=self._run, name=f"flight-sql-query-{query_id}", daemon=True)
+        self._thread.start()
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def _run(self) -> None:
+        error: Optional[BaseException] = None
+        try:
+            self._execute()
+        except BaseException as e:
+            error = e
+        with self._lock:
+            self.finished_at = time.monotonic()
+            cancelled = self.state == CANCELLED
+            if not cancelled:
+                self.state, self.error = (FAILED, error) if error is not None else (FINISHED, None)
+        if cancelled:
+            self._discard()
+        self._done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for execute to return, True unless it timed out"""
+        return self._done.wait(timeout)
+
+    def result(self) -> None:
+        """Wait for execute to return, raising its error if it failed or was cancelled"""
+        if self.state != CANCELLED:
+            self._done.wait()
+        if self.state == CANCELLED:
+            raise cancelled_error()
+        if self.error is not None:
+            raise self.error
+
+    def cancel(self) -> bool:
+        """Cancel the query (and drop its unread result), False if it had already failed"""
+        with self._lock:
+            if self.state not in (RUNNING, FINISHED):
+                return False
+            running = self.state == RUNNING
+            self.state = CANCELLED
+        if running:
+            try:
+                self._interrupt()
+            except flight_sql.Error:
+                pass
+        else:
+            self._discard()
+        return True
+
+
+def cancel_query(query_id: str) -> bool:
+    """Cancel a query of this process started with CursorWrapper.execute_async"""
+    query = _queries.get(query_id)
+    return query is not None and query.cancel()
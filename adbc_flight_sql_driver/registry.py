@@ -0,0 +1,103 @@
+"""
+Process-wide registry of ADBC database handles, so that pooled connections
+to the same server share one gRPC channel (and its TLS session) instead of
+each creating their own.
+
+A handle is released once the last engine using it is disposed (see
+release()), and at exit.
+"""
+import atexit
+import os
+import threading
+import weakref
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+import adbc_driver_flightsql.dbapi as flight_sql
+
+_Options = FrozenSet[Tuple[str, str]]
+
+_lock = threading.Lock()
+_pid: Optional[int] = None
+# one idle "root" connection per database keeps the shared handle open; new
+# connections are cloned from it
+_roots: Dict[Hashable, Tuple[flight_sql.Connection, _Options]] = {}
+# the owners (e.g. engines' dialects) of the connections opened per database
+_owners: Dict[Hashable, "weakref.WeakSet[Any]"] = {}
+
+
+def _check_pid() -> None:
+    global _pid
+    if _pid != os.getpid():
+        # gRPC channels can't be used across a fork - forget (but don't close)
+        # the handles inherited from the parent process
+        _roots.clear()
+        _owners.clear()
+        _pid = os.getpid()
+
+
+def connect(
+        uri: str, db_kwargs: Dict[str, str], key: Optional[Hashable] = None, owner: Optional[Any] = None
+) -> flight_sql.Connection:
+    """
+    Open a Flight SQL connection on the shared database handle for ``key``
+    (by default: uri and db_kwargs), creating the handle on first use.  If the
+    options for a key change (e.g. a refreshed bearer token) the handle is
+    replaced; connections opened on the old one keep working until closed.
+    The handle is kept for ``owner`` until it is released.
+    """
+    options: _Options = frozenset(db_kwargs.items())
+    if key is None:
+        key = (uri, options)
+
+    stale: Optional[flight_sql.Connection] = None
+    with _lock:
+        _check_pid()
+        entry = _roots.get(key)
+        if entry is None or entry[1] != options:
+            stale = entry[0] if entry is not None else None
+            entry = (flight_sql.connect(uri=uri, db_kwargs=db_kwargs), options)
+            _roots[key] = entry
+        if owner is not None:
+            _owners.setdefault(key, weakref.WeakSet()).add(owner)
+        conn = entry[0].adbc_clone()
+
+    if stale is not None:
+        stale.close()
+    return conn
+
+
+def release(owner: Any) -> None:
+    """
+    Release the shared database handles nothing but ``owner`` opened
+    connections on (e.g. when an engine is disposed).  Connections still open
+    keep their handle alive until they are closed.
+    """
+    roots: List[flight_sql.Connection] = []
+    with _lock:
+        _check_pid()
+        for key, owners in list(_owners.items()):
+            owners.discard(owner)
+            if not owners:
+                del _owners[key]
+                entry = _roots.pop(key, None)
+                if entry is not None:
+                    roots.append(entry[0])
+    for root in roots:
+        root.close()
+
+
+def close_databases() -> None:
+    """
+    Release the shared database handles.  Connections still open keep their
+    handle alive until they are closed.
+    """
+    with _lock:
+        _check_pid()
+        roots = [root for root, _ in _roots.values()]
+        _roots.clear()
+        _owners.clear()
+    for root in roots:
+        root.close()
+
+
+atexit.register(close_databases)
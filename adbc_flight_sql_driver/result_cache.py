@@ -0,0 +1,192 @@
+"""
+Cache of query results as Arrow tables, so that repeated reads (e.g. the same
+dashboard refreshed by many users) are served without a server round trip.
+"""
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Iterator, List, NamedTuple, Optional
+
+import pyarrow as pa
+
+# Seconds results are cached for (0 disables the cache)
+DEFAULT_RESULT_CACHE_TTL = 0
+
+# Total size of the cached results
+DEFAULT_RESULT_CACHE_BYTES = 256 * 1024 * 1024
+
+# quoted literals and identifiers are kept, whitespace and comments collapse
+# to a single space
+_TOKENS = re.compile(
+    r"""('(?:[^']|'')*'|"(?:[^"]|"")*")|(\s+|--[^\n]*(?:\n|$)|/\*.*?\*/)""",
+    flags=re.DOTALL,
+)
+
+# statements that switch the catalog or schema of a connection
+SCOPE_PATTERN = re.compile(r"^\s*(use|set\s+(search_path|schema))\b", flags=re.IGNORECASE)
+
+
+def normalize_sql(statement: str) -> str:
+    """``statement`` with insignificant whitespace, comments and the trailing semicolon removed"""
+    normalized = _TOKENS.sub(lambda m: m.group(1) or " ", statement).strip()
+    return normalized.rstrip(";").rstrip()
+
+
+def cache_key(
+        statement: str,
+        parameters: Optional[Any] = None,
+        scope: Optional[str] = None,
+        max_rows: Optional[int] = None,
+) -> Optional[str]:
+    """The key of a result, or None if it can't be cached (e.g. Arrow parameters)"""
+    if parameters is not None and not isinstance(parameters, (list, tuple, dict)):
+        return None
+    text = repr((normalize_sql(statement), parameters, scope, max_rows))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class _Entry(NamedTuple):
+    stored_at: float
+    nbytes: int
+    table: Optional[pa.Table]  # in-memory entries
+    path: Optional[str]  # entries on disk
+
+
+class ResultCache:
+    """
+    Thread-safe cache of results by key (see cache_key).
+
+    Results are kept as Arrow tables in memory, or - with ``directory`` - as
+    Arrow IPC files there, which are memory-mapped on read.  Either way a hit
+    is read without copying.  Entries expire after ``ttl`` seconds, and the
+    least recently used ones are evicted once the results take more than
+    ``max_bytes``.  A store that overlaps with invalidate() is dropped.
+    """
+
+    def __init__(
+            self,
+            ttl: float = DEFAULT_RESULT_CACHE_TTL,
+            max_bytes: int = DEFAULT_RESULT_CACHE_BYTES,
+            directory: Optional[str] = None,
+    ) -> None:
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.nbytes = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._generation = 0
+        self._files: Optional[str] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_bytes > 0
+
+    @property
+    def generation(self) -> int:
+        """Changes with every invalidate(), see put()"""
+        return self._generation
+
+    def _path(self, key: str) -> str:
+        with self._lock:
+            if self._files is None:
+                # a directory of this cache's own, removed with it
+                os.makedirs(self.directory, exist_ok=True)
+                self._files = tempfile.mkdtemp(prefix="adbc-result-cache-", dir=self.directory)
+                weakref.finalize(self, shutil.rmtree, self._files, True)
+            return os.path.join(self._files, f"{key}.arrow")
+
+    def _drop(self, entry: _Entry) -> None:
+        self.nbytes -= entry.nbytes
+        if entry.path is not None:
+            try:
+                # a memory-mapped table that is still being read stays valid
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+    def get(self, key: str) -> Optional[pa.Table]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.stored_at >= self.ttl:
+                self._drop(self._entries.pop(key))
+                return None
+            self._entries.move_to_end(key)
+            if entry.table is not None:
+                return entry.table
+            path = entry.path
+        try:
+            return pa.ipc.open_file(pa.memory_map(path)).read_all()
+        except (OSError, pa.ArrowInvalid):
+            # evicted meanwhile
+            return None
+
+    def put(self, key: str, table: pa.Table, generation: int) -> None:
+        """Store ``table``, unless the cache was invalidated since ``generation``"""
+        nbytes = table.nbytes
+        if not self.enabled or nbytes > self.max_bytes or generation != self._generation:
+            return
+        path = None
+        if self.directory is not None:
+            path = self._path(key)
+            partial = f"{path}.{threading.get_ident()}.partial"
+            with pa.OSFile(partial, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(partial, path)
+            nbytes = os.path.getsize(path)
+            table = None
+        with self._lock:
+            if generation != self._generation:
+                if path is not None:
+                    os.unlink(path)
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None and previous.path != path:
+                self._drop(previous)
+            elif previous is not None:
+                self.nbytes -= previous.nbytes
+            self._entries[key] = _Entry(time.monotonic(), nbytes, table, path)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                self._drop(self._entries.popitem(last=False)[1])
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Forget the result of ``key``, or every result"""
+        with self._lock:
+            self._generation += 1
+            keys = list(self._entries) if key is None else [key]
+            for k in keys:
+                entry = self._entries.pop(k, None)
+                if entry is not None:
+                    self._drop(entry)
+
+    def record(self, key: str, reader: pa.RecordBatchReader, generation: int) -> pa.RecordBatchReader:
+        """
+        A reader passing the batches of ``reader`` through, storing the result
+        once it was read to the end (as long as it fits the cache)
+        """
+        def batches() -> Iterator[pa.RecordBatch]:
+            kept: Optional[List[pa.RecordBatch]] = []
+            size = 0
+            for batch in reader:
+                if kept is not None:
+                    size += batch.nbytes
+                    if size > self.max_bytes:
+                        kept = None
+                    else:
+                        kept.append(batch)
+                yield batch
+            if kept is not None:
+                self.put(key, pa.Table.from_batches(kept, schema=reader.schema), generation)
+
+        return pa.RecordBatchReader.from_batches(reader.schema, batches())
+
@@ -0,0 +1,59 @@
+"""
+Building the stored query results payload of Superset's results backend -
+zlib(msgpack({..., "data": Arrow IPC stream})) - from the IPC data without
+copying it into Python bytes.  Needs msgpack (a Superset dependency).
+"""
+import struct
+from typing import IO, Any, Callable, Dict, Iterable, Optional, Union
+
+import msgpack
+import pyarrow as pa
+
+from . import codecs
+
+# how much of the IPC data is handed to the compressor at a time
+CHUNK_SIZE = 1024 * 1024
+
+
+def _msgpack_bin_header(size: int) -> bytes:
+    if size < 2**8:
+        return struct.pack(">BB", 0xC4, size)
+    if size < 2**16:
+        return struct.pack(">BH", 0xC5, size)
+    return struct.pack(">BI", 0xC6, size)
+
+
+def compress_payload(
+        payload: Dict[str, Any],
+        data: Union[pa.Buffer, IO[bytes]],
+        codec: str = "zlib",
+        default: Optional[Callable[[Any], Any]] = None,
+        ipc_compressed: bool = False,
+) -> bytes:
+    """
+    msgpack and compress ``payload`` with the Arrow IPC stream ``data`` (a
+    buffer or a file) as its "data", as msgpack.dumps and codecs.compress
+    would.  ``default`` encodes the values msgpack can't; zlib only stores
+    data whose IPC buffers are already compressed (``ipc_compressed``)
+    """
+    packer = msgpack.Packer(default=default, use_bin_type=True)
+    compressor = codecs.Compressor(codec, 0 if codec == "zlib" and ipc_compressed else None)
+    metadata = {key: value for key, value in payload.items() if key != "data"}
+
+    if isinstance(data, pa.Buffer):
+        size = data.size
+        view = memoryview(data)
+        chunks: Iterable[Any] = (view[offset:offset + CHUNK_SIZE] for offset in range(0, size, CHUNK_SIZE))
+    else:
+        data.seek(0, 2)
+        size = data.tell()
+        data.seek(0)
+        chunks = iter(lambda: data.read(CHUNK_SIZE), b"")
+
+    compressor.write(packer.pack_map_header(len(metadata) + 1))
+    for key, value in metadata.items():
+        compressor.write(packer.pack(key) + packer.pack(value))
+    compressor.write(packer.pack("data") + _msgpack_bin_header(size))
+    for chunk in chunks:
+        compressor.write(chunk)
+    return compressor.finish()
@@ -0,0 +1,170 @@
+"""
+Bounded-memory streaming of Flight SQL results as Arrow record batches.
+"""
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Iterator, Optional
+
+import adbc_driver_flightsql.dbapi as flight_sql
+import adbc_driver_manager
+import pyarrow as pa
+
+# Default cap on the record batches buffered ahead of the consumer
+DEFAULT_MAX_BUFFER_BYTES = 64 * 1024 * 1024
+
+# Seconds close() waits for the read-ahead thread to let go of the stream
+CLOSE_TIMEOUT = 10.0
+
+
+def record_batch_reader(cursor: flight_sql.Cursor) -> pa.RecordBatchReader:
+    """The reader over the result stream of an executed ADBC cursor"""
+    # newer adbc_driver_manager releases expose the result stream directly
+    fetch_record_batch = getattr(cursor, "fetch_record_batch", None)
+    if fetch_record_batch is not None:
+        return fetch_record_batch()
+
+    results = getattr(cursor, "_results", None)
+    if results is None:
+        raise flight_sql.ProgrammingError(
+            "Cannot fetch record batches before execute()",
+            status_code=adbc_driver_manager.AdbcStatusCode.INVALID_STATE,
+        )
+    return results._reader
+
+
+def close_results(cursor: flight_sql.Cursor) -> None:
+    """
+    Release the result stream of an executed ADBC cursor before it was read
+    to the end, so the server stops sending it
+    """
+    results = getattr(cursor, "_results", None)
+    if results is not None:
+        results.close()
+        cursor._results = None
+
+
+def limit_rows(
+        reader: pa.RecordBatchReader, max_rows: int, on_limit: Callable[[], None]
+) -> pa.RecordBatchReader:
+    """
+    A reader over the first ``max_rows`` rows of ``reader``.  No batch is read
+    past the one holding the last row, and ``on_limit`` is called (e.g. to
+    cancel the stream) as soon as that batch arrives.
+    """
+    def batches() -> Iterator[pa.RecordBatch]:
+        rows = 0
+        if max_rows <= 0:
+            on_limit()
+            return
+        for batch in reader:
+            if rows + batch.num_rows >= max_rows:
+                batch = batch.slice(0, max_rows - rows)
+                on_limit()
+                yield batch
+                return
+            rows += batch.num_rows
+            yield batch
+
+    return pa.RecordBatchReader.from_batches(reader.schema, batches())
+
+
+class RecordBatchStream:
+    """
+    Iterates the record batches of a result while a background thread reads
+    ahead from the Flight SQL stream.
+
+    At most ``max_buffer_bytes`` worth of batches are held in the read-ahead
+    buffer.  Once the cap is reached the reader stops pulling from the stream
+    until the consumer catches up, so a slow consumer (e.g. a results backend
+    write) applies backpressure all the way back to the server.  A single batch
+    larger than the cap is still let through, otherwise the stream could never
+    make progress.
+
+    close() stops the read-ahead and waits (up to ``CLOSE_TIMEOUT`` seconds,
+    for a batch still in flight) until the stream was released.
+    """
+
+    def __init__(
+        self,
+        reader: pa.RecordBatchReader,
+        max_buffer_bytes: int = DEFAULT_MAX_BUFFER_BYTES,
+    ) -> None:
+        self._reader = reader
+        self._max_buffer_bytes = max_buffer_bytes
+        self._buffer: Deque[pa.RecordBatch] = deque()
+        self._buffered_bytes = 0
+        self._error: Optional[BaseException] = None
+        self._done = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._read_ahead, name="flight-sql-read-ahead", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def schema(self) -> pa.Schema:
+        return self._reader.schema
+
+    def _read_ahead(self) -> None:
+        try:
+            for batch in self._reader:
+                size = batch.nbytes
+                with self._cond:
+                    while (
+                        self._buffer
+                        and self._buffered_bytes + size > self._max_buffer_bytes
+                        and not self._closed
+                    ):
+                        self._cond.wait()
+                    if self._closed:
+                        return
+                    self._buffer.append(batch)
+                    self._buffered_bytes += size
+                    self._cond.notify_all()
+        except BaseException as e:
+            with self._cond:
+                self._error = e
+        finally:
+            # released here, as the stream is only read by this thread
+            try:
+                self._reader.close()
+            except Exception:
+                pass
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
+
+    def __iter__(self) -> "RecordBatchStream":
+        return self
+
+    def __next__(self) -> pa.RecordBatch:
+        with self._cond:
+            while not self._buffer and not self._done:
+                self._cond.wait()
+            if self._buffer:
+                batch = self._buffer.popleft()
+                self._buffered_bytes -= batch.nbytes
+                self._cond.notify_all()
+                return batch
+            if self._error is not None:
+                raise self._error
+            raise StopIteration
+
+    def read_all(self) -> pa.Table:
+        return pa.Table.from_batches(list(self), schema=self.schema)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._buffer.clear()
+            self._buffered_bytes = 0
+            self._cond.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join(CLOSE_TIMEOUT)
+
+    def __enter__(self) -> "RecordBatchStream":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
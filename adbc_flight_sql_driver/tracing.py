@@ -0,0 +1,194 @@
+"""
+Timings and counters of the phases of the driver's work, for finding where
+the time of a slow query goes:
+
+=================  ========================================================
+``connect``        opening a connection (ADBC database/connection setup)
+``auth``           logging in to get a bearer token (TLS handshake included)
+``execute``        executing a query - the server plans it (GetFlightInfo)
+``first_batch``    waiting for the first record batch of a result (DoGet)
+``fetch``          reading the record batches of a result
+``convert``        converting record batches to Python rows
+=================  ========================================================
+
+and the counters ``endpoints``, ``batches``, ``rows`` and ``bytes`` of a
+result, and ``result_cache_hits``/``result_cache_misses``.
+
+Nothing is measured until a Tracer is installed with set_tracer(), and the
+disabled hooks cost a function call.
+"""
+import logging
+import time
+from typing import Any, Iterator, Optional
+
+import pyarrow as pa
+
+
+class Tracer:
+    """Receives the driver's timings and counters - override both"""
+
+    def timing(self, name: str, seconds: float) -> None:
+        pass
+
+    def count(self, name: str, value: int) -> None:
+        pass
+
+
+class LoggingTracer(Tracer):
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.DEBUG) -> None:
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+
+    def timing(self, name: str, seconds: float) -> None:
+        self.logger.log(self.level, "%s: %.3f ms", name, seconds * 1000)
+
+    def count(self, name: str, value: int) -> None:
+        self.logger.log(self.level, "%s: %d", name, value)
+
+
+class StatsdTracer(Tracer):
+    """Sends to a statsd client (e.g. ``statsd.StatsClient()``)"""
+
+    def __init__(self, client: Any, prefix: str = "adbc_flight_sql.") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    def timing(self, name: str, seconds: float) -> None:
+        self.client.timing(self.prefix + name, seconds * 1000)
+
+    def count(self, name: str, value: int) -> None:
+        self.client.incr(self.prefix + name, value)
+
+
+class StatsLoggerTracer(Tracer):
+    """
+    Sends to a Superset stats logger (``STATS_LOGGER``), timings in
+    milliseconds like Superset's own, counters as gauges
+    """
+
+    def __init__(self, stats_logger: Any, prefix: str = "adbc_flight_sql.") -> None:
+        self.stats_logger = stats_logger
+        self.prefix = prefix
+
+    def timing(self, name: str, seconds: float) -> None:
+        self.stats_logger.timing(self.prefix + name, seconds * 1000)
+
+    def count(self, name: str, value: int) -> None:
+        self.stats_logger.gauge(self.prefix + name, value)
+
+
+_tracer: Optional[Tracer] = None
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Send the driver's timings and counters to ``tracer`` (None disables them)"""
+    global _tracer
+    _tracer = tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer: Tracer, name: str) -> None:
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.tracer.timing(self.name, time.perf_counter() - self.start)
+
+
+class _Timer(_Span):
+    __slots__ = ("total",)
+
+    def __init__(self, tracer: Tracer, name: str) -> None:
+        super().__init__(tracer, name)
+        self.total = 0.0
+
+    def __exit__(self, *args: Any) -> None:
+        self.total += time.perf_counter() - self.start
+
+    def close(self) -> None:
+        self.tracer.timing(self.name, self.total)
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str) -> Any:
+    """A context manager timing its block as ``name``"""
+    tracer = _tracer
+    return _NO_SPAN if tracer is None else _Span(tracer, name)
+
+
+def timer(name: str) -> Any:
+    """
+    A context manager timing all of its blocks as ``name``, reported once on
+    close() (e.g. per result rather than per batch)
+    """
+    tracer = _tracer
+    return _NO_SPAN if tracer is None else _Timer(tracer, name)
+
+
+def count(name: str, value: int = 1) -> None:
+    tracer = _tracer
+    if tracer is not None:
+        tracer.count(name, value)
+
+
+def trace_batches(reader: pa.RecordBatchReader) -> pa.RecordBatchReader:
+    """
+    ``reader``, timing the wait for its first batch and the reading of all
+    of them, and counting its batches, rows and bytes
+    """
+    tracer = _tracer
+    if tracer is None:
+        return reader
+
+    def batches() -> Iterator[pa.RecordBatch]:
+        reading = 0.0
+        read = rows = nbytes = 0
+        it = iter(reader)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    batch = next(it)
+                except StopIteration:
+                    break
+                now = time.perf_counter()
+                if read == 0:
+                    tracer.timing("first_batch", now - start)
+                reading += now - start
+                read += 1
+                rows += batch.num_rows
+                nbytes += batch.nbytes
+                yield batch
+        finally:
+            # also when the result isn't read to the end
+            tracer.timing("fetch", reading)
+            tracer.count("batches", read)
+            tracer.count("rows", rows)
+            tracer.count("bytes", nbytes)
+
+    return pa.RecordBatchReader.from_batches(reader.schema, batches())
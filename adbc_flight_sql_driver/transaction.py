@@ -0,0 +1,110 @@
+"""
+Lazily opened transactions, so that read-only work (e.g. dashboard queries)
+costs no BEGIN/COMMIT/ROLLBACK round trips.
+"""
+import re
+from typing import Optional
+
+import adbc_driver_flightsql.dbapi as flight_sql
+
+# statements that can't change data - everything else opens the transaction
+READ_PATTERN = re.compile(
+    r"^(?:\s+|--[^\n]*(?:\n|$)|/\*.*?\*/)*(select|with|show|describe|explain|values|pragma|summarize)\b",
+    flags=re.IGNORECASE | re.DOTALL,
+)
+
+# ...unless they nest a write, e.g. WITH x AS (DELETE ... RETURNING *) SELECT
+# or EXPLAIN ANALYZE DELETE (a FOR UPDATE read counts too)
+WRITE_PATTERN = re.compile(r"\b(insert|update|delete|merge|create|drop|alter|copy|truncate)\b", flags=re.IGNORECASE)
+
+# string literals, quoted identifiers and comments, which may hold those words
+LITERAL_PATTERN = re.compile(
+    r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\$(\w*)\$.*?\$\1\$|--[^\n]*|/\*.*?\*/",
+    flags=re.DOTALL,
+)
+
+# ADBC connection option to ask the server to reject writes
+READ_ONLY_OPTION = "adbc.connection.readonly"
+
+
+def is_write(statement: str) -> bool:
+    if READ_PATTERN.match(statement) is None:
+        return True
+    return WRITE_PATTERN.search(LITERAL_PATTERN.sub(" ", statement)) is not None
+
+
+class TransactionManager:
+    """
+    Tracks the transaction SQLAlchemy asked for on one connection.
+
+    The connection runs in autocommit mode.  begin() only records that a
+    transaction was requested; it is opened right before the first statement
+    that may write, using ADBC's native transactions where the driver supports
+    them and a BEGIN statement otherwise.  commit() and rollback() are free
+    when no transaction was opened.  A read-only manager never opens one.
+    """
+
+    def __init__(self, connection: flight_sql.Connection, read_only: bool = False) -> None:
+        self.read_only = read_only
+        self.requested = False
+        self.opened: Optional[str] = None  # "native" or "sql"
+        self._native: Optional[bool] = None
+        self.attach(connection)
+
+    def attach(self, connection: flight_sql.Connection) -> None:
+        """Start managing ``connection`` (e.g. after it was re-created)"""
+        self._connection = connection
+        self.requested = False
+        self.opened = None
+        try:
+            connection.adbc_connection.set_autocommit(True)
+        except flight_sql.NotSupportedError:
+            # the driver is always in autocommit mode (e.g. Flight SQL)
+            self._native = False
+        if self.read_only:
+            try:
+                connection.adbc_connection.set_options(**{READ_ONLY_OPTION: "true"})
+            except flight_sql.Error:
+                pass
+
+    @property
+    def in_transaction(self) -> bool:
+        return self.opened is not None
+
+    def begin(self) -> None:
+        self.requested = True
+
+    def before_execute(self, statement: str) -> None:
+        if self.requested and self.opened is None and not self.read_only and is_write(statement):
+            self._open()
+
+    def _open(self) -> None:
+        if self._native is not False:
+            try:
+                self._connection.adbc_connection.set_autocommit(False)
+                self._native = True
+                self.opened = "native"
+                return
+            except flight_sql.NotSupportedError:
+                self._native = False
+        with self._connection.cursor() as cur:
+            cur.execute("BEGIN")
+        self.opened = "sql"
+
+    def _end(self, statement: str) -> None:
+        opened, self.opened, self.requested = self.opened, None, False
+        if opened == "native":
+            adbc_connection = self._connection.adbc_connection
+            try:
+                adbc_connection.commit() if statement == "COMMIT" else adbc_connection.rollback()
+            finally:
+                adbc_connection.set_autocommit(True)
+        elif opened == "sql":
+            with self._connection.cursor() as cur:
+                cur.execute(statement)
+
+    def commit(self) -> None:
+        self._end("COMMIT")
+
+    def rollback(self) -> None:
+        self._end("ROLLBACK")
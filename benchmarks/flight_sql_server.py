@@ -0,0 +1,394 @@
+"""
+A stand-in Flight SQL server for benchmarks: pyarrow.flight in front of an
+in-memory DuckDB database loaded with TPC-H data.
+
+It implements the part of Flight SQL the ADBC driver uses - basic/bearer
+token authentication, statement and prepared statement queries and updates
+(with bound parameters), and GetSqlInfo - and nothing else (e.g. no catalog
+RPCs).  It runs every request on a DuckDB cursor of its own, so it has no
+transactions: BEGIN, COMMIT and ROLLBACK are rejected.  Results can be split into several endpoints, which
+share one result stream, for benchmarking parallel fetches.
+
+    python -m benchmarks.flight_sql_server --scale-factor 0.1 --port 31337
+"""
+import argparse
+import base64
+import itertools
+import multiprocessing
+import os
+import re
+import secrets
+import tempfile
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import flight
+
+from . import tpch
+
+USERNAME = "flight_username"
+PASSWORD = "flight_password"
+
+TYPE_URL_PREFIX = "type.googleapis.com/arrow.flight.protocol.sql."
+
+BATCH_ROWS = 64 * 1024
+
+TRANSACTION_PATTERN = re.compile(r"^\s*(begin|start\s+transaction|commit|end|rollback|abort)\b", flags=re.IGNORECASE)
+
+# GetSqlInfo codes answered
+SQL_INFO = {
+    0: "DuckDB Flight SQL stand-in",  # FLIGHT_SQL_SERVER_NAME
+    1: duckdb.__version__,  # FLIGHT_SQL_SERVER_VERSION
+    2: pa.__version__,  # FLIGHT_SQL_SERVER_ARROW_VERSION
+}
+
+SQL_INFO_SCHEMA = pa.schema([
+    pa.field("info_name", pa.uint32(), nullable=False),
+    pa.field("value", pa.dense_union([
+        pa.field("string_value", pa.utf8()),
+        pa.field("bool_value", pa.bool_()),
+        pa.field("bigint_value", pa.int64()),
+        pa.field("int32_bitmask", pa.int32()),
+        pa.field("string_list", pa.list_(pa.field("item", pa.utf8()))),
+        pa.field("int32_to_int32_list_map", pa.map_(pa.int32(), pa.list_(pa.field("item", pa.int32())))),
+    ]), nullable=False),
+])
+
+
+# The few protobuf messages of Flight SQL, encoded by hand: every field used
+# is either a string/bytes (wire type 2) or an integer (wire type 0)
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+
+def encode_message(fields: Dict[int, Any]) -> bytes:
+    out = bytearray()
+    for number, value in fields.items():
+        if value is None:
+            continue
+        if isinstance(value, int):
+            out += _varint(number << 3) + _varint(value)
+        else:
+            if isinstance(value, str):
+                value = value.encode()
+            out += _varint(number << 3 | 2) + _varint(len(value)) + value
+    return bytes(out)
+
+
+def decode_message(data: bytes) -> Dict[int, List[Any]]:
+    fields: Dict[int, List[Any]] = {}
+    pos = 0
+    while pos < len(data):
+        key, pos = _read_varint(data, pos)
+        number, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, pos = _read_varint(data, pos)
+        elif wire_type == 2:
+            size, pos = _read_varint(data, pos)
+            value, pos = data[pos:pos + size], pos + size
+        elif wire_type == 5:
+            value, pos = data[pos:pos + 4], pos + 4
+        elif wire_type == 1:
+            value, pos = data[pos:pos + 8], pos + 8
+        else:
+            raise pa.ArrowInvalid(f"Unsupported protobuf wire type {wire_type}")
+        fields.setdefault(number, []).append(value)
+    return fields
+
+
+def pack_any(name: str, fields: Dict[int, Any]) -> bytes:
+    return encode_message({1: TYPE_URL_PREFIX + name, 2: encode_message(fields)})
+
+
+def unpack_any(data: bytes) -> Tuple[str, Dict[int, List[Any]]]:
+    envelope = decode_message(data)
+    type_url = envelope.get(1, [b""])[0].decode()
+    return type_url.rsplit(".", 1)[-1], decode_message(envelope.get(2, [b""])[0])
+
+
+def _string(fields: Dict[int, List[Any]], number: int) -> str:
+    return fields.get(number, [b""])[0].decode()
+
+
+def _bytes(fields: Dict[int, List[Any]], number: int) -> bytes:
+    return fields.get(number, [b""])[0]
+
+
+class _Auth(flight.ServerMiddlewareFactory):
+    """Basic auth on Handshake, bearer tokens on every other call"""
+
+    def __init__(self, username: str, password: str) -> None:
+        self.username = username
+        self.password = password
+        self.tokens: set = set()
+
+    def start_call(self, info: flight.CallInfo, headers: Dict[str, List[str]]) -> Optional["_Token"]:
+        values = headers.get("authorization") or headers.get("Authorization") or []
+        if not values:
+            raise flight.FlightUnauthenticatedError("No credentials supplied")
+        scheme, _, value = values[0].partition(" ")
+        if scheme.lower() == "basic":
+            # Go clients (the ADBC driver) leave out the padding
+            username, _, password = base64.b64decode(value + "=" * (-len(value) % 4)).decode().partition(":")
+            if (username, password) != (self.username, self.password):
+                raise flight.FlightUnauthenticatedError("Invalid username or password")
+            token = secrets.token_urlsafe(24)
+            self.tokens.add(token)
+            return _Token(token)
+        if scheme.lower() == "bearer" and value in self.tokens:
+            return None
+        raise flight.FlightUnauthenticatedError("Invalid token")
+
+
+class _NoHandshake(flight.ServerAuthHandler):
+    """Lets Handshake calls through to _Auth, which checks their headers"""
+
+    def authenticate(self, outgoing: Any, incoming: Any) -> None:
+        pass
+
+    def is_valid(self, token: bytes) -> str:
+        return ""
+
+
+class _Token(flight.ServerMiddleware):
+    def __init__(self, token: str) -> None:
+        self.token = token
+
+    def sending_headers(self) -> Dict[str, str]:
+        return {"authorization": f"Bearer {self.token}"}
+
+
+class _Result:
+    """An executing query, read by the DoGets of its endpoints"""
+
+    def __init__(self, reader: pa.RecordBatchReader, endpoints: int) -> None:
+        self.reader = reader
+        self.remaining = endpoints
+        self.lock = threading.Lock()
+
+    def batches(self) -> Iterator[pa.RecordBatch]:
+        while True:
+            with self.lock:
+                try:
+                    batch = self.reader.read_next_batch()
+                except StopIteration:
+                    return
+            yield batch
+
+
+class FlightSqlServer(flight.FlightServerBase):
+    def __init__(
+            self,
+            location: str = "grpc://127.0.0.1:0",
+            database: Optional[duckdb.DuckDBPyConnection] = None,
+            endpoints: int = 1,
+            username: str = USERNAME,
+            password: str = PASSWORD,
+    ) -> None:
+        super().__init__(location, auth_handler=_NoHandshake(), middleware={"auth": _Auth(username, password)})
+        self.database = database if database is not None else duckdb.connect()
+        self.endpoints = endpoints
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._prepared: Dict[bytes, Tuple[str, List[List[Any]]]] = {}
+        self._results: Dict[bytes, _Result] = {}
+
+    def _handle(self, prefix: str) -> bytes:
+        return f"{prefix}-{next(self._ids)}".encode()
+
+    @staticmethod
+    def _check_statement(query: str) -> None:
+        if TRANSACTION_PATTERN.match(query):
+            raise NotImplementedError("The stand-in server has no transactions (each request has a cursor of its own)")
+
+    def _execute(self, query: str, parameters: Optional[List[Any]] = None) -> pa.RecordBatchReader:
+        self._check_statement(query)
+        cursor = self.database.cursor()
+        try:
+            cursor.execute(query, parameters)
+            # fetch_record_batch() is deprecated in newer DuckDB versions
+            to_reader = getattr(cursor, "to_arrow_reader", None) or cursor.fetch_record_batch
+            return to_reader(BATCH_ROWS)
+        except duckdb.Error as e:
+            raise pa.ArrowInvalid(str(e)) from e
+
+    def _flight_info(
+            self, descriptor: flight.FlightDescriptor, reader: pa.RecordBatchReader
+    ) -> flight.FlightInfo:
+        handle = self._handle("result")
+        with self._lock:
+            self._results[handle] = _Result(reader, self.endpoints)
+        ticket = pack_any("TicketStatementQuery", {1: handle})
+        endpoints = [flight.FlightEndpoint(ticket, []) for _ in range(self.endpoints)]
+        return flight.FlightInfo(reader.schema, descriptor, endpoints, -1, -1)
+
+    def get_flight_info(self, context: Any, descriptor: flight.FlightDescriptor) -> flight.FlightInfo:
+        command, fields = unpack_any(descriptor.command)
+        if command == "CommandStatementQuery":
+            return self._flight_info(descriptor, self._execute(_string(fields, 1)))
+        if command == "CommandPreparedStatementQuery":
+            query, parameters = self._prepared_statement(_bytes(fields, 1))
+            return self._flight_info(descriptor, self._execute(query, parameters[0] if parameters else None))
+        if command == "CommandGetSqlInfo":
+            return self._flight_info(descriptor, self._sql_info(fields.get(1, [])))
+        raise NotImplementedError(f"{command} is not supported")
+
+    def _sql_info(self, codes: List[int]) -> pa.RecordBatchReader:
+        names = [code for code in (codes or SQL_INFO) if code in SQL_INFO]
+        children = [pa.array([SQL_INFO[code] for code in names], pa.utf8())] + [
+            pa.array([], field.type) for field in list(SQL_INFO_SCHEMA.field("value").type)[1:]
+        ]
+        values = pa.UnionArray.from_dense(
+            pa.array([0] * len(names), pa.int8()),
+            pa.array(range(len(names)), pa.int32()),
+            children,
+            [field.name for field in SQL_INFO_SCHEMA.field("value").type],
+        )
+        table = pa.Table.from_arrays([pa.array(names, pa.uint32()), values], schema=SQL_INFO_SCHEMA)
+        return table.to_reader()
+
+    def do_get(self, context: Any, ticket: flight.Ticket) -> flight.FlightDataStream:
+        _, fields = unpack_any(ticket.ticket)
+        handle = _bytes(fields, 1)
+        with self._lock:
+            result = self._results.get(handle)
+            if result is None:
+                raise flight.FlightServerError("Unknown or expired ticket")
+            result.remaining -= 1
+            if result.remaining == 0:
+                del self._results[handle]
+        return flight.GeneratorStream(result.reader.schema, result.batches())
+
+    def _prepared_statement(self, handle: bytes) -> Tuple[str, List[List[Any]]]:
+        with self._lock:
+            prepared = self._prepared.get(handle)
+        if prepared is None:
+            raise pa.ArrowInvalid("Unknown prepared statement")
+        return prepared
+
+    def do_put(
+            self,
+            context: Any,
+            descriptor: flight.FlightDescriptor,
+            reader: flight.MetadataRecordBatchReader,
+            writer: flight.FlightMetadataWriter,
+    ) -> None:
+        command, fields = unpack_any(descriptor.command)
+        rows = [list(row.values()) for row in reader.read_all().to_pylist()]
+        if command == "CommandPreparedStatementQuery":
+            # parameters of the next execution
+            handle = _bytes(fields, 1)
+            query, _ = self._prepared_statement(handle)
+            with self._lock:
+                self._prepared[handle] = (query, rows)
+            writer.write(pa.py_buffer(encode_message({1: handle})))
+            return
+        if command == "CommandPreparedStatementUpdate":
+            query, _ = self._prepared_statement(_bytes(fields, 1))
+            parameters = rows or [[]]
+        elif command == "CommandStatementUpdate":
+            query, parameters = _string(fields, 1), [[]]
+        else:
+            raise NotImplementedError(f"{command} is not supported")
+        self._check_statement(query)
+        cursor = self.database.cursor()
+        try:
+            cursor.executemany(query, parameters)
+        except duckdb.Error as e:
+            raise pa.ArrowInvalid(str(e)) from e
+        writer.write(pa.py_buffer(encode_message({1: len(parameters)})))
+
+    def do_action(self, context: Any, action: flight.Action) -> Iterator[bytes]:
+        if action.type == "CreatePreparedStatement":
+            _, fields = unpack_any(action.body.to_pybytes())
+            handle = self._handle("prepared")
+            with self._lock:
+                self._prepared[handle] = (_string(fields, 1), [])
+            return iter([pack_any("ActionCreatePreparedStatementResult", {1: handle})])
+        if action.type == "ClosePreparedStatement":
+            _, fields = unpack_any(action.body.to_pybytes())
+            with self._lock:
+                self._prepared.pop(_bytes(fields, 1), None)
+            return iter([])
+        raise NotImplementedError(f"{action.type} is not supported")
+
+    def list_actions(self, context: Any) -> List[Tuple[str, str]]:
+        return [
+            ("CreatePreparedStatement", "Create a prepared statement"),
+            ("ClosePreparedStatement", "Close a prepared statement"),
+        ]
+
+
+def load_tpch(scale_factor: float, database: Optional[duckdb.DuckDBPyConnection] = None) -> duckdb.DuckDBPyConnection:
+    """A DuckDB database with the TPC-H tables at ``scale_factor``"""
+    database = database if database is not None else duckdb.connect()
+    # through Parquet files: newer DuckDB versions only scan Arrow data of
+    # pyarrow versions with the C stream interface
+    with tempfile.TemporaryDirectory() as directory:
+        for name, table in tpch.generate(scale_factor).items():
+            path = os.path.join(directory, f"{name}.parquet")
+            pq.write_table(table, path)
+            database.execute(f"CREATE TABLE {name} AS SELECT * FROM read_parquet('{path}')")
+    return database
+
+
+def _serve(scale_factor: float, endpoints: int, ports: Any) -> None:
+    server = FlightSqlServer(database=load_tpch(scale_factor), endpoints=endpoints)
+    ports.put(server.port)
+    server.serve()
+
+
+def start_process(scale_factor: float = 0.01, endpoints: int = 1) -> Tuple[multiprocessing.Process, int]:
+    """
+    Run the server in a child process (so it doesn't share the benchmark's
+    GIL and memory) and return it with its port once it is ready
+    """
+    context = multiprocessing.get_context("spawn")
+    ports = context.Queue()
+    process = context.Process(target=_serve, args=(scale_factor, endpoints, ports), daemon=True)
+    process.start()
+    return process, ports.get(timeout=600)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale-factor", type=float, default=0.01)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=31337)
+    parser.add_argument("--endpoints", type=int, default=1, help="endpoints each result is split into")
+    args = parser.parse_args()
+
+    server = FlightSqlServer(f"grpc://{args.host}:{args.port}",
+                             database=load_tpch(args.scale_factor),
+                             endpoints=args.endpoints
+                             )
+    print(f"Serving TPC-H SF {args.scale_factor} on grpc://{args.host}:{server.port} "
+          f"(user: {USERNAME}, password: {PASSWORD})")
+    server.serve()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+"""
+A load generator: many threads (in one or more processes, like gunicorn
+workers) sharing one engine - QueuePool included - per process, running a mix
+of queries like Superset's against the stand-in Flight SQL server (or any
+server, with --url):
+
+=============  ===========================================================
+``metadata``   a tiny catalog query, like the ones of SQL Lab's schema browser
+``dashboard``  an aggregate of lineitem (TPC-H Q1), like a chart's
+``export``     a large result fetched whole, like a CSV export
+=============  ===========================================================
+
+It reports the throughput, the latency percentiles of each kind of query,
+how long threads waited for a pooled connection, and how many connections
+were opened (and how long that took), as JSON.  E.g. 200 threads on a pool of
+10 (+ 20 overflow):
+
+    python -m benchmarks.load --threads 200 --pool-size 10 --max-overflow 20 --duration 60 --server-process
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine, event, text
+
+from .run import MB, PeakRss, environment, percentiles, start_server
+
+QUERIES = {
+    "metadata": "SELECT table_name FROM information_schema.tables WHERE table_schema = 'main'",
+    "dashboard": """
+        SELECT l_returnflag, l_linestatus, sum(l_quantity) AS sum_qty, sum(l_extendedprice) AS sum_base_price,
+               avg(l_discount) AS avg_disc, count(*) AS count_order
+          FROM lineitem
+         WHERE l_shipdate <= DATE '1998-09-02'
+         GROUP BY l_returnflag, l_linestatus
+         ORDER BY l_returnflag, l_linestatus
+    """,
+    "export": "SELECT * FROM orders LIMIT {export_rows}",
+}
+
+DEFAULT_MIX = "metadata=70,dashboard=25,export=5"
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        kind, _, weight = part.partition("=")
+        if kind.strip() not in QUERIES:
+            raise argparse.ArgumentTypeError(f"Unknown query kind {kind!r}, not one of {', '.join(QUERIES)}")
+        weights[kind.strip()] = float(weight)
+    return weights
+
+
+class _Stats:
+    """What one thread measured, merged into the totals afterwards"""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = {kind: [] for kind in QUERIES}
+        self.errors: Counter = Counter()
+        self.pool_waits: List[float] = []
+
+    def merge(self, other: "_Stats") -> None:
+        for kind, latencies in other.latencies.items():
+            self.latencies[kind] += latencies
+        self.errors.update(other.errors)
+        self.pool_waits += other.pool_waits
+
+
+def _work(
+        engine: Any,
+        queries: Dict[str, Any],
+        weights: Dict[str, float],
+        seed: int,
+        start: threading.Barrier,
+        deadline: List[float],
+        think: float,
+        stats: _Stats,
+) -> None:
+    rng = random.Random(seed)
+    kinds, kind_weights = list(weights), list(weights.values())
+    start.wait()
+    while time.perf_counter() < deadline[0]:
+        kind = rng.choices(kinds, kind_weights)[0]
+        begin = time.perf_counter()
+        try:
+            with engine.connect() as connection:
+                checked_out = time.perf_counter()
+                connection.execute(queries[kind]).fetchall()
+        except Exception as e:
+            stats.errors[f"{kind}: {type(e).__name__}"] += 1
+            continue
+        stats.latencies[kind].append(time.perf_counter() - begin)
+        stats.pool_waits.append(checked_out - begin)
+        if think:
+            time.sleep(rng.expovariate(1 / think))
+
+
+def run_process(url: str, options: Dict[str, Any], seed: int) -> Dict[str, Any]:
+    """Runs the threads of one process on one engine, returns the raw measurements"""
+    engine = create_engine(
+        url,
+        pool_size=options["pool_size"],
+        max_overflow=options["max_overflow"],
+        pool_timeout=options["pool_timeout"],
+        pool_pre_ping=options["pool_pre_ping"],
+    )
+    # connections opened: timed from the dialect's connect to the pool's
+    # "connect" event, in the thread opening it
+    opening = threading.local()
+    connect_times: List[float] = []
+
+    @event.listens_for(engine, "do_connect")
+    def do_connect(*args: Any) -> None:
+        opening.start = time.perf_counter()
+
+    @event.listens_for(engine, "connect")
+    def connect(*args: Any) -> None:
+        connect_times.append(time.perf_counter() - getattr(opening, "start", time.perf_counter()))
+
+    queries = {kind: text(sql.format(export_rows=options["export_rows"])) for kind, sql in QUERIES.items()}
+    threads = options["threads"]
+    start = threading.Barrier(threads + 1)
+    deadline = [0.0]
+    stats = [_Stats() for _ in range(threads)]
+    workers = [
+        threading.Thread(
+            target=_work,
+            args=(engine, queries, options["mix"], seed * 100_003 + i, start, deadline, options["think"], stats[i]),
+            daemon=True,
+        )
+        for i in range(threads)
+    ]
+    try:
+        with PeakRss() as rss:
+            for worker in workers:
+                worker.start()
+            deadline[0] = time.perf_counter() + options["duration"]
+            began = time.perf_counter()
+            start.wait()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - began
+        pool_status = engine.pool.status()
+    finally:
+        engine.dispose()
+
+    total = _Stats()
+    for thread_stats in stats:
+        total.merge(thread_stats)
+    return {
+        "elapsed": elapsed,
+        "latencies": total.latencies,
+        "errors": dict(total.errors),
+        "pool_waits": total.pool_waits,
+        "connect_times": connect_times,
+        "peak_rss": rss.peak,
+        "pool_status": pool_status,
+    }
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    elapsed = max(run["elapsed"] for run in runs)
+    queries = {}
+    total = 0
+    for kind in QUERIES:
+        latencies = [latency for run in runs for latency in run["latencies"][kind]]
+        total += len(latencies)
+        if latencies:
+            queries[kind] = {"qps": len(latencies) / elapsed, "latency": percentiles(latencies)}
+    errors: Counter = Counter()
+    for run in runs:
+        errors.update(run["errors"])
+    pool_waits = [wait for run in runs for wait in run["pool_waits"]]
+    connect_times = [seconds for run in runs for seconds in run["connect_times"]]
+    return {
+        "elapsed_s": elapsed,
+        "queries": total,
+        "qps": total / elapsed,
+        "errors": dict(errors),
+        "by_kind": queries,
+        "pool_wait": percentiles(pool_waits) if pool_waits else None,
+        "connections_created": len(connect_times),
+        "connection_create": percentiles(connect_times) if connect_times else None,
+        "peak_rss_mb": [run["peak_rss"] / MB for run in runs],
+        "pool_status": [run["pool_status"] for run in runs],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=50, help="threads per process")
+    parser.add_argument("--processes", type=int, default=1, help="processes, each with its own engine")
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--think", type=float, default=0.0, help="mean seconds each thread waits between queries")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help=f"weights of the kinds of query "
+                                                                           f"(default {DEFAULT_MIX})")
+    parser.add_argument("--export-rows", type=int, default=100_000, help="rows of the export queries")
+    parser.add_argument("--pool-size", type=int, default=5)
+    parser.add_argument("--max-overflow", type=int, default=10)
+    parser.add_argument("--pool-timeout", type=float, default=30)
+    parser.add_argument("--pool-pre-ping", action="store_true")
+    parser.add_argument("--url", help="a server to load instead of the stand-in server")
+    parser.add_argument("--scale-factor", type=float, default=0.01)
+    parser.add_argument("--endpoints", type=int, default=1, help="endpoints the server splits each result into")
+    parser.add_argument("--server-process", action="store_true", help="run the server in a child process")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="load-results.json")
+    args = parser.parse_args()
+
+    options = {
+        "threads": args.threads,
+        "duration": args.duration,
+        "think": args.think,
+        "mix": args.mix,
+        "export_rows": args.export_rows,
+        "pool_size": args.pool_size,
+        "max_overflow": args.max_overflow,
+        "pool_timeout": args.pool_timeout,
+        "pool_pre_ping": args.pool_pre_ping,
+    }
+    stop: Optional[Any] = None
+    if args.url:
+        url = args.url
+    else:
+        url, stop = start_server(args.scale_factor, args.endpoints, args.server_process)
+    try:
+        if args.processes == 1:
+            runs = [run_process(url, options, args.seed)]
+        else:
+            with multiprocessing.get_context("spawn").Pool(args.processes) as pool:
+                runs = pool.starmap(run_process, [(url, options, args.seed + i) for i in range(args.processes)])
+    finally:
+        if stop is not None:
+            stop()
+
+    results = {
+        "meta": {
+            "processes": args.processes,
+            "server": "url" if args.url else "stand-in",
+            "scale_factor": None if args.url else args.scale_factor,
+            "server_process": args.server_process,
+            **options,
+            **environment(),
+        },
+        "results": summarize(runs),
+    }
+    print(json.dumps(results["results"], indent=2))
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""
+TPC-H-shaped tables (same tables, columns, types and row counts per scale
+factor as dbgen) with random data, for loading the stand-in server without
+DuckDB's tpch extension (which needs a network connection to install).
+"""
+from typing import Dict
+
+import numpy as np
+import pyarrow as pa
+
+REGIONS = ["AFRICA", "AMERICA", "ASIA", "EUROPE", "MIDDLE EAST"]
+
+NATIONS = [
+    ("ALGERIA", 0), ("ARGENTINA", 1), ("BRAZIL", 1), ("CANADA", 1), ("EGYPT", 4),
+    ("ETHIOPIA", 0), ("FRANCE", 3), ("GERMANY", 3), ("INDIA", 2), ("INDONESIA", 2),
+    ("IRAN", 4), ("IRAQ", 4), ("JAPAN", 2), ("JORDAN", 4), ("KENYA", 0),
+    ("MOROCCO", 0), ("MOZAMBIQUE", 0), ("PERU", 1), ("CHINA", 2), ("ROMANIA", 3),
+    ("SAUDI ARABIA", 4), ("VIETNAM", 2), ("RUSSIA", 3), ("UNITED KINGDOM", 3),
+    ("UNITED STATES", 1),
+]
+
+WORDS = np.array(
+    "furiously carefully quickly slyly blithely final pending regular express "
+    "special ironic bold even silent unusual deposits requests packages accounts "
+    "instructions foxes theodolites pinto beans ideas dependencies asymptotes".split()
+)
+
+SEGMENTS = np.array(["AUTOMOBILE", "BUILDING", "FURNITURE", "HOUSEHOLD", "MACHINERY"])
+PRIORITIES = np.array(["1-URGENT", "2-HIGH", "3-MEDIUM", "4-NOT SPECIFIED", "5-LOW"])
+INSTRUCTIONS = np.array(["DELIVER IN PERSON", "COLLECT COD", "NONE", "TAKE BACK RETURN"])
+MODES = np.array(["REG AIR", "AIR", "RAIL", "SHIP", "TRUCK", "MAIL", "FOB"])
+
+# 1992-01-01 .. 1998-08-02 as days since the epoch
+START_DATE = 8035
+END_DATE = 10440
+
+MONEY = pa.decimal128(15, 2)
+
+SUPPLIERS_PER_PART = 4
+
+
+def _comments(rng: np.random.Generator, rows: int, words: int) -> pa.Array:
+    picked = WORDS[rng.integers(0, len(WORDS), size=(rows, words))]
+    return pa.array([" ".join(row) for row in picked])
+
+
+def _money(values: np.ndarray) -> pa.Array:
+    return pa.array(np.round(values, 2)).cast(MONEY, safe=False)
+
+
+def _pick(rng: np.random.Generator, choices: np.ndarray, rows: int) -> pa.Array:
+    return pa.array(choices[rng.integers(0, len(choices), rows)])
+
+
+def _keys(rows: int) -> pa.Array:
+    return pa.array(np.arange(1, rows + 1, dtype=np.int32))
+
+
+def _dates(days: np.ndarray) -> pa.Array:
+    return pa.array(days.astype(np.int32), pa.date32())
+
+
+def _part_suppliers(partkeys: np.ndarray, suppliers: int, i: np.ndarray) -> np.ndarray:
+    """
+    The ``i``th (0 to 3) supplier of each part, spread over the suppliers like
+    dbgen's (whose formula repeats suppliers of a part at small scale factors)
+    """
+    return (partkeys + i * max(1, suppliers // SUPPLIERS_PER_PART)) % suppliers + 1
+
+
+def generate(scale_factor: float = 0.01, seed: int = 42) -> Dict[str, pa.Table]:
+    rng = np.random.default_rng(seed)
+    suppliers = max(1, int(10_000 * scale_factor))
+    customers = max(1, int(150_000 * scale_factor))
+    parts = max(1, int(200_000 * scale_factor))
+    orders = max(1, int(1_500_000 * scale_factor))
+
+    region = pa.table({
+        "r_regionkey": pa.array(range(len(REGIONS)), pa.int32()),
+        "r_name": REGIONS,
+        "r_comment": _comments(rng, len(REGIONS), 8),
+    })
+    nation = pa.table({
+        "n_nationkey": pa.array(range(len(NATIONS)), pa.int32()),
+        "n_name": [name for name, _ in NATIONS],
+        "n_regionkey": pa.array([region_key for _, region_key in NATIONS], pa.int32()),
+        "n_comment": _comments(rng, len(NATIONS), 10),
+    })
+    supplier = pa.table({
+        "s_suppkey": _keys(suppliers),
+        "s_name": pa.array([f"Supplier#{i:09d}" for i in range(1, suppliers + 1)]),
+        "s_address": _comments(rng, suppliers, 2),
+        "s_nationkey": pa.array(rng.integers(0, 25, suppliers).astype(np.int32)),
+        "s_phone": pa.array([f"{10 + i % 25}-{i % 1000:03d}-555-{i % 10000:04d}" for i in range(suppliers)]),
+        "s_acctbal": _money(rng.uniform(-999.99, 9999.99, suppliers)),
+        "s_comment": _comments(rng, suppliers, 6),
+    })
+    customer = pa.table({
+        "c_custkey": _keys(customers),
+        "c_name": pa.array([f"Customer#{i:09d}" for i in range(1, customers + 1)]),
+        "c_address": _comments(rng, customers, 2),
+        "c_nationkey": pa.array(rng.integers(0, 25, customers).astype(np.int32)),
+        "c_phone": pa.array([f"{10 + i % 25}-{i % 1000:03d}-555-{i % 10000:04d}" for i in range(customers)]),
+        "c_acctbal": _money(rng.uniform(-999.99, 9999.99, customers)),
+        "c_mktsegment": _pick(rng, SEGMENTS, customers),
+        "c_comment": _comments(rng, customers, 6),
+    })
+    part = pa.table({
+        "p_partkey": _keys(parts),
+        "p_name": _comments(rng, parts, 3),
+        "p_mfgr": pa.array([f"Manufacturer#{i}" for i in rng.integers(1, 6, parts)]),
+        "p_brand": pa.array([f"Brand#{i}" for i in rng.integers(11, 56, parts)]),
+        "p_type": _comments(rng, parts, 2),
+        "p_size": pa.array(rng.integers(1, 51, parts).astype(np.int32)),
+        "p_container": _pick(rng, np.array(["SM CASE", "LG BOX", "MED BAG", "JUMBO PKG", "WRAP DRUM"]), parts),
+        "p_retailprice": _money(rng.uniform(900, 2100, parts)),
+        "p_comment": _comments(rng, parts, 3),
+    })
+
+    # 4 suppliers per part
+    partsupp_parts = np.repeat(np.arange(1, parts + 1), SUPPLIERS_PER_PART)
+    partsupp = pa.table({
+        "ps_partkey": pa.array(partsupp_parts.astype(np.int32)),
+        "ps_suppkey": pa.array(
+            _part_suppliers(partsupp_parts, suppliers, np.tile(np.arange(SUPPLIERS_PER_PART), parts)).astype(np.int32)
+        ),
+        "ps_availqty": pa.array(rng.integers(1, 10_000, len(partsupp_parts)).astype(np.int32)),
+        "ps_supplycost": _money(rng.uniform(1, 1000, len(partsupp_parts))),
+        "ps_comment": _comments(rng, len(partsupp_parts), 12),
+    })
+
+    order_dates = rng.integers(START_DATE, END_DATE - 151, orders)
+    orders_table = pa.table({
+        "o_orderkey": _keys(orders),
+        "o_custkey": pa.array(rng.integers(1, customers + 1, orders).astype(np.int32)),
+        "o_orderstatus": _pick(rng, np.array(["F", "O", "P"]), orders),
+        "o_totalprice": _money(rng.uniform(850, 550_000, orders)),
+        "o_orderdate": _dates(order_dates),
+        "o_orderpriority": _pick(rng, PRIORITIES, orders),
+        "o_clerk": pa.array([f"Clerk#{i:09d}" for i in rng.integers(1, 1001, orders)]),
+        "o_shippriority": pa.array(np.zeros(orders, dtype=np.int32)),
+        "o_comment": _comments(rng, orders, 5),
+    })
+
+    # 1 to 7 line items per order
+    lines_per_order = rng.integers(1, 8, orders)
+    lines = int(lines_per_order.sum())
+    line_orders = np.repeat(np.arange(orders), lines_per_order)
+    line_numbers = np.arange(lines) - np.repeat(np.cumsum(lines_per_order) - lines_per_order, lines_per_order) + 1
+    quantity = rng.integers(1, 51, lines)
+    ship_dates = order_dates[line_orders] + rng.integers(1, 122, lines)
+    line_parts = rng.integers(1, parts + 1, lines)
+    lineitem = pa.table({
+        "l_orderkey": pa.array((line_orders + 1).astype(np.int32)),
+        "l_partkey": pa.array(line_parts.astype(np.int32)),
+        # one of the part's suppliers, as in partsupp
+        "l_suppkey": pa.array(
+            _part_suppliers(line_parts, suppliers, rng.integers(0, SUPPLIERS_PER_PART, lines)).astype(np.int32)
+        ),
+        "l_linenumber": pa.array(line_numbers.astype(np.int32)),
+        "l_quantity": _money(quantity.astype(np.float64)),
+        "l_extendedprice": _money(quantity * rng.uniform(900, 2100, lines)),
+        "l_discount": _money(rng.integers(0, 11, lines) / 100),
+        "l_tax": _money(rng.integers(0, 9, lines) / 100),
+        "l_returnflag": _pick(rng, np.array(["A", "N", "R"]), lines),
+        "l_linestatus": _pick(rng, np.array(["F", "O"]), lines),
+        "l_shipdate": _dates(ship_dates),
+        "l_commitdate": _dates(order_dates[line_orders] + rng.integers(30, 91, lines)),
+        "l_receiptdate": _dates(ship_dates + rng.integers(1, 31, lines)),
+        "l_shipinstruct": _pick(rng, INSTRUCTIONS, lines),
+        "l_shipmode": _pick(rng, MODES, lines),
+        "l_comment": _comments(rng, lines, 4),
+    })
+
+    return {
+        "region": region,
+        "nation": nation,
+        "supplier": supplier,
+        "customer": customer,
+        "part": part,
+        "partsupp": partsupp,
+        "orders": orders_table,
+        "lineitem": lineitem,
+    }
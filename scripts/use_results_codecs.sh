@@ -0,0 +1,40 @@
+#!/usr/bin/env bash
+#
+# Points Superset's readers of SQL Lab's stored results (the results and CSV
+# export commands) at sql_lab.results_decompress, which decompresses them
+# with the codec recorded with their query instead of always with zlib.
+#
+# Usage: scripts/use_results_codecs.sh <apache-superset source directory>
+#
+set -e
+
+SUPERSET_DIR="${1:?the apache-superset source directory}"
+
+readers=$(grep --recursive --files-with-matches --include="*.py" \
+            "utils.zlib_decompress(" "${SUPERSET_DIR}/superset" | \
+          xargs --no-run-if-empty grep --files-with-matches "results_backend.get(")
+
+if [ -z "${readers}" ]; then
+  echo "No readers of stored results found in ${SUPERSET_DIR}" >&2
+  exit 1
+fi
+
+for reader in ${readers}; do
+  # the commands hold their query in self._query
+  if ! grep --quiet "self._query" "${reader}"; then
+    echo "Don't know the query of the stored results read in ${reader}" >&2
+    exit 1
+  fi
+  sed --in-place \
+      --expression="s/utils\.zlib_decompress(/results_decompress(self._query, /" \
+      --expression="0,/^from superset/s//from superset.sql_lab import results_decompress\nfrom superset/" \
+      "${reader}"
+  # e.g. the call or the imports were reformatted
+  if grep --quiet "utils\.zlib_decompress(" "${reader}" || \
+     ! grep --quiet "results_decompress(self\._query, " "${reader}" || \
+     ! grep --quiet "^from superset\.sql_lab import results_decompress$" "${reader}"; then
+    echo "Couldn't patch ${reader}" >&2
+    exit 1
+  fi
+  echo "Patched ${reader}"
+done
@@ -0,0 +1,116 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import time
+from contextlib import closing
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+import pandas as pd
+from adbc_flight_sql_driver.query import cancel_query
+from sqlalchemy.orm import Session
+
+from superset.common.db_query_status import QueryStatus
+from superset.db_engine_specs.base import BaseEngineSpec
+from superset.sql_parse import Table
+
+if TYPE_CHECKING:
+    # prevent circular imports
+    from superset.models.core import Database
+    from superset.models.sql_lab import Query
+
+# pandas.DataFrame.to_sql if_exists -> adbc_flight_sql_driver ingest mode
+INGEST_MODES = {"fail": "create", "replace": "replace", "append": "append"}
+
+
+class ADBCFlightSQLEngineSpec(BaseEngineSpec):
+    engine = "adbc_flight_sql"
+    engine_name = "Flight SQL (ADBC)"
+
+    # seconds between checks of a running query for a stop request
+    poll_interval = 1.0
+
+    @classmethod
+    def execute(cls, cursor: Any, query: str, **kwargs: Any) -> None:
+        """
+        With async_=True, start the query on the cursor's background thread so
+        that handle_cursor can poll it and cancel it when it is stopped
+        """
+        if not kwargs.get("async_") or not hasattr(cursor, "execute_async"):
+            super().execute(cursor, query, **kwargs)
+            return
+        if cls.arraysize:
+            cursor.arraysize = cls.arraysize
+        cursor.execute_async(query)
+
+    @classmethod
+    def handle_cursor(cls, cursor: Any, query: Query, session: Session) -> None:
+        """Wait for the query to finish, cancelling it if the user stops it"""
+        if not hasattr(cursor, "poll"):
+            return
+        while cursor.poll() == "running":
+            session.refresh(query)
+            if query.status == QueryStatus.STOPPED:
+                cursor.cancel()
+                break
+            time.sleep(cls.poll_interval)
+
+    @classmethod
+    def has_implicit_cancel(cls) -> bool:
+        # handle_cursor cancels the query in the process running it
+        return True
+
+    @classmethod
+    def get_cancel_query_id(cls, cursor: Any, query: Query) -> Optional[str]:
+        return getattr(cursor, "query_id", None)
+
+    @classmethod
+    def cancel_query(cls, cursor: Any, query: Query, cancel_query_id: str) -> bool:
+        return cancel_query(cancel_query_id)
+
+    @classmethod
+    def df_to_sql(
+        cls,
+        database: Database,
+        table: Table,
+        df: pd.DataFrame,
+        to_sql_kwargs: Dict[str, Any],
+    ) -> None:
+        """
+        Upload data from a Pandas DataFrame with the driver's Arrow bulk ingest,
+        instead of the row by row INSERTs of `pandas.DataFrame.to_sql`.
+
+        :param database: The database to upload the data to
+        :param table: The table to upload the data to
+        :param df: The dataframe with data to be uploaded
+        :param to_sql_kwargs: The kwargs to be passed to pandas.DataFrame.to_sql` method
+        """
+        if to_sql_kwargs.get("index"):
+            df = df.reset_index()
+            if index_label := to_sql_kwargs.get("index_label"):
+                df = df.rename(columns={df.columns[0]: index_label})
+
+        with cls.get_engine(database) as engine:
+            with closing(engine.raw_connection()) as conn:
+                conn.ingest(
+                    table.table,
+                    df,
+                    mode=INGEST_MODES[to_sql_kwargs.get("if_exists", "fail")],
+                    schema=table.schema or None,
+                    batch_size=to_sql_kwargs.get("chunksize"),
+                )
+                conn.commit()
@@ -16,12 +16,17 @@
 # under the License.
 import dataclasses
 import logging
+import tempfile
 import uuid
 from contextlib import closing
 from datetime import datetime
 from sys import getsizeof
-from typing import Any, cast, Dict, List, Optional, Tuple, Union
+from typing import Any, cast, Dict, IO, Iterable, List, Optional, Tuple, Type, Union
 
+from adbc_flight_sql_driver import codecs
+from adbc_flight_sql_driver.json_records import arrow_to_json
+from adbc_flight_sql_driver.results_payload import compress_payload
+from adbc_flight_sql_driver.tracing import set_tracer, StatsLoggerTracer
 import backoff
 import msgpack
 import pyarrow as pa
@@ -48,7 +53,12 @@ from superset.exceptions import SupersetErrorException, SupersetErrorsException
 from superset.extensions import celery_app
 from superset.models.core import Database
 from superset.models.sql_lab import Query
-from superset.result_set import SupersetResultSet
+from superset.result_set import (
+    convert_to_string,
+    dedup,
+    stringify,
+    SupersetResultSet,
+)
 from superset.sql_parse import CtasMethod, insert_rls, ParsedQuery
 from superset.sqllab.limiting_factor import LimitingFactor
 from superset.utils.celery import session_scope
@@ -56,8 +66,8 @@ from superset.utils.core import (
     get_username,
     json_iso_dttm_ser,
     override_user,
+    pessimistic_json_iso_dttm_ser,
     QuerySource,
-    zlib_compress,
 )
 from superset.utils.dates import now_as_float
 from superset.utils.decorators import stats_timing
@@ -70,8 +80,28 @@ SQL_MAX_ROW = config["SQL_MAX_ROW"]
 SQLLAB_CTAS_NO_LIMIT = config["SQLLAB_CTAS_NO_LIMIT"]
 SQL_QUERY_MUTATOR = config["SQL_QUERY_MUTATOR"]
 log_query = config["QUERY_LOGGER"]
+# Streamed results are spooled to disk once their IPC stream outgrows this size
+SQLLAB_RESULTS_SPOOL_MAX_MEMORY = config.get(
+    "SQLLAB_RESULTS_SPOOL_MAX_MEMORY", 64 * 1024 * 1024
+)
+# Compression of the Arrow IPC buffers of results stored in the results backend
+# ("lz4", "zstd" or None). With the zlib codec compressed buffers are only
+# stored, not compressed a second time.
+SQLLAB_RESULTS_IPC_COMPRESSION = config.get("SQLLAB_RESULTS_IPC_COMPRESSION", "zstd")
+# Codec of results stored in the results backend ("zlib", "zstd", "lz4" or
+# "none"), per database with "results_backend_codec" in its extra. The codec
+# is recorded with each query, see results_decompress
+SQLLAB_RESULTS_CODEC = config.get("SQLLAB_RESULTS_CODEC", "zlib")
+# Report the timings and counters of the Flight SQL driver's phases (connect,
+# auth, execute, first_batch, fetch, convert...) to the stats logger
+ADBC_FLIGHT_SQL_TRACING = config.get("ADBC_FLIGHT_SQL_TRACING", False)
+# the key of the codec of the stored results in the query's extra
+RESULTS_CODEC_KEY = "results_backend_codec"
 logger = logging.getLogger(__name__)
 
+if ADBC_FLIGHT_SQL_TRACING:
+    set_tracer(StatsLoggerTracer(stats_logger))
+
 
 class SqlLabException(Exception):
     pass
@@ -85,6 +115,166 @@ class SqlLabQueryStoppedException(SqlLabException):
     pass
 
 
+def stringify_nested_columns(table: pa.Table) -> pa.Table:
+    """Mirror SupersetResultSet - nested values are stringified"""
+    columns = []
+    for column in table.columns:
+        if pa.types.is_nested(column.type):
+            column = pa.array(
+                [None if v is None else stringify(v) for v in column.to_pylist()],
+                type=pa.string(),
+            )
+        columns.append(column)
+    return pa.Table.from_arrays(columns, names=table.column_names)
+
+
+class JSONRecords(json.RawJSON):
+    """
+    The rows of an Arrow table in place of df_to_records' list of dicts: when
+    the payload is serialized they are encoded by arrow_to_json, without a
+    Python object per value. Can be sliced like the list.
+    """
+
+    def __init__(self, table: pa.Table):  # pylint: disable=super-init-not-called
+        self.table = table
+
+    @property
+    def encoded_json(self) -> str:  # type: ignore
+        return arrow_to_json(self.table, default=pessimistic_json_iso_dttm_ser)
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def __iter__(self) -> Any:
+        return iter(self.table.to_pylist())
+
+    def __getitem__(self, item: Any) -> Any:
+        if isinstance(item, slice):
+            start, stop, step = item.indices(self.table.num_rows)
+            if step == 1:
+                return JSONRecords(self.table.slice(start, max(stop - start, 0)))
+            return JSONRecords(self.table.take(list(range(start, stop, step))))
+        return self.table.slice(item % self.table.num_rows, 1).to_pylist()[0]
+
+
+class ArrowResultSet(SupersetResultSet):
+    """
+    A SupersetResultSet built straight from an Arrow table (as returned by an
+    Arrow-native cursor), skipping the Python row round trip.
+    """
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self,
+        table: pa.Table,
+        cursor_description: Any,
+        db_engine_spec: Type[BaseEngineSpec],
+    ):
+        self.db_engine_spec = db_engine_spec
+        column_names = dedup([convert_to_string(name) for name in table.column_names])
+        self.table = stringify_nested_columns(table.rename_columns(column_names))
+        self._type_dict: Dict[str, Any] = {}
+        try:
+            self._type_dict = {
+                col: db_engine_spec.get_datatype(description[1])
+                for col, description in zip(column_names, cursor_description or [])
+            }
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.exception(ex)
+
+
+def ipc_write_options() -> pa.ipc.IpcWriteOptions:
+    return pa.ipc.IpcWriteOptions(compression=SQLLAB_RESULTS_IPC_COMPRESSION)
+
+
+def compress_results(
+    payload: Dict[str, Any], data: Union[pa.Buffer, IO[bytes]], codec: str
+) -> bytes:
+    """The stored results of the payload with the IPC stream ``data``"""
+    return compress_payload(
+        payload,
+        data,
+        codec,
+        default=json_iso_dttm_ser,
+        ipc_compressed=bool(SQLLAB_RESULTS_IPC_COMPRESSION),
+    )
+
+
+def results_codec(database: Database) -> str:
+    codec = database.get_extra().get("results_backend_codec", SQLLAB_RESULTS_CODEC)
+    if codec not in codecs.CODECS:
+        raise SqlLabException(
+            __("Invalid results backend codec: %(codec)s", codec=codec)
+        )
+    return codec
+
+
+def results_decompress(
+    query: Query, blob: bytes, decode: Optional[bool] = True
+) -> Union[bytes, str]:
+    """
+    The stored results of ``query`` decompressed with the codec they were
+    stored with, for the readers of the results backend in place of
+    utils.zlib_decompress. Results stored before codecs were recorded are
+    detected from their data.
+    """
+    if isinstance(blob, str):
+        blob = blob.encode("utf-8")
+    codec = query.extra.get(RESULTS_CODEC_KEY)
+    decompressed = codecs.decompress(blob, codec)
+    return decompressed.decode("utf-8") if decode else decompressed
+
+
+class SpooledResultSet(ArrowResultSet):
+    """
+    A result set whose rows are streamed from the cursor into an Arrow IPC
+    stream, spooled to disk once it outgrows SQLLAB_RESULTS_SPOOL_MAX_MEMORY.
+    Only the column metadata and the batch in flight are held in memory.
+    """
+
+    def __init__(
+        self,
+        batches: Any,
+        cursor_description: Any,
+        db_engine_spec: Type[BaseEngineSpec],
+        limit: Optional[int] = None,
+    ):
+        super().__init__(
+            batches.schema.empty_table(), cursor_description, db_engine_spec
+        )
+        self.spool = tempfile.SpooledTemporaryFile(
+            max_size=SQLLAB_RESULTS_SPOOL_MAX_MEMORY
+        )
+        self.rows = 0
+        self.has_more = False
+        self._write(batches, limit)
+
+    def _write(self, batches: Iterable[pa.RecordBatch], limit: Optional[int]) -> None:
+        with pa.ipc.new_stream(
+            self.spool, self.table.schema, options=ipc_write_options()
+        ) as writer:
+            for batch in batches:
+                if limit is not None and self.rows + batch.num_rows > limit:
+                    # we've seen the extra row, no need to read any further
+                    self.has_more = True
+                    batch = batch.slice(0, limit - self.rows)
+                table = pa.Table.from_batches([batch])
+                writer.write_table(
+                    stringify_nested_columns(
+                        table.rename_columns(self.table.column_names)
+                    )
+                )
+                self.rows += batch.num_rows
+                if self.has_more:
+                    break
+
+    @property
+    def size(self) -> int:
+        return self.rows
+
+    def close(self) -> None:
+        self.spool.close()
+
+
 def handle_query_error(
     ex: Exception,
     query: Query,
@@ -200,6 +390,7 @@ def execute_sql_statement(  # pylint: disable=too-many-arguments,too-many-statem
     cursor: Any,
     log_params: Optional[Dict[str, Any]],
     apply_ctas: bool = False,
+    stream_results: bool = False,
 ) -> SupersetResultSet:
     """Executes a single SQL statement"""
     database: Database = query.database
@@ -275,6 +466,10 @@ def execute_sql_statement(  # pylint: disable=too-many-arguments,too-many-statem
         session.commit()
         with stats_timing("sqllab.query.time_executing_query", stats_logger):
             logger.debug("Query %d: Running query: %s", query.id, sql)
+            if hasattr(cursor, "max_rows"):
+                # the driver stops reading the result after the extra row, also
+                # when the limit couldn't be applied to the SQL (e.g. CTEs)
+                cursor.max_rows = increased_limit
             db_engine_spec.execute(cursor, sql, async_=True)
             logger.debug("Query %d: Handling cursor", query.id)
             db_engine_spec.handle_cursor(cursor, query, session)
@@ -285,12 +480,27 @@ def execute_sql_statement(  # pylint: disable=too-many-arguments,too-many-statem
                 query.id,
                 str(query.to_dict()),
             )
-            data = db_engine_spec.fetch_data(cursor, increased_limit)
-            if query.limit is None or len(data) <= query.limit:
-                query.limiting_factor = LimitingFactor.NOT_LIMITED
+            if stream_results and hasattr(cursor, "stream_record_batches"):
+                # stream the batches straight into an IPC spool, bounding the
+                # memory held by the worker
+                with cursor.stream_record_batches() as batches:
+                    data = SpooledResultSet(
+                        batches, cursor.description, db_engine_spec, query.limit
+                    )
+                if not data.has_more:
+                    query.limiting_factor = LimitingFactor.NOT_LIMITED
             else:
-                # return 1 row less than increased_query
-                data = data[:-1]
+                if hasattr(cursor, "fetch_arrow_table"):
+                    # Arrow-native cursor - keep the result as record batches,
+                    # capped to increased_limit rows by the cursor
+                    data = cursor.fetch_arrow_table()
+                else:
+                    data = db_engine_spec.fetch_data(cursor, increased_limit)
+                if query.limit is None or len(data) <= query.limit:
+                    query.limiting_factor = LimitingFactor.NOT_LIMITED
+                else:
+                    # return 1 row less than increased_query
+                    data = data[:-1]
     except SoftTimeLimitExceeded as ex:
         query.status = QueryStatus.TIMED_OUT
 
@@ -317,8 +527,13 @@ def execute_sql_statement(  # pylint: disable=too-many-arguments,too-many-statem
         logger.debug("Query %d: %s", query.id, ex)
         raise SqlLabException(db_engine_spec.extract_error_message(ex)) from ex
 
+    if isinstance(data, SpooledResultSet):
+        return data
+
     logger.debug("Query %d: Fetching cursor description", query.id)
     cursor_description = cursor.description
+    if isinstance(data, pa.Table):
+        return ArrowResultSet(data, cursor_description, db_engine_spec)
     return SupersetResultSet(data, cursor_description, db_engine_spec)
 
 
@@ -349,7 +564,7 @@ def _serialize_payload(
 def write_ipc_buffer(table: pa.Table) -> pa.Buffer:
     sink = pa.BufferOutputStream()
 
-    with pa.ipc.new_stream(sink, table.schema) as writer:
+    with pa.ipc.new_stream(sink, table.schema, options=ipc_write_options()) as writer:
         writer.write_table(table)
 
     return sink.getvalue()
@@ -360,7 +575,12 @@ def _serialize_and_expand_data(
     db_engine_spec: BaseEngineSpec,
     use_msgpack: Optional[bool] = False,
     expand_data: bool = False,
-) -> Tuple[Union[bytes, str], List[Any], List[Any], List[Any]]:
+) -> Tuple[Union[pa.Buffer, JSONRecords, List[Any]], List[Any], List[Any], List[Any]]:
+    """
+    The data of the payload: an Arrow IPC buffer with msgpack, otherwise the
+    records encoded from the same Arrow table when the payload is serialized
+    (or Python records, when they need expanding)
+    """
     selected_columns = result_set.columns
     all_columns: List[Any]
     expanded_columns: List[Any]
@@ -369,21 +589,22 @@ def _serialize_and_expand_data(
         with stats_timing(
             "sqllab.query.results_backend_pa_serialization", stats_logger
         ):
-            data = write_ipc_buffer(table=result_set.pa_table).to_pybytes()
+            # kept as an Arrow buffer, see compress_results
+            data = write_ipc_buffer(table=result_set.pa_table)
 
         # expand when loading data from results backend
         all_columns, expanded_columns = (selected_columns, [])
+    elif not expand_data:
+        # encoded straight from the Arrow table when the payload is serialized
+        data = JSONRecords(result_set.pa_table)
+        all_columns = selected_columns
+        expanded_columns = []
     else:
         df = result_set.to_pandas_df()
         data = df_to_records(df) or []
-
-        if expand_data:
-            all_columns, data, expanded_columns = db_engine_spec.expand_data(
-                selected_columns, data
-            )
-        else:
-            all_columns = selected_columns
-            expanded_columns = []
+        all_columns, data, expanded_columns = db_engine_spec.expand_data(
+            selected_columns, data
+        )
 
     return (data, selected_columns, all_columns, expanded_columns)
 
@@ -418,6 +639,15 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
             )
         )
 
+    # Results that only go to the results backend (async queries) are streamed
+    # from the cursor rather than materialized in the worker's memory
+    stream_results = bool(
+        store_results
+        and not return_results
+        and results_backend
+        and results_backend_use_msgpack
+    )
+
     # Breaking down into multiple statements
     parsed_query = ParsedQuery(rendered_query, strip_comments=True)
     if not db_engine_spec.run_multiple_statements_as_one:
@@ -506,6 +736,7 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
                     cursor,
                     log_params,
                     apply_ctas,
+                    stream_results=stream_results and i == statement_count - 1,
                 )
             except SqlLabQueryStoppedException:
                 payload.update({"status": QueryStatus.STOPPED})
@@ -544,9 +775,20 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
     query.end_time = now_as_float()
 
     use_arrow_data = store_results and cast(bool, results_backend_use_msgpack)
-    data, selected_columns, all_columns, expanded_columns = _serialize_and_expand_data(
-        result_set, db_engine_spec, use_arrow_data, expand_data
-    )
+    if isinstance(result_set, SpooledResultSet):
+        # the data is added straight from the spool when the payload is stored
+        data = None
+        selected_columns = all_columns = result_set.columns
+        expanded_columns = []
+    else:
+        (
+            data,
+            selected_columns,
+            all_columns,
+            expanded_columns,
+        ) = _serialize_and_expand_data(
+            result_set, db_engine_spec, use_arrow_data, expand_data
+        )
 
     # TODO: data should be saved separately from metadata (likely in Parquet)
     payload.update(
@@ -567,21 +809,37 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
         logger.info(
             "Query %s: Storing results in results backend, key: %s", str(query_id), key
         )
+        codec = results_codec(database)
+        query.set_extra_json_key(RESULTS_CODEC_KEY, codec)
         with stats_timing("sqllab.query.results_backend_write", stats_logger):
-            with stats_timing(
-                "sqllab.query.results_backend_write_serialization", stats_logger
-            ):
-                serialized_payload = _serialize_payload(
-                    payload, cast(bool, results_backend_use_msgpack)
+            if isinstance(result_set, SpooledResultSet):
+                with stats_timing(
+                    "sqllab.query.results_backend_write_serialization", stats_logger
+                ):
+                    # serialized and compressed chunk by chunk from the spool
+                    compressed = compress_results(payload, result_set.spool, codec)
+                result_set.close()
+            elif use_arrow_data:
+                with stats_timing(
+                    "sqllab.query.results_backend_write_serialization", stats_logger
+                ):
+                    compressed = compress_results(payload, payload["data"], codec)
+            else:
+                with stats_timing(
+                    "sqllab.query.results_backend_write_serialization", stats_logger
+                ):
+                    serialized_payload = _serialize_payload(
+                        payload, cast(bool, results_backend_use_msgpack)
+                    )
+
+                compressed = codecs.compress(serialized_payload, codec)
+                logger.debug(
+                    "*** serialized payload size: %i", getsizeof(serialized_payload)
                 )
             cache_timeout = database.cache_timeout
             if cache_timeout is None:
                 cache_timeout = config["CACHE_DEFAULT_TIMEOUT"]
 
-            compressed = zlib_compress(serialized_payload)
-            logger.debug(
-                "*** serialized payload size: %i", getsizeof(serialized_payload)
-            )
             logger.debug("*** compressed payload size: %i", getsizeof(compressed))
             results_backend.set(key, compressed, cache_timeout)
         query.results_key = key
@@ -0,0 +1,55 @@
+import asyncio
+import threading
+from typing import Any, List
+
+import pyarrow as pa
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+
+@pytest.fixture
+def async_url(url: str) -> str:
+    return url.replace("adbc_flight_sql://", "adbc_flight_sql+async://")
+
+
+def async_threads() -> List[threading.Thread]:
+    return [thread for thread in threading.enumerate() if thread.name.startswith("flight-sql-async")]
+
+
+def test_queries(async_url: str) -> None:
+    async def run() -> Any:
+        engine = create_async_engine(async_url)
+        try:
+            async with engine.connect() as connection:
+                nations = (await connection.execute(text("SELECT count(*) FROM nation"))).scalar()
+                streamed = await connection.stream(text("SELECT * FROM range(5000)"))
+                rows = [row async for row in streamed]
+                driver_connection = (await connection.get_raw_connection()).driver_connection
+                table = await driver_connection.fetch_arrow_table("SELECT * FROM region")
+            return nations, rows, table
+        finally:
+            await engine.dispose()
+
+    nations, rows, table = asyncio.run(run())
+    assert nations == 25
+    assert len(rows) == 5000
+    assert isinstance(table, pa.Table) and table.num_rows == 5
+
+
+def test_threads_stop_on_dispose(async_url: str) -> None:
+    before = set(async_threads())
+
+    async def run() -> None:
+        engine = create_async_engine(async_url + "?asyncWorkers=2")
+        # started on first use
+        assert set(async_threads()) == before
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        assert set(async_threads()) - before
+        await engine.dispose()
+
+    asyncio.run(run())
+    for thread in set(async_threads()) - before:
+        thread.join(5)
+        assert not thread.is_alive()
@@ -0,0 +1,99 @@
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+
+import adbc_driver_flightsql.dbapi as flight_sql
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import DBAPIError
+
+from adbc_flight_sql_driver import auth
+from benchmarks.flight_sql_server import PASSWORD, USERNAME, FlightSqlServer
+
+
+@pytest.fixture
+def uri(server: FlightSqlServer) -> str:
+    uri = f"grpc://127.0.0.1:{server.port}"
+    auth.invalidate_token(uri, USERNAME, PASSWORD)
+    return uri
+
+
+@pytest.fixture
+def logins(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """The users logging in"""
+    logins: List[str] = []
+    authenticate = auth._authenticate
+
+    def counting(uri: str, user: str, *args: Any) -> auth.BearerToken:
+        logins.append(user)
+        return authenticate(uri, user, *args)
+
+    monkeypatch.setattr(auth, "_authenticate", counting)
+    return logins
+
+
+def test_caches_token(uri: str, logins: List[str]) -> None:
+    token = auth.get_token(uri, USERNAME, PASSWORD)
+    assert token.header.startswith("Bearer ")
+    assert auth.get_token(uri, USERNAME, PASSWORD) == token
+    assert logins == [USERNAME]
+
+
+def test_refreshes_expiring_token(uri: str, logins: List[str]) -> None:
+    auth.get_token(uri, USERNAME, PASSWORD, lifetime=30)
+    auth.get_token(uri, USERNAME, PASSWORD, lifetime=30, refresh_margin=60)
+    assert logins == [USERNAME, USERNAME]
+
+
+def test_logs_in_once_per_key(uri: str, logins: List[str]) -> None:
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        tokens = list(executor.map(lambda _: auth.get_token(uri, USERNAME, PASSWORD), range(8)))
+    assert len(set(tokens)) == 1
+    assert logins == [USERNAME]
+
+
+def test_login_doesnt_block_other_keys(uri: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    authenticate = auth._authenticate
+    started, release = threading.Event(), threading.Event()
+
+    def slow(uri: str, user: str, *args: Any) -> auth.BearerToken:
+        if user == "slow":
+            started.set()
+            release.wait(10)
+            raise flight_sql.ProgrammingError("slow", status_code=auth.adbc_driver_manager.AdbcStatusCode.UNAUTHENTICATED)
+        return authenticate(uri, user, *args)
+
+    monkeypatch.setattr(auth, "_authenticate", slow)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = executor.submit(auth.get_token, uri, "slow", PASSWORD)
+        try:
+            assert started.wait(10)
+            # answered while the other login is still waiting
+            assert auth.get_token(uri, USERNAME, PASSWORD).header
+            assert not pending.done()
+        finally:
+            release.set()
+        with pytest.raises(flight_sql.ProgrammingError):
+            pending.result()
+
+
+def test_wrong_password(uri: str, url: str) -> None:
+    with pytest.raises(flight_sql.ProgrammingError) as raised:
+        auth.get_token(uri, USERNAME, "wrong")
+    assert auth.is_unauthenticated(raised.value)
+    engine = create_engine(url.replace(f":{PASSWORD}@", ":wrong@"))
+    try:
+        with pytest.raises(DBAPIError) as wrapped:
+            engine.connect()
+        assert isinstance(wrapped.value.orig, flight_sql.ProgrammingError)
+    finally:
+        engine.dispose()
+
+
+def test_unreachable() -> None:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    with pytest.raises(flight_sql.OperationalError, match="Couldn't log in"):
+        auth.get_token(f"grpc://127.0.0.1:{port}", USERNAME, PASSWORD)
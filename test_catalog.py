@@ -0,0 +1,94 @@
+from typing import Iterator
+
+import pyarrow as pa
+import pytest
+from sqlalchemy import MetaData, create_engine, inspect, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SAWarning
+
+from adbc_flight_sql_driver.catalog import load_catalog_adbc
+from adbc_flight_sql_driver.datatypes import arrow_to_sqltype
+from conftest import RecordingServer
+
+
+@pytest.fixture
+def tables(engine: Engine) -> Iterator[Engine]:
+    with engine.connect() as connection:
+        connection.execute(text(
+            "CREATE TABLE parent (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL UNIQUE, CHECK (id > 0))"
+        ))
+        connection.execute(text("CREATE TABLE child (id INTEGER PRIMARY KEY, parent_id INTEGER REFERENCES parent (id))"))
+    yield engine
+    with engine.connect() as connection:
+        connection.execute(text("DROP TABLE child"))
+        connection.execute(text("DROP TABLE parent"))
+
+
+def test_reflects_constraints(tables: Engine) -> None:
+    inspector = inspect(tables)
+    assert [(c["name"], c["nullable"]) for c in inspector.get_columns("parent")] == [("id", False), ("name", False)]
+    assert inspector.get_pk_constraint("parent")["constrained_columns"] == ["id"]
+    assert [u["column_names"] for u in inspector.get_unique_constraints("parent")] == [["name"]]
+    assert [c["sqltext"] for c in inspector.get_check_constraints("parent")] == ["id > 0"]
+    [foreign_key] = inspector.get_foreign_keys("child")
+    assert foreign_key["constrained_columns"] == ["parent_id"]
+    assert foreign_key["referred_table"] == "parent"
+    assert foreign_key["referred_columns"] == ["id"]
+
+
+def test_reflects_a_schema_at_a_time(tables: Engine, recorded: RecordingServer) -> None:
+    metadata = MetaData()
+    metadata.reflect(tables, only=["parent", "child"])
+    assert set(metadata.tables) == {"parent", "child"}
+    assert metadata.tables["child"].c.parent_id.references(metadata.tables["parent"].c.id)
+    # the columns of every table in one query
+    queries = list(recorded.statements)
+    assert sum("table_type" in query for query in queries) == 1
+
+    # the constraints as often for more tables, and the columns aren't read again
+    recorded.clear()
+    MetaData().reflect(tables, only=["parent", "child", "nation", "region"])
+    assert recorded.statements == queries[1:]
+
+
+def test_adbc_backend_falls_back(url: str) -> None:
+    engine = create_engine(url + "?reflectionBackend=adbc")
+    try:
+        # the stand-in server has no GetObjects
+        with pytest.warns(SAWarning, match="doesn't support ADBC GetObjects"):
+            assert "nation" in inspect(engine).get_table_names()
+        assert engine.dialect.reflection_backend == "sql"
+    finally:
+        engine.dispose()
+
+
+def test_load_catalog_adbc() -> None:
+    sqlite = pytest.importorskip("adbc_driver_sqlite.dbapi")
+    with sqlite.connect() as connection:
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE parent (id INTEGER NOT NULL, name TEXT)")
+            cursor.execute("CREATE TABLE child (parent_id INTEGER)")
+            cursor.execute("CREATE VIEW names AS SELECT name FROM parent")
+        [entry] = load_catalog_adbc(connection).values()
+    assert sorted(entry.tables) == ["child", "parent"]
+    assert entry.views == ["names"]
+    assert [(c.name, c.type_name, c.nullable) for c in entry.columns["parent"]] == [
+        ("id", "INTEGER", False),
+        ("name", "TEXT", True),
+    ]
+    assert [c.name for c in entry.columns["names"]] == ["name"]
+
+
+@pytest.mark.parametrize(
+    "arrow_type, expected",
+    [
+        (pa.int64(), "BIGINT"),
+        (pa.dictionary(pa.int32(), pa.string()), "VARCHAR"),
+        (pa.decimal128(12, 2), "NUMERIC(12, 2)"),
+        (pa.timestamp("us", "UTC"), "TIMESTAMP WITH TIME ZONE"),
+        (pa.list_(pa.int32()), "INTEGER[]"),
+    ],
+)
+def test_arrow_to_sqltype(arrow_type: pa.DataType, expected: str) -> None:
+    assert str(arrow_to_sqltype(arrow_type).compile(dialect=postgresql.dialect())) == expected
@@ -0,0 +1,64 @@
+import os
+import subprocess
+import zlib
+
+import pytest
+
+from adbc_flight_sql_driver import codecs
+
+DATA = b"SELECT * FROM lineitem" * 1000
+
+
+@pytest.mark.parametrize("codec", codecs.CODECS)
+def test_round_trip(codec: str) -> None:
+    compressed = codecs.compress(DATA, codec)
+    assert codecs.decompress(compressed, codec) == DATA
+    # detected, for results stored before their codec was recorded
+    assert codecs.decompress(compressed) == DATA
+
+
+def test_explicit_codec_isnt_detected() -> None:
+    # uncompressed data that starts like a zlib stream
+    data = b"\x78\x9c" + DATA
+    assert codecs.decompress(data, "none") == data
+    # ...which zlib can't decompress: returned as is when detected only
+    assert codecs.decompress(data) == data
+    with pytest.raises(zlib.error):
+        codecs.decompress(data, "zlib")
+
+
+def test_invalid_codec() -> None:
+    with pytest.raises(ValueError):
+        codecs.decompress(DATA, "gzip")
+
+
+READER = """from flask import g
+from superset.commands.base import BaseCommand
+from superset.utils import core as utils
+
+
+class SqlResultExportCommand(BaseCommand):
+    def run(self):
+        blob = results_backend.get(self._query.results_key)
+        payload = utils.zlib_decompress(blob, decode=True)
+"""
+
+
+@pytest.mark.parametrize("reader, patched", [
+    (READER, True),
+    # nowhere to add the import
+    (READER.replace("from superset", "import superset"), False),
+])
+def test_use_results_codecs_script(tmp_path: str, reader: str, patched: bool) -> None:
+    path = os.path.join(tmp_path, "superset", "export.py")
+    os.makedirs(os.path.dirname(path))
+    with open(path, "w") as f:
+        f.write(reader)
+    script = os.path.join(os.path.dirname(__file__), "scripts", "use_results_codecs.sh")
+    result = subprocess.run(["bash", script, str(tmp_path)], capture_output=True, text=True)
+    assert (result.returncode == 0) == patched, result.stderr
+    if patched:
+        with open(path) as f:
+            source = f.read()
+        assert "from superset.sql_lab import results_decompress\n" in source
+        assert "results_decompress(self._query, blob, decode=True)" in source
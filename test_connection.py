@@ -0,0 +1,164 @@
+from typing import Any
+
+import adbc_driver_flightsql.dbapi as flight_sql
+import pyarrow as pa
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+from conftest import RecordingServer
+
+
+def test_execute_keeps_rowcount(engine: Engine) -> None:
+    connection = engine.raw_connection()
+    try:
+        connection.execute("CREATE TABLE rowcounts (n INTEGER)")
+        connection.executemany("INSERT INTO rowcounts VALUES (?)", [(1,), (2,), (3,)])
+        assert connection.rowcount == 3
+    finally:
+        connection.execute("DROP TABLE rowcounts")
+        connection.close()
+
+
+def test_execute_keeps_description(engine: Engine) -> None:
+    connection = engine.raw_connection()
+    try:
+        connection.execute("SELECT n_nationkey, n_name FROM nation")
+        assert [column[0] for column in connection.description] == ["n_nationkey", "n_name"]
+    finally:
+        connection.close()
+
+
+def test_fetch_arrow(engine: Engine) -> None:
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            with pytest.raises(flight_sql.ProgrammingError, match="before execute"):
+                cursor.fetch_arrow_table()
+            cursor.execute("SELECT n_nationkey, n_name FROM nation")
+            table = cursor.fetch_arrow_table()
+            assert table.column_names == ["n_nationkey", "n_name"]
+            assert table.num_rows == 25
+            # more than a batch
+            cursor.execute("SELECT * FROM range(200000)")
+            reader = cursor.fetch_record_batches()
+            assert isinstance(reader, pa.RecordBatchReader)
+            assert sum(batch.num_rows for batch in reader) == 200000
+    finally:
+        connection.close()
+
+
+NATION = "SELECT n_name FROM nation WHERE n_nationkey = ?"
+REGION = "SELECT r_name FROM region WHERE r_regionkey = ?"
+SUPPLIER = "SELECT s_name FROM supplier WHERE s_suppkey = ?"
+
+
+def run(connection: Any, *statements: str) -> None:
+    for statement in statements:
+        with connection.cursor() as cursor:
+            cursor.execute(statement, (1,))
+            cursor.fetchall()
+
+
+def test_reuses_prepared_statements(url: str, recorded: RecordingServer) -> None:
+    engine = create_engine(url)
+    try:
+        connection = engine.raw_connection()
+        try:
+            recorded.clear()
+            run(connection, NATION, NATION, NATION)
+        finally:
+            connection.close()
+    finally:
+        engine.dispose()
+    assert recorded.prepared == [NATION]
+    assert recorded.statements == [NATION] * 3
+
+
+def test_evicts_least_recently_used_statement(url: str, recorded: RecordingServer) -> None:
+    engine = create_engine(url + "?statementCacheSize=2")
+    try:
+        connection = engine.raw_connection()
+        try:
+            recorded.clear()
+            run(connection, NATION, REGION, NATION, SUPPLIER, NATION, REGION)
+        finally:
+            connection.close()
+    finally:
+        engine.dispose()
+    # REGION was the least recently used when SUPPLIER came
+    assert recorded.prepared == [NATION, REGION, SUPPLIER, REGION]
+
+
+def test_statement_cache_disabled(url: str, recorded: RecordingServer) -> None:
+    engine = create_engine(url + "?statementCacheSize=0")
+    try:
+        connection = engine.raw_connection()
+        try:
+            recorded.clear()
+            run(connection, NATION, REGION, NATION)
+        finally:
+            connection.close()
+    finally:
+        engine.dispose()
+    assert recorded.prepared == [NATION, REGION, NATION]
+
+
+
+def test_closes_unread_results(engine: Engine) -> None:
+    statement = "SELECT * FROM range(200000)"
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(statement)
+            cursor.fetchone()
+        cached = connection.checkout_statement(statement)
+        assert cached is not None
+        # the rest of the result isn't left streaming to the cached cursor
+        assert cached._results is None
+        cached.close()
+    finally:
+        connection.close()
+
+
+def test_reuses_idle_cursors(engine: Engine) -> None:
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.raw_cursor()
+        connection.release_cursor(cursor)
+        assert connection.raw_cursor() is cursor
+    finally:
+        connection.close()
+
+
+def test_idle_cursor_pool_size(url: str) -> None:
+    engine = create_engine(url + "?cursorPoolSize=1")
+    try:
+        connection = engine.raw_connection()
+        try:
+            first, second = connection.raw_cursor(), connection.raw_cursor()
+            connection.release_cursor(first)
+            # past cursorPoolSize
+            connection.release_cursor(second)
+            assert connection.raw_cursor() is first
+            assert connection.raw_cursor() is not second
+        finally:
+            connection.close()
+    finally:
+        engine.dispose()
+
+
+@pytest.mark.parametrize("max_rows", [0, 1, 10, 100_000])
+def test_max_rows(engine: Engine, max_rows: int) -> None:
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.max_rows = max_rows
+            # more than a batch
+            cursor.execute("SELECT * FROM range(200000)")
+            assert len(cursor.fetchall()) == max_rows
+            cursor.max_rows = None
+            cursor.execute("SELECT * FROM nation")
+            assert len(cursor.fetchall()) == 25
+    finally:
+        connection.close()
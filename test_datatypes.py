@@ -0,0 +1,82 @@
+import datetime
+import decimal
+from typing import Any
+
+import pyarrow as pa
+import pytest
+from sqlalchemy import ARRAY, Float, Integer, LargeBinary, Numeric, text
+from sqlalchemy.engine import Engine
+
+from adbc_flight_sql_driver.datatypes import to_pylist
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        pa.array([1, None, -(2 ** 63)], pa.int64()),
+        pa.array([2 ** 64 - 1, 0], pa.uint64()),
+        pa.array([1.5, None, float("inf")], pa.float64()),
+        pa.array([True, None, False]),
+        pa.array(["a", None, "ü"]),
+        pa.array([decimal.Decimal("1.10"), None], pa.decimal128(10, 2)),
+        pa.array([datetime.date(2023, 5, 1), None], pa.date32()),
+        pa.array([datetime.datetime(2023, 5, 1, 12, 30, 0, 123456)], pa.timestamp("us")),
+        pa.array([datetime.datetime(2023, 5, 1, 12, 30)], pa.timestamp("us", "UTC")),
+        pa.array([datetime.datetime(2023, 5, 1), None], pa.timestamp("ms")),
+        pa.array([b"\x00\x01", None]),
+    ],
+    ids=lambda array: str(array.type),
+)
+def test_to_pylist(array: pa.Array) -> None:
+    values = to_pylist(array)
+    assert values == array.to_pylist()
+    assert [type(value) for value in values] == [type(value) for value in array.to_pylist()]
+
+
+def test_description(engine: Engine) -> None:
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT CAST(1.5 AS DECIMAL(10, 2)) AS price, 'a' AS name")
+            price, name = cursor.description
+            assert price == ("price", pa.decimal128(10, 2), None, None, 10, 2, True)
+            assert name[:2] == ("name", pa.string())
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize(
+    "type_, sql, expected",
+    [
+        # converted by the Arrow to Python conversion already
+        (Numeric(10, 2), "CAST(1.5 AS DECIMAL(10, 2))", decimal.Decimal("1.50")),
+        (Float(), "CAST(1.5 AS DOUBLE)", 1.5),
+        (LargeBinary(), "'\\x01'::BLOB", b"\x01"),
+        # and by the result processor
+        (Numeric(10, 2), "CAST(1.5 AS DOUBLE)", decimal.Decimal("1.50")),
+        (Numeric(asdecimal=False), "CAST(1.5 AS DECIMAL(10, 2))", 1.5),
+    ],
+)
+def test_result_types(engine: Engine, type_: Any, sql: str, expected: Any) -> None:
+    with engine.connect() as connection:
+        value = connection.execute(text(f"SELECT {sql} AS value").columns(value=type_)).scalar()
+    assert value == expected
+    assert type(value) is type(expected)
+
+
+@pytest.mark.parametrize(
+    "type_, arrow_type, processed",
+    [
+        (Numeric(10, 2), pa.decimal128(10, 2), False),
+        (Numeric(10, 2), pa.float64(), True),
+        (Numeric(asdecimal=False), pa.float64(), False),
+        (Float(), pa.float32(), False),
+        (LargeBinary(), pa.binary(), False),
+        (ARRAY(Integer()), pa.list_(pa.int32()), False),
+        (ARRAY(Numeric(10, 2)), pa.list_(pa.float64()), True),
+    ],
+)
+def test_result_processors(engine: Engine, type_: Any, arrow_type: pa.DataType, processed: bool) -> None:
+    dialect = engine.dialect
+    processor = type_.dialect_impl(dialect).result_processor(dialect, arrow_type)
+    assert (processor is not None) == processed
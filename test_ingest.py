@@ -0,0 +1,71 @@
+from typing import Any, Iterator
+
+import adbc_driver_flightsql.dbapi as flight_sql
+import pandas as pd
+import pyarrow as pa
+import pytest
+from sqlalchemy.engine import Engine
+
+TABLE = pa.table({"a": pa.array([1, 2, 3], pa.int64()), "b": ["x", "y", None]})
+
+
+@pytest.fixture
+def connection(engine: Engine) -> Iterator[Any]:
+    connection = engine.raw_connection()
+    try:
+        yield connection
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS ingested")
+    finally:
+        connection.close()
+
+
+def rows(connection: Any) -> list:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT a, b FROM ingested ORDER BY a")
+        return cursor.fetchall()
+
+
+def test_create(connection: Any) -> None:
+    connection.ingest("ingested", TABLE, batch_size=2)
+    assert rows(connection) == [(1, "x"), (2, "y"), (3, None)]
+    with pytest.raises(Exception):
+        connection.ingest("ingested", TABLE)
+
+
+def test_append(connection: Any) -> None:
+    connection.ingest("ingested", TABLE)
+    connection.ingest("ingested", pd.DataFrame({"a": [4], "b": ["z"]}), mode="append")
+    assert rows(connection)[-1] == (4, "z")
+
+
+def test_replace(connection: Any) -> None:
+    connection.ingest("ingested", TABLE)
+    connection.ingest("ingested", TABLE.slice(0, 1).to_reader(), mode="replace")
+    assert rows(connection) == [(1, "x")]
+    # replacing a table that doesn't exist creates it
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TABLE ingested")
+    connection.ingest("ingested", TABLE, mode="replace")
+    assert len(rows(connection)) == 3
+
+
+def test_failed_replace_keeps_table(connection: Any) -> None:
+    connection.ingest("ingested", TABLE)
+
+    def batches() -> Iterator[pa.RecordBatch]:
+        yield from TABLE.to_batches()
+        raise ValueError("source failed")
+
+    with pytest.raises(ValueError, match="source failed"):
+        connection.ingest("ingested", pa.RecordBatchReader.from_batches(TABLE.schema, batches()), mode="replace")
+    assert len(rows(connection)) == 3
+    # and no staging table is left behind
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT table_name FROM information_schema.tables WHERE table_name LIKE 'ingested%'")
+        assert cursor.fetchall() == [("ingested",)]
+
+
+def test_register(connection: Any) -> None:
+    with pytest.raises(flight_sql.NotSupportedError, match="ingest"):
+        connection.execute("register", ("ingested", TABLE.to_pandas()))
@@ -0,0 +1,63 @@
+import datetime
+import json
+from decimal import Decimal
+
+import pyarrow as pa
+import pytest
+
+from adbc_flight_sql_driver.json_records import JS_MAX_INTEGER, arrow_to_json
+
+
+@pytest.mark.parametrize("type_, values", [
+    (pa.decimal128(12, 2), ["1.50", "-0.05", "9999999999.99", None]),
+    # more digits than a double holds
+    (pa.decimal128(38, 10), ["1234567890123456789012345678.0123456789", "0.1000000001"]),
+    (pa.decimal256(40, 2), ["12345678901234567890123456789012345678.01"]),
+    (pa.decimal128(5, -3), ["12345000", "-1000"]),
+])
+def test_decimals_round_trip(type_: pa.DataType, values: list) -> None:
+    decimals = [None if value is None else Decimal(value) for value in values]
+    table = pa.table({"d": pa.array(decimals, type_)})
+    rows = json.loads(arrow_to_json(table), parse_float=Decimal)
+    assert [None if row["d"] is None else Decimal(row["d"]) for row in rows] == decimals
+
+
+def test_decimals_javascript_parses_exactly_are_numbers() -> None:
+    table = pa.table({"d": pa.array([Decimal("0.10")], pa.decimal128(15, 2))})
+    assert arrow_to_json(table) == '[{"d":0.10}]'
+
+
+@pytest.mark.parametrize("type_, values, expected", [
+    (pa.int64(), [1, -JS_MAX_INTEGER, JS_MAX_INTEGER + 1, -JS_MAX_INTEGER - 1, None],
+     [1, -JS_MAX_INTEGER, str(JS_MAX_INTEGER + 1), str(-JS_MAX_INTEGER - 1), None]),
+    (pa.int64(), [-2 ** 63, 2 ** 63 - 1], [str(-2 ** 63), str(2 ** 63 - 1)]),
+    (pa.uint64(), [0, JS_MAX_INTEGER, 2 ** 63, 2 ** 64 - 1], [0, JS_MAX_INTEGER, str(2 ** 63), str(2 ** 64 - 1)]),
+    (pa.int32(), [-2 ** 31, 7], [-2 ** 31, 7]),
+])
+def test_integers(type_: pa.DataType, values: list, expected: list) -> None:
+    table = pa.table({"i": pa.array(values, type_)})
+    assert [row["i"] for row in json.loads(arrow_to_json(table))] == expected
+
+
+def test_values() -> None:
+    table = pa.table({
+        "b": [True, None],
+        "f": [1.5, float("nan")],
+        "s": ['a "quoted"\\ line\n', "\x01"],
+        "t": pa.array([datetime.datetime(2023, 1, 2, 3, 4, 5), datetime.datetime(2023, 1, 2, 3, 4, 5, 6)]),
+        "d": [datetime.date(2023, 1, 2), None],
+        "c": pa.array(["x", "y"]).dictionary_encode(),
+        "n": pa.nulls(2),
+        "o": [datetime.time(1, 2), None],
+    })
+    assert json.loads(arrow_to_json(table, default=str)) == [
+        {"b": True, "f": 1.5, "s": 'a "quoted"\\ line\n', "t": "2023-01-02T03:04:05",
+         "d": "2023-01-02", "c": "x", "n": None, "o": "01:02:00"},
+        {"b": None, "f": None, "s": "\x01", "t": "2023-01-02T03:04:05.000006",
+         "d": None, "c": "y", "n": None, "o": None},
+    ]
+
+
+def test_empty() -> None:
+    assert arrow_to_json(pa.table({"a": pa.array([], pa.int64())})) == "[]"
+    assert arrow_to_json(pa.table({"a": [1, 2]}).drop(["a"])) == "[{},{}]"
@@ -0,0 +1,36 @@
+import argparse
+
+import pytest
+
+from benchmarks import load
+
+
+def test_parse_mix() -> None:
+    assert load.parse_mix("metadata=3, export=1") == {"metadata": 3.0, "export": 1.0}
+    with pytest.raises(argparse.ArgumentTypeError, match="Unknown query kind 'charts'"):
+        load.parse_mix("charts=1")
+
+
+def test_run(url: str) -> None:
+    options = {
+        "threads": 8,
+        "duration": 0.5,
+        "think": 0.0,
+        "mix": load.parse_mix("metadata=2,dashboard=1,export=1"),
+        "export_rows": 100,
+        "pool_size": 2,
+        "max_overflow": 1,
+        "pool_timeout": 30,
+        "pool_pre_ping": False,
+    }
+    run = load.run_process(url, options, seed=1)
+    assert run["errors"] == {}
+    # more threads than connections
+    assert 0 < len(run["connect_times"]) <= 3
+
+    summary = load.summarize([run, run])
+    assert summary["queries"] == 2 * sum(len(latencies) for latencies in run["latencies"].values())
+    assert summary["connections_created"] == 2 * len(run["connect_times"])
+    assert set(summary["by_kind"]) == {"metadata", "dashboard", "export"}
+    assert summary["pool_wait"]["count"] == summary["queries"]
+    assert len(summary["pool_status"]) == 2
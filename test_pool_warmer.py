@@ -0,0 +1,73 @@
+import threading
+import time
+from typing import Any, Callable
+
+from sqlalchemy import create_engine, event
+
+from adbc_flight_sql_driver.pool_warmer import PoolWarmer
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def test_prewarm(url: str) -> None:
+    engine = create_engine(url + "?poolPrewarm=3", pool_size=5)
+    try:
+        assert wait_for(lambda: engine.pool.checkedin() == 3)
+    finally:
+        engine.dispose()
+
+
+def test_tops_up_idle_connections(url: str) -> None:
+    engine = create_engine(url + "?poolMinIdle=4&poolMaintenanceInterval=0.1", pool_size=10)
+    try:
+        assert wait_for(lambda: engine.pool.checkedin() == 4)
+        held = [engine.raw_connection() for _ in range(3)]
+        try:
+            assert wait_for(lambda: engine.pool.checkedin() == 4)
+            assert engine.pool.checkedout() == 3
+        finally:
+            for connection in held:
+                connection.close()
+        # all back idle, the warmer's included
+        assert engine.pool.checkedin() == 7
+    finally:
+        engine.dispose()
+
+
+def test_leaves_idle_connections_alone(url: str) -> None:
+    engine = create_engine(url, pool_size=5)
+    opened = threading.Event()
+    try:
+        for connection in [engine.raw_connection() for _ in range(2)]:
+            connection.close()
+        event.listen(engine, "connect", lambda *_: opened.wait(10))
+        warmer = PoolWarmer(engine, prewarm=4)
+        warmer.start()
+        # the two missing connections are being opened...
+        assert wait_for(lambda: engine.pool.checkedout() == 2)
+        # ...while the idle ones can still be checked out
+        assert engine.pool.checkedin() == 2
+        engine.raw_connection().close()
+        opened.set()
+        assert wait_for(lambda: engine.pool.checkedin() == 4)
+        assert engine.pool.checkedout() == 0
+    finally:
+        opened.set()
+        engine.dispose()
+
+
+def test_stops_on_dispose(url: str) -> None:
+    engine = create_engine(url + "?poolMinIdle=2&poolMaintenanceInterval=0.05", pool_size=5)
+    warmer: Any = engine._flight_sql_pool_warmer
+    assert wait_for(lambda: engine.pool.checkedin() == 2)
+    engine.dispose()
+    warmer._thread.join(1)
+    assert not warmer._thread.is_alive()
+    assert engine.pool.checkedin() == 0
@@ -0,0 +1,63 @@
+import time
+
+import adbc_driver_flightsql.dbapi as flight_sql
+import pytest
+from sqlalchemy.engine import Engine
+
+from adbc_flight_sql_driver.query import cancel_query
+from test_pool_warmer import wait_for
+
+# takes the stand-in server a couple of seconds
+SLOW_QUERY = "SELECT sum(range) FROM range(1000000000)"
+
+
+def test_execute_async(engine: Engine) -> None:
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute_async("SELECT count(*) FROM nation")
+            assert cursor.poll() in ("running", "finished")
+            # the fetch methods wait for the query
+            assert cursor.fetchall() == [(25,)]
+            assert cursor.poll() == "finished"
+    finally:
+        connection.close()
+
+
+def test_cancel(engine: Engine) -> None:
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute_async(SLOW_QUERY)
+        assert cancel_query(cursor.query_id)
+        assert cursor.poll() == "cancelled"
+        with pytest.raises(flight_sql.OperationalError, match="cancelled"):
+            cursor.fetchall()
+
+        started = time.monotonic()
+        cursor.close()
+        # without waiting for the server to finish the query
+        assert time.monotonic() - started < 1
+
+        # the connection is still usable
+        with connection.cursor() as other:
+            other.execute("SELECT 1")
+            assert other.fetchall() == [(1,)]
+    finally:
+        # waits for the cancelled query, which keeps it from closing
+        connection.close()
+
+
+def test_cancel_finished(engine: Engine) -> None:
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute_async("SELECT * FROM nation")
+            assert wait_for(lambda: cursor.poll() == "finished")
+            assert cursor.cancel()
+            assert cursor.poll() == "cancelled"
+            # and the cursor runs the next query
+            cursor.execute("SELECT count(*) FROM region")
+            assert cursor.fetchall() == [(5,)]
+    finally:
+        connection.close()
@@ -0,0 +1,114 @@
+import json
+import pickle
+import time
+from pathlib import Path
+from typing import Optional
+
+import pyarrow as pa
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine
+
+from adbc_flight_sql_driver.catalog import Catalog, CatalogCache, Column, SchemaEntry
+from adbc_flight_sql_driver.catalog_file import CatalogFile
+
+IDENTITY = ("127.0.0.1", "31337", "flight_username", None)
+
+
+def catalog(schema: Optional[str] = None) -> Catalog:
+    columns = [
+        Column("id", "INTEGER", False, None, None, 32, 0, pa.int32()),
+        Column("price", "DECIMAL(12,2)", True, None, None, 12, 2, pa.decimal128(12, 2)),
+        Column("tags", None, True, None, None, None, None, pa.list_(pa.string())),
+    ]
+    return {"main": SchemaEntry(["items"], [], {"items": columns}, time.monotonic())}
+
+
+def unreachable(schema: Optional[str] = None) -> Catalog:
+    raise AssertionError("loaded from the server")
+
+
+def cached(path: Path) -> CatalogCache:
+    cache = CatalogCache()
+    cache.file = CatalogFile(str(path), identity=IDENTITY)
+    return cache
+
+
+def test_new_process_reads_the_file(tmp_path: Path) -> None:
+    path = tmp_path / "reflection.json"
+    stored = cached(path).schema("main", catalog)
+    entry = cached(path).schema("main", unreachable)
+    assert entry is not None and stored is not None
+    assert entry.columns == stored.columns
+    assert entry.tables == ["items"]
+
+
+def test_file_is_json(tmp_path: Path) -> None:
+    path = tmp_path / "reflection.json"
+    cached(path).schema("main", catalog)
+    assert json.loads(path.read_text())["records"]
+
+
+def test_other_version_is_a_miss(tmp_path: Path) -> None:
+    path = tmp_path / "reflection.json"
+    cached(path).schema("main", catalog)
+    cache = CatalogCache()
+    cache.file = CatalogFile(str(path), identity=IDENTITY, version="2")
+    assert cache.file.load() is None
+
+
+@pytest.mark.parametrize("content", [
+    b"",
+    b"not json",
+    b'{"header": [2], "records": []}',
+    b"[1, 2, 3]",
+    pickle.dumps(((1, "1.4"), {IDENTITY: {"version": ""}})),
+])
+def test_invalid_file_is_a_miss(tmp_path: Path, content: bytes) -> None:
+    path = tmp_path / "reflection.json"
+    path.write_bytes(content)
+    entry = cached(path).schema("main", catalog)
+    assert entry is not None and entry.tables == ["items"]
+    # rewritten
+    assert cached(path).schema("main", unreachable).columns == entry.columns
+
+
+def test_invalid_record_is_a_miss(tmp_path: Path) -> None:
+    path = tmp_path / "reflection.json"
+    cached(path).schema("main", catalog)
+    content = json.loads(path.read_text())
+    content["records"][0][1]["schemas"]["main"]["columns"]["items"] = [["id"]]
+    path.write_text(json.dumps(content))
+    entry = cached(path).schema("main", catalog)
+    assert entry is not None and len(entry.columns["items"]) == 3
+
+
+def test_engine_reflects_from_the_file(url: str, tmp_path: Path) -> None:
+    path = tmp_path / "reflection.json"
+    engine = create_engine(f"{url}?reflectionCacheFile={path}")
+    try:
+        columns = inspect(engine).get_columns("nation")
+    finally:
+        engine.dispose()
+    engine = create_engine(f"{url}?reflectionCacheFile={path}")
+    try:
+        inspector = inspect(engine)
+        assert engine.dialect._catalog_cache.schema("main", unreachable) is not None
+        assert [(c["name"], repr(c["type"])) for c in inspector.get_columns("nation")] == [
+            (c["name"], repr(c["type"])) for c in columns
+        ]
+    finally:
+        engine.dispose()
+
+
+def test_ddl_invalidates(engine: Engine) -> None:
+    inspector = inspect(engine)
+    assert "reflected" not in inspector.get_table_names()
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TABLE reflected (a INTEGER)"))
+    try:
+        assert "reflected" in inspect(engine).get_table_names()
+    finally:
+        with engine.connect() as connection:
+            connection.execute(text("DROP TABLE reflected"))
+    assert "reflected" not in inspect(engine).get_table_names()
@@ -0,0 +1,80 @@
+from typing import Any, List
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from adbc_flight_sql_driver import registry
+from benchmarks.flight_sql_server import PASSWORD, USERNAME
+from conftest import RecordingServer
+
+
+def roots(server: RecordingServer) -> List[Any]:
+    """The shared database handles for the server"""
+    return [root for key, (root, _) in registry._roots.items() if f":{server.port}" in key[0]]
+
+
+class Owner:
+    pass
+
+
+def test_shared_until_disposed(url: str, server: RecordingServer) -> None:
+    first, second = create_engine(url), create_engine(url)
+    try:
+        for engine in (first, second):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1")).fetchall()
+        # one handle for both engines
+        assert len(roots(server)) == 1
+        first.dispose()
+        assert len(roots(server)) == 1
+        with second.connect() as connection:
+            connection.execute(text("SELECT 1")).fetchall()
+    finally:
+        second.dispose()
+        first.dispose()
+    # released with its last engine
+    assert roots(server) == []
+
+
+def test_unshared(url: str, server: RecordingServer) -> None:
+    engine = create_engine(url + "?shareDatabase=False")
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1")).fetchall()
+        assert roots(server) == []
+    finally:
+        engine.dispose()
+
+
+def test_fork(server: RecordingServer, monkeypatch: pytest.MonkeyPatch) -> None:
+    uri = f"grpc://127.0.0.1:{server.port}"
+    db_kwargs = {"username": USERNAME, "password": PASSWORD}
+    owner = Owner()
+    try:
+        registry.connect(uri, db_kwargs, owner=owner).close()
+        [parent] = roots(server)
+        # in a child process, the parent's handle is left alone...
+        monkeypatch.setattr(registry.os, "getpid", lambda: -1)
+        registry.connect(uri, db_kwargs, owner=owner).close()
+        [child] = roots(server)
+        assert child is not parent
+        # ...and not closed
+        with parent.adbc_clone() as connection, connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            assert cursor.fetchall() == [(1,)]
+        parent.close()
+    finally:
+        registry.release(owner)
+    assert roots(server) == []
+
+
+def test_close_databases(server: RecordingServer) -> None:
+    uri = f"grpc://127.0.0.1:{server.port}"
+    connection = registry.connect(uri, {"username": USERNAME, "password": PASSWORD})
+    registry.close_databases()
+    assert roots(server) == []
+    # open connections keep working
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        assert cursor.fetchall() == [(1,)]
+    connection.close()
@@ -0,0 +1,87 @@
+import os
+import threading
+from typing import Iterator
+
+import pyarrow as pa
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from adbc_flight_sql_driver.result_cache import ResultCache
+from conftest import RecordingServer
+
+QUERY = "SELECT count(*) FROM cached"
+
+
+@pytest.fixture
+def cached(url: str, server: RecordingServer) -> Iterator[Engine]:
+    engine = create_engine(url + "?resultCacheTtl=60")
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TABLE cached AS SELECT * FROM range(3)"))
+    server.clear()
+    yield engine
+    with engine.connect() as connection:
+        connection.execute(text("DROP TABLE cached"))
+    engine.dispose()
+
+
+def count(engine: Engine, query: str = QUERY) -> int:
+    with engine.connect() as connection:
+        # results are cached once read to the end
+        [(rows,)] = connection.execute(text(query)).fetchall()
+        return rows
+
+
+def test_serves_repeated_reads(cached: Engine, server: RecordingServer) -> None:
+    assert count(cached) == 3
+    # the same statement, but for whitespace and comments
+    assert count(cached, "SELECT  count(*)\n  FROM cached -- again") == 3
+    assert server.statements == [QUERY]
+
+
+def test_write_invalidates(cached: Engine, server: RecordingServer) -> None:
+    assert count(cached) == 3
+    assert count(cached) == 3
+    with cached.connect() as connection:
+        connection.execute(text("INSERT INTO cached VALUES (3)"))
+    assert count(cached) == 4
+    assert server.statements.count(QUERY) == 2
+
+
+def test_nested_write_invalidates(cached: Engine, server: RecordingServer) -> None:
+    assert count(cached) == 3
+    with cached.connect() as connection:
+        connection.execute(text("WITH x AS (SELECT 3) INSERT INTO cached SELECT * FROM x"))
+    assert count(cached) == 4
+
+
+def test_invalidate_result_cache(cached: Engine, server: RecordingServer) -> None:
+    count(cached)
+    cached.dialect.invalidate_result_cache()
+    count(cached)
+    assert server.statements == [QUERY, QUERY]
+
+
+def test_disabled_by_default(engine: Engine, cached: Engine, server: RecordingServer) -> None:
+    engine.connect().close()
+    server.clear()
+    count(engine)
+    count(engine)
+    assert server.statements == [QUERY, QUERY]
+
+
+def test_directory(tmp_path: str) -> None:
+    cache = ResultCache(ttl=60, directory=str(tmp_path))
+    table = pa.table({"a": [1, 2, 3]})
+    threads = [
+        threading.Thread(target=cache.put, args=(f"key-{i}", table, cache.generation))
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # one directory of the cache's own, holding every result
+    [files] = os.listdir(tmp_path)
+    assert len(os.listdir(os.path.join(tmp_path, files))) == 8
+    assert cache.get("key-0").equals(table)
@@ -0,0 +1,47 @@
+import io
+import zlib
+from datetime import datetime
+from typing import Any
+
+import pyarrow as pa
+import pytest
+
+from adbc_flight_sql_driver import codecs
+
+msgpack = pytest.importorskip("msgpack")
+from adbc_flight_sql_driver.results_payload import CHUNK_SIZE, compress_payload  # noqa: E402
+
+
+def ipc_stream(rows: int, compression: Any = None) -> pa.Buffer:
+    table = pa.table({"n": pa.array(range(rows), pa.int64()), "s": pa.array([str(n) for n in range(rows)])})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema, options=pa.ipc.IpcWriteOptions(compression=compression)) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def default(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+# in every msgpack bin size and across chunks
+@pytest.mark.parametrize("rows", [0, 100, 10_000, 200_000])
+@pytest.mark.parametrize("codec", ["zlib", "zstd", "none"])
+def test_same_as_msgpack(rows: int, codec: str) -> None:
+    data = ipc_stream(rows)
+    payload = {"status": "success", "query": {"changed_on": datetime(2023, 5, 1)}, "data": data}
+    expected = msgpack.dumps({**payload, "data": data.to_pybytes()}, default=default, use_bin_type=True)
+
+    assert codecs.decompress(compress_payload(payload, data, codec, default=default), codec) == expected
+    spool = io.BytesIO(data.to_pybytes())
+    assert codecs.decompress(compress_payload(payload, spool, codec, default=default), codec) == expected
+
+
+def test_reads_back() -> None:
+    data = ipc_stream(200_000, "zstd")
+    assert data.size > CHUNK_SIZE
+    compressed = compress_payload({"status": "success", "data": data}, data, ipc_compressed=True)
+    # stored, not compressed again
+    assert len(compressed) > data.size
+    payload = msgpack.loads(zlib.decompress(compressed), raw=False)
+    assert pa.ipc.open_stream(payload["data"]).read_all().num_rows == 200_000
@@ -0,0 +1,96 @@
+import threading
+from typing import Iterator, List
+
+import pyarrow as pa
+import pytest
+from sqlalchemy.engine import Engine
+
+from adbc_flight_sql_driver.streaming import RecordBatchStream
+from test_pool_warmer import wait_for
+
+BATCH = pa.record_batch([pa.array(range(1024), pa.int64())], names=["a"])
+
+
+class Source:
+    """
+    A reader of batches to stream, recording how many were read and whether
+    it was closed
+    """
+
+    schema = BATCH.schema
+
+    def __init__(self, batches: int, error: bool = False) -> None:
+        self.batches = batches
+        self.error = error
+        self.read = 0
+        self.closed = threading.Event()
+
+    def __iter__(self) -> Iterator[pa.RecordBatch]:
+        for _ in range(self.batches):
+            if self.closed.is_set():
+                raise ValueError("read after close")
+            self.read += 1
+            yield BATCH
+        if self.error:
+            raise ValueError("stream failed")
+
+    def close(self) -> None:
+        self.closed.set()
+
+
+def test_reads_everything() -> None:
+    source = Source(100)
+    with RecordBatchStream(source, max_buffer_bytes=4 * BATCH.nbytes) as stream:
+        assert stream.read_all().num_rows == 100 * BATCH.num_rows
+
+
+def test_backpressure() -> None:
+    source = Source(100)
+    stream = RecordBatchStream(source, max_buffer_bytes=4 * BATCH.nbytes)
+    try:
+        assert wait_for(lambda: len(stream._buffer) == 4)
+        # the fifth batch waits for room, and no more are read
+        assert not wait_for(lambda: source.read > 5, timeout=0.2)
+        next(stream)
+        assert wait_for(lambda: source.read == 6)
+        assert len(stream._buffer) == 4
+    finally:
+        stream.close()
+
+
+def test_batch_larger_than_buffer() -> None:
+    source = Source(3)
+    with RecordBatchStream(source, max_buffer_bytes=1) as stream:
+        batches: List[pa.RecordBatch] = list(stream)
+    assert len(batches) == 3
+
+
+def test_close_releases_stream() -> None:
+    source = Source(100)
+    stream = RecordBatchStream(source, max_buffer_bytes=4 * BATCH.nbytes)
+    next(stream)
+    stream.close()
+    # the read-ahead thread is gone, and let go of the stream
+    assert not stream._thread.is_alive()
+    assert source.closed.is_set()
+    assert source.read < 100
+
+
+def test_error() -> None:
+    source = Source(3, error=True)
+    with RecordBatchStream(source) as stream:
+        for _ in range(3):
+            next(stream)
+        with pytest.raises(ValueError, match="stream failed"):
+            next(stream)
+
+
+def test_cursor(engine: Engine) -> None:
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT * FROM range(200000)")
+            with cursor.stream_record_batches(max_buffer_bytes=1) as stream:
+                assert sum(batch.num_rows for batch in stream) == 200000
+    finally:
+        connection.close()
@@ -0,0 +1,25 @@
+import pyarrow.compute as pc
+
+from benchmarks import tpch
+
+
+def test_tables_of_dbgen() -> None:
+    tables = tpch.generate(0.01)
+    assert {name: table.num_rows for name, table in tables.items() if name != "lineitem"} == {
+        "region": 5,
+        "nation": 25,
+        "supplier": 100,
+        "customer": 1500,
+        "part": 2000,
+        "partsupp": 8000,
+        "orders": 15000,
+    }
+
+
+def test_line_items_are_supplied_by_partsupp() -> None:
+    tables = tpch.generate(0.001)
+    partsupp, lineitem = tables["partsupp"], tables["lineitem"]
+    supplied = set(zip(partsupp["ps_partkey"].to_pylist(), partsupp["ps_suppkey"].to_pylist()))
+    assert len(supplied) == partsupp.num_rows
+    assert set(zip(lineitem["l_partkey"].to_pylist(), lineitem["l_suppkey"].to_pylist())) <= supplied
+    assert pc.max(partsupp["ps_suppkey"]).as_py() <= tables["supplier"].num_rows
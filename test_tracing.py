@@ -0,0 +1,76 @@
+from typing import Dict, Iterator, List
+
+import pyarrow as pa
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from adbc_flight_sql_driver import auth, tracing
+from benchmarks.flight_sql_server import PASSWORD, USERNAME, FlightSqlServer
+
+
+class RecordingTracer(tracing.Tracer):
+    def __init__(self) -> None:
+        self.timings: Dict[str, List[float]] = {}
+        self.counts: Dict[str, List[int]] = {}
+
+    def timing(self, name: str, seconds: float) -> None:
+        self.timings.setdefault(name, []).append(seconds)
+
+    def count(self, name: str, value: int) -> None:
+        self.counts.setdefault(name, []).append(value)
+
+
+@pytest.fixture
+def tracer() -> Iterator[RecordingTracer]:
+    tracer = RecordingTracer()
+    tracing.set_tracer(tracer)
+    yield tracer
+    tracing.set_tracer(None)
+
+
+def test_phases(url: str, tracer: RecordingTracer) -> None:
+    # endpoints are counted when results are fetched by partition
+    engine = create_engine(url + "?fetchWorkers=2")
+    try:
+        with engine.connect() as connection:
+            assert len(connection.execute(text("SELECT * FROM nation")).fetchall()) == 25
+    finally:
+        engine.dispose()
+    assert len(tracer.timings["connect"]) == 1
+    assert {"execute", "first_batch", "fetch", "convert"} <= set(tracer.timings)
+    # the last query - connecting runs the dialect's first queries too
+    assert tracer.counts["endpoints"][-1] == 1
+    assert tracer.counts["rows"][-1] == 25
+    assert tracer.counts["batches"][-1] >= 1
+    assert tracer.counts["bytes"][-1] > 0
+
+
+def test_unread_result(engine: Engine, tracer: RecordingTracer) -> None:
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            # more than a batch
+            cursor.execute("SELECT * FROM range(200000)")
+            cursor.fetchone()
+    finally:
+        connection.close()
+    # reported when the result is closed
+    assert 0 < tracer.counts["rows"][-1] < 200000
+
+
+def test_auth(server: FlightSqlServer, tracer: RecordingTracer) -> None:
+    uri = f"grpc://127.0.0.1:{server.port}"
+    auth.invalidate_token(uri, USERNAME, PASSWORD)
+    auth.get_token(uri, USERNAME, PASSWORD)
+    auth.get_token(uri, USERNAME, PASSWORD)
+    # the cached token isn't timed
+    assert len(tracer.timings["auth"]) == 1
+
+
+def test_disabled() -> None:
+    reader = pa.table({"n": [1, 2, 3]}).to_reader()
+    assert tracing.get_tracer() is None
+    assert tracing.trace_batches(reader) is reader
+    with tracing.span("execute"), tracing.timer("convert"):
+        tracing.count("rows", 3)
@@ -0,0 +1,90 @@
+from typing import Iterator
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from adbc_flight_sql_driver.transaction import is_write
+from conftest import RecordingServer
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "SELECT * FROM nation",
+        "  -- a comment\n/* another */ with n AS (SELECT 1) SELECT * FROM n",
+        "EXPLAIN SELECT 1",
+        "SELECT 'DROP TABLE nation', \"delete\" FROM nation -- update",
+        "SELECT $$INSERT$$, 'it''s' || 'CREATE' FROM nation",
+        "SELECT n_created FROM nation",
+    ],
+)
+def test_reads(statement: str) -> None:
+    assert not is_write(statement)
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "INSERT INTO lazy_begin VALUES (1)",
+        "CREATE TABLE t (a INTEGER)",
+        "SET threads = 1",
+        "WITH x AS (SELECT 1) INSERT INTO lazy_begin SELECT * FROM x",
+        "WITH d AS (DELETE FROM lazy_begin RETURNING *) SELECT * FROM d",
+        "EXPLAIN ANALYZE DELETE FROM lazy_begin",
+        "SELECT * FROM nation FOR UPDATE",
+        "SELECT 'x' FROM nation; DROP TABLE nation",
+    ],
+)
+def test_writes(statement: str) -> None:
+    assert is_write(statement)
+
+
+@pytest.fixture
+def connection(engine: Engine, server: RecordingServer) -> Iterator[Connection]:
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TABLE IF NOT EXISTS lazy_begin (a INTEGER)"))
+        server.clear()
+        yield connection
+    with engine.connect() as connection:
+        connection.execute(text("DROP TABLE lazy_begin"))
+
+
+def test_reads_open_no_transaction(connection: Connection, server: RecordingServer) -> None:
+    with connection.begin():
+        assert len(connection.execute(text("SELECT * FROM nation")).fetchall()) == 25
+        connection.execute(text("WITH n AS (SELECT 1) SELECT * FROM n")).fetchall()
+    assert "BEGIN" not in server.statements
+    assert "COMMIT" not in server.statements
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "INSERT INTO lazy_begin VALUES (1)",
+        "WITH x AS (SELECT 1) INSERT INTO lazy_begin SELECT * FROM x",
+    ],
+)
+def test_write_opens_transaction(connection: Connection, server: RecordingServer, statement: str) -> None:
+    # the stand-in server has no transactions, so opening one fails - before
+    # the write is sent
+    with pytest.raises(DBAPIError, match="no transactions"):
+        with connection.begin():
+            connection.execute(text("SELECT 1")).fetchall()
+            connection.execute(text(statement))
+    assert server.statements == ["SELECT 1", "BEGIN"]
+    assert connection.execute(text("SELECT count(*) FROM lazy_begin")).scalar() == 0
+
+
+def test_read_only(url: str, server: RecordingServer) -> None:
+    engine = create_engine(url + "?readOnly=True")
+    try:
+        with engine.connect() as connection:
+            server.clear()
+            with connection.begin():
+                connection.execute(text("CREATE TABLE read_only (a INTEGER)"))
+                connection.execute(text("DROP TABLE read_only"))
+    finally:
+        engine.dispose()
+    assert server.statements == ["CREATE TABLE read_only (a INTEGER)", "DROP TABLE read_only"]